@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Helpers shared by the benchmarks: locating the plugin, running ``pytest`` in a
+subprocess with the plugin enabled or disabled, and reading and writing the entries of
+the baseline file.
+"""
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCHMARKS_DIR)
+DEFAULT_BASELINE = os.path.join(BENCHMARKS_DIR, 'baseline.json')
+
+
+def _plugin_installed():
+    """Return whether pytest-raises is registered through its ``pytest11`` entry point."""
+    try:
+        from importlib import metadata  # pylint: disable=import-outside-toplevel
+        entry_points = metadata.entry_points()
+        if hasattr(entry_points, 'select'):
+            group = entry_points.select(group='pytest11')
+        else:  # Python < 3.10
+            group = entry_points.get('pytest11', [])
+        return any(entry_point.name == 'raises' for entry_point in group)
+    except ImportError:  # Python < 3.8
+        import pkg_resources  # pylint: disable=import-outside-toplevel
+        return any(entry_point.name == 'raises' for entry_point in pkg_resources.iter_entry_points('pytest11'))
+
+
+def plugin_args(enabled):
+    """Return the ``pytest`` arguments enabling or disabling pytest-raises."""
+    if _plugin_installed():
+        return [] if enabled else ['-p', 'no:raises']
+    return ['-p', 'pytest_raises.pytest_raises'] if enabled else []
+
+
+def run_pytest(args, env=None):
+    """
+    Run ``python -m pytest`` with ``args`` against the working tree, returning the wall
+    time in seconds.  The exit status is ignored: benchmark suites contain failing tests.
+    """
+    run_env = dict(os.environ)
+    run_env.update(env or {})
+    run_env['PYTHONPATH'] = os.pathsep.join(filter(None, [REPO_ROOT, BENCHMARKS_DIR, run_env.get('PYTHONPATH')]))
+    start = time.perf_counter()
+    subprocess.call([sys.executable, '-m', 'pytest'] + args, env=run_env, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def median(runs, key=None):
+    """
+    Return the median of ``runs``, compared by ``key(run)`` if given.  With an even number
+    of runs, the lower of the two middle runs is returned, so that the result is always
+    one of the measured runs.
+    """
+    return sorted(runs, key=key)[(len(runs) - 1) // 2]
+
+
+def environment():
+    """Return the versions of Python and ``pytest``, and the platform, of the measurements."""
+    import pytest  # pylint: disable=import-outside-toplevel
+    return {'python': platform.python_version(), 'pytest': pytest.__version__, 'platform': platform.platform()}
+
+
+def load_baseline(path, key):
+    """Return the entry ``key`` of the baseline JSON file ``path``, ``None`` if it has none."""
+    with open(path, encoding='utf-8') as baseline_file:
+        return json.load(baseline_file).get(key)
+
+
+def save_baseline(path, key, value):
+    """Store ``value`` as the entry ``key`` of the baseline JSON file ``path``, keeping its other entries."""
+    baseline = {}
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)
+    baseline.update(environment())
+    baseline[key] = value
+    with open(path, 'w', encoding='utf-8') as baseline_file:
+        json.dump(baseline, baseline_file, indent=2, sort_keys=True)
+        baseline_file.write('\n')
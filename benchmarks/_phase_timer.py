@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""
+``pytest`` plugin used by ``bench_suite.py`` in its subprocess runs: sums the duration of
+each test phase (which includes every hook wrapper of the phase, this plugin's included)
+and writes it, along with the test outcomes and the peak memory of the process, to the
+JSON file named by the ``PYTEST_RAISES_BENCH_OUTPUT`` environment variable.
+"""
+import json
+import os
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_PHASE_TIMES = {'setup': 0.0, 'call': 0.0, 'teardown': 0.0}
+_OUTCOMES = {'passed': 0, 'failed': 0, 'skipped': 0}
+
+
+def pytest_runtest_logreport(report):
+    _PHASE_TIMES[report.when] += report.duration
+    if report.when == 'call' or report.failed:
+        _OUTCOMES[report.outcome] += 1
+
+
+def pytest_sessionfinish(session):
+    # Linux reports `ru_maxrss` in kilobytes, macOS in bytes.
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else None
+    with open(os.environ['PYTEST_RAISES_BENCH_OUTPUT'], 'w', encoding='utf-8') as output:
+        json.dump({
+            'phases': _PHASE_TIMES, 'outcomes': _OUTCOMES, 'max_rss': max_rss, 'tests': session.testscollected
+        }, output)
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+Measure the per test overhead of pytest-raises on realistic synthetic suites.
+
+For each requested size a suite is generated with a mix of unmarked tests, ``raises``,
+``raises(match=...)`` and ``setup_raises`` tests, and failing tests.  Every suite is run
+``--repeat`` times with the plugin enabled and with it disabled, keeping the median run
+(by wall time) of each, and the following are compared:
+
+- the wall time of the ``pytest`` process,
+- the time spent in each test phase (setup / call / teardown), including hook wrappers,
+- the peak memory (max RSS) of the ``pytest`` process.
+
+Results are printed, and written as JSON with ``--json``.  With ``--baseline``, the run
+fails (exit status 1) if the wall time overhead of any size exceeds the one stored in the
+baseline by more than ``--tolerance`` percentage points.  ``--save-baseline`` stores the
+results of the run as the new baseline.
+
+.. note::
+
+    With the plugin disabled the marked tests fail rather than pass.  Tracebacks are
+    disabled (``--tb=no``) so that reporting those failures costs as little as possible,
+    but the comparison is still an upper bound of the plugin's cost.
+
+Usage::
+
+    python benchmarks/bench_suite.py --sizes 1000 10000 100000 --json bench.json
+    python benchmarks/bench_suite.py --baseline benchmarks/baseline.json
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+from _harness import DEFAULT_BASELINE, environment, load_baseline, median, plugin_args, run_pytest, save_baseline
+
+TESTS_PER_FILE = 100
+
+_HEADER = '''import pytest
+
+@pytest.fixture
+def broken_fixture():
+    raise ValueError('fixture failed')
+
+'''
+
+# The kind of test generated for each index modulo 100.
+_TEMPLATES = {
+    0: '''@pytest.mark.raises(exception=ValueError)
+def test_raises_{0}():
+    raise ValueError('value {0}')
+''',
+    1: '''@pytest.mark.raises(exception=KeyError, message='key')
+def test_raises_message_{0}():
+    raise KeyError('key {0}')
+''',
+    2: '''@pytest.mark.raises(exception=RuntimeError, match=r'^runtime \\d+ failed$')
+def test_raises_match_{0}():
+    raise RuntimeError('runtime {0} failed')
+''',
+    3: '''@pytest.mark.setup_raises(exception=ValueError, match=r'fixture')
+def test_setup_raises_{0}(broken_fixture):
+    pass
+''',
+    4: '''@pytest.mark.raises(exception=ValueError)
+def test_raises_failing_{0}():
+    raise TypeError('type {0}')
+''',
+    5: '''def test_unmarked_failing_{0}():
+    assert {0} == -1
+''',
+}
+_UNMARKED = '''def test_unmarked_{0}():
+    assert {0} >= 0
+'''
+
+
+def write_suite(directory, num_tests, marked_only=False):
+    """
+    Write a mixed suite of ``num_tests`` tests into ``directory``.  With ``marked_only``,
+    every test is marked with ``raises`` or ``setup_raises`` instead.
+    """
+    for file_index, start in enumerate(range(0, num_tests, TESTS_PER_FILE)):
+        path = os.path.join(directory, 'test_mixed_{}.py'.format(file_index))
+        with open(path, 'w', encoding='utf-8') as test_file:
+            test_file.write(_HEADER)
+            for test_index in range(start, min(start + TESTS_PER_FILE, num_tests)):
+                if marked_only:
+                    template = _TEMPLATES[test_index % 5]
+                else:
+                    template = _TEMPLATES.get(test_index % 100, _UNMARKED)
+                test_file.write(template.format(test_index) + '\n')
+
+
+def run_once(directory, enabled):
+    """Run the suite in ``directory`` once, returning its measurements."""
+    fd, output = tempfile.mkstemp(suffix='.json')
+    os.close(fd)
+    try:
+        args = ['-q', '--tb=no', '-p', 'no:cacheprovider', '-p', '_phase_timer', directory] + plugin_args(enabled)
+        if not enabled:
+            args += ['-W', 'ignore::pytest.PytestUnknownMarkWarning']
+        wall = run_pytest(args, env={'PYTEST_RAISES_BENCH_OUTPUT': output})
+        with open(output, encoding='utf-8') as result_file:
+            result = json.load(result_file)
+    finally:
+        os.remove(output)
+    result['wall'] = wall
+    return result
+
+
+def bench_size(num_tests, repeat):
+    """Return the enabled / disabled measurements of a ``num_tests`` suite."""
+    directory = tempfile.mkdtemp(prefix='pytest_raises_bench_')
+    try:
+        write_suite(directory, num_tests)
+        run_once(directory, False)  # warm up: byte-compile the generated suite
+        runs = {'disabled': [], 'enabled': []}
+        # Interleave the configurations so that drifting machine load affects both equally.
+        for _ in range(repeat):
+            for name, enabled in (('disabled', False), ('enabled', True)):
+                runs[name].append(run_once(directory, enabled))
+    finally:
+        shutil.rmtree(directory)
+    result = {name: median(name_runs, key=lambda run: run['wall']) for name, name_runs in runs.items()}
+    result['tests'] = num_tests
+    result['overhead_pct'] = 100.0 * (result['enabled']['wall'] - result['disabled']['wall']) / result['disabled']['wall']
+    return result
+
+
+def print_result(result):
+    enabled, disabled = result['enabled'], result['disabled']
+    print('{} tests'.format(result['tests']))
+    print('  {:<10} {:>12} {:>12}'.format('', 'disabled', 'enabled'))
+    print('  {:<10} {:>11.3f}s {:>11.3f}s'.format('wall', disabled['wall'], enabled['wall']))
+    for phase in ('setup', 'call', 'teardown'):
+        print('  {:<10} {:>11.3f}s {:>11.3f}s'.format(phase, disabled['phases'][phase], enabled['phases'][phase]))
+    print('  {:<10} {:>12} {:>12}'.format(
+        'passed', disabled['outcomes']['passed'], enabled['outcomes']['passed']
+    ))
+    if enabled['max_rss'] is not None:
+        print('  {:<10} {:>12} {:>12}'.format('max rss', disabled['max_rss'], enabled['max_rss']))
+    print('  overhead   {:+.2f}%, {:+.2f}us per test'.format(
+        result['overhead_pct'], 1e6 * (enabled['wall'] - disabled['wall']) / result['tests']
+    ))
+
+
+def check_baseline(results, baseline_path, tolerance):
+    """Return the messages describing every size regressing past the baseline."""
+    baseline = {entry['tests']: entry for entry in load_baseline(baseline_path, 'results') or []}
+    regressions = []
+    for result in results:
+        reference = baseline.get(result['tests'])
+        if reference is None:
+            continue
+        # A negative stored overhead is measurement noise, not a budget to hold the plugin to.
+        budget = max(reference['overhead_pct'], 0.0) + tolerance
+        if result['overhead_pct'] > budget:
+            regressions.append('{} tests: overhead {:.2f}% exceeds budget {:.2f}% (baseline {:.2f}% + {:.2f})'.format(
+                result['tests'], result['overhead_pct'], budget, reference['overhead_pct'], tolerance
+            ))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000], help='suite sizes to generate')
+    parser.add_argument('--repeat', type=int, default=5, help='number of runs per configuration')
+    parser.add_argument('--json', metavar='PATH', help='write the results as JSON to PATH')
+    parser.add_argument('--baseline', metavar='PATH', nargs='?', const=DEFAULT_BASELINE,
+                        help='fail if the overhead regresses past the baseline in PATH (default: %(const)s)')
+    parser.add_argument('--tolerance', type=float, default=5.0,
+                        help='percentage points of overhead allowed above the baseline (default: %(default)s)')
+    parser.add_argument('--save-baseline', metavar='PATH', nargs='?', const=DEFAULT_BASELINE,
+                        help='store the results as the baseline in PATH (default: %(const)s)')
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        result = bench_size(size, args.repeat)
+        print_result(result)
+        results.append(result)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as output:
+            json.dump(dict(environment(), results=results), output, indent=2, sort_keys=True)
+            output.write('\n')
+    if args.save_baseline:
+        save_baseline(args.save_baseline, 'results', results)
+
+    if args.baseline:
+        regressions = check_baseline(results, args.baseline, args.tolerance)
+        for regression in regressions:
+            print('REGRESSION: {}'.format(regression))
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+Measure the overhead of pytest-raises on a suite of tests carrying no markers.
+
+A synthetic suite of ``--tests`` trivial, unmarked tests is generated in a temporary
+directory and run ``--repeat`` times with the plugin enabled, then disabled.  The median
+wall time of each configuration and the resulting per test overhead are printed.
+
+Since end to end timings are noisy, the cost of this plugin on the hook chain of the
+test protocol is also measured in process: the suite is collected, then the whole
+``runtestprotocol`` (setup, call and teardown phases, with their reports) of every item
+is timed with the plugin enabled, then disabled.  With ``--baseline``, the run fails
+(exit status 1) if the overhead of the hook chain exceeds the one stored in the baseline
+by more than ``--tolerance`` percentage points.  ``--save-baseline`` stores it as the new
+baseline.
+
+Usage::
+
+    python benchmarks/bench_unmarked.py --tests 20000 --repeat 5
+    python benchmarks/bench_unmarked.py --baseline benchmarks/baseline.json
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from _harness import DEFAULT_BASELINE, REPO_ROOT, load_baseline, median, plugin_args, run_pytest, save_baseline
+
+TESTS_PER_FILE = 500
+
+
+def write_unmarked_suite(directory, num_tests):
+    """Write ``num_tests`` unmarked, passing tests into ``directory``."""
+    for file_index, start in enumerate(range(0, num_tests, TESTS_PER_FILE)):
+        path = os.path.join(directory, 'test_unmarked_{}.py'.format(file_index))
+        with open(path, 'w', encoding='utf-8') as test_file:
+            for test_index in range(start, min(start + TESTS_PER_FILE, num_tests)):
+                test_file.write('def test_unmarked_{}():\n    pass\n\n'.format(test_index))
+
+
+def run_suite(directory, enabled):
+    """Run the suite in ``directory`` once, returning the wall time in seconds."""
+    return run_pytest(['-q', '-p', 'no:cacheprovider', directory] + plugin_args(enabled))
+
+
+class _ProtocolTimer:  # pylint: disable=too-few-public-methods
+    """
+    Plugin replacing the test loop of a ``pytest.main`` run: the ``runtestprotocol`` of
+    every collected item is timed instead, without reporting.
+    """
+
+    def __init__(self):
+        self.elapsed = None
+        self.items = 0
+
+    def pytest_runtestloop(self, session):
+        from _pytest.runner import runtestprotocol  # pylint: disable=import-outside-toplevel
+
+        items = session.items
+        start = time.perf_counter()
+        for index, item in enumerate(items):
+            runtestprotocol(item, log=False, nextitem=items[index + 1] if index + 1 < len(items) else None)
+        self.elapsed = time.perf_counter() - start
+        self.items = len(items)
+        return True
+
+
+def measure_hook_chain(directory, repeat):
+    """
+    Return the median time in seconds, over ``repeat`` rounds, spent running the test
+    protocol of every test collected from ``directory`` as ``{enabled: seconds}``, and
+    the number of tests.
+    """
+    import pytest  # pylint: disable=import-outside-toplevel
+
+    timings = {False: [], True: []}
+    num_items = 0
+    for _ in range(repeat):
+        for enabled in (False, True):
+            timer = _ProtocolTimer()
+            pytest.main(['-q', '-p', 'no:cacheprovider', directory] + plugin_args(enabled), plugins=[timer])
+            timings[enabled].append(timer.elapsed)
+            num_items = timer.items
+    return {enabled: median(elapsed) for enabled, elapsed in timings.items()}, num_items
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tests', type=int, default=10000, help='number of unmarked tests to generate')
+    parser.add_argument('--repeat', type=int, default=5, help='number of runs per configuration')
+    parser.add_argument('--baseline', metavar='PATH', nargs='?', const=DEFAULT_BASELINE,
+                        help='fail if the hook chain overhead regresses past the baseline in PATH (default: %(const)s)')
+    parser.add_argument('--tolerance', type=float, default=5.0,
+                        help='percentage points of overhead allowed above the baseline (default: %(default)s)')
+    parser.add_argument('--save-baseline', metavar='PATH', nargs='?', const=DEFAULT_BASELINE,
+                        help='store the hook chain overhead as the baseline in PATH (default: %(const)s)')
+    args = parser.parse_args()
+    # Benchmark the working tree, not an installed release.
+    sys.path.insert(0, REPO_ROOT)
+
+    directory = tempfile.mkdtemp(prefix='pytest_raises_bench_')
+    try:
+        write_unmarked_suite(directory, args.tests)
+        run_suite(directory, False)  # warm up: byte-compile the generated suite
+        # Interleave the configurations so that drifting machine load affects both equally.
+        runs = {False: [], True: []}
+        for _ in range(args.repeat):
+            for enabled in (False, True):
+                runs[enabled].append(run_suite(directory, enabled))
+        timings = {enabled: median(walls) for enabled, walls in runs.items()}
+        chain, num_items = measure_hook_chain(directory, args.repeat)
+    finally:
+        shutil.rmtree(directory)
+
+    overhead = timings[True] - timings[False]
+    print('unmarked tests:   {}'.format(args.tests))
+    print('plugin disabled:  {:.3f}s'.format(timings[False]))
+    print('plugin enabled:   {:.3f}s'.format(timings[True]))
+    print('overhead:         {:+.3f}s ({:+.2f}%, {:+.2f}us per test)'.format(
+        overhead, 100.0 * overhead / timings[False], 1e6 * overhead / args.tests
+    ))
+    chain_overhead = 100.0 * (chain[True] - chain[False]) / chain[False]
+    print('hook chain:       {:.3f}s disabled, {:.3f}s enabled for {} items ({:+.2f}%, {:+.2f}us per test)'.format(
+        chain[False], chain[True], num_items, chain_overhead, 1e6 * (chain[True] - chain[False]) / num_items
+    ))
+    if args.save_baseline:
+        save_baseline(args.save_baseline, 'unmarked', {'tests': num_items, 'hook_chain_overhead_pct': chain_overhead})
+    if args.baseline:
+        reference = load_baseline(args.baseline, 'unmarked')
+        # A negative stored overhead is measurement noise, not a budget to hold the plugin to.
+        budget = max(reference['hook_chain_overhead_pct'], 0.0) + args.tolerance if reference else None
+        if budget is not None and chain_overhead > budget:
+            print('REGRESSION: hook chain overhead {:.2f}% exceeds budget {:.2f}% (baseline {:.2f}% + {:.2f})'.format(
+                chain_overhead, budget, reference['hook_chain_overhead_pct'], args.tolerance
+            ))
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+Measure how a marker heavy suite scales across ``pytest-xdist`` workers with
+pytest-raises enabled.
+
+A suite of ``--tests`` tests, every one of them marked with ``raises`` or
+``setup_raises``, is run with each requested number of workers (``-n``).  The best wall
+time, the speedup over a single worker and the parallel efficiency are printed, and
+written as JSON with ``--json``.  The outcomes of every run are checked to be identical,
+since the ``setup_raises`` handshake and failure details must not be lost between the
+workers and the controller.
+
+Usage::
+
+    python benchmarks/bench_xdist.py --tests 20000 --workers 1 2 4 8
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+from _harness import plugin_args, run_pytest
+from bench_suite import write_suite
+
+
+def run_once(directory, workers):
+    """Run the suite in ``directory`` with ``workers`` workers, returning its measurements."""
+    fd, output = tempfile.mkstemp(suffix='.xml')
+    os.close(fd)
+    try:
+        args = ['-q', '--tb=no', '-p', 'no:cacheprovider', '-n', str(workers), '--junitxml', output, directory]
+        wall = run_pytest(args + plugin_args(True))
+        with open(output, encoding='utf-8') as junit_file:
+            junit = junit_file.read()
+    finally:
+        os.remove(output)
+    return {
+        'wall': wall,
+        'failures': junit.count('<failure '),
+        'failure_details': junit.count('ExpectedException') + junit.count('ExpectedMessage'),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tests', type=int, default=10000, help='number of marked tests to generate')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4], help='numbers of xdist workers')
+    parser.add_argument('--repeat', type=int, default=3, help='number of runs per number of workers')
+    parser.add_argument('--json', metavar='PATH', help='write the results as JSON to PATH')
+    args = parser.parse_args()
+
+    try:
+        import xdist  # pylint: disable=import-outside-toplevel,unused-import
+    except ImportError:
+        sys.exit('pytest-xdist is required: pip install pytest-xdist')
+
+    directory = tempfile.mkdtemp(prefix='pytest_raises_bench_')
+    results = []
+    try:
+        write_suite(directory, args.tests, marked_only=True)
+        run_once(directory, 1)  # warm up: byte-compile the generated suite
+        for workers in args.workers:
+            runs = [run_once(directory, workers) for _ in range(args.repeat)]
+            results.append(dict(min(runs, key=lambda run: run['wall']), workers=workers))
+    finally:
+        shutil.rmtree(directory)
+
+    reference = results[0]
+    print('{} marked tests'.format(args.tests))
+    print('  {:>7} {:>10} {:>8} {:>10}'.format('workers', 'wall', 'speedup', 'efficiency'))
+    for result in results:
+        result['speedup'] = reference['wall'] * reference['workers'] / result['wall']
+        result['efficiency'] = result['speedup'] / result['workers']
+        print('  {:>7} {:>9.3f}s {:>7.2f}x {:>9.0f}%'.format(
+            result['workers'], result['wall'], result['speedup'], 100.0 * result['efficiency']
+        ))
+
+    consistent = len(set((result['failures'], result['failure_details']) for result in results)) == 1
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as output:
+            json.dump({'tests': args.tests, 'results': results, 'consistent': consistent}, output, indent=2, sort_keys=True)
+            output.write('\n')
+    if not consistent:
+        sys.exit('failures differ between numbers of workers: {}'.format(results))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Running of coroutine test functions marked with ``@pytest.mark.raises`` (or a
+``raises_table`` expectation), on event loops shared per session or per module.
+"""
+import asyncio
+
+import pytest
+
+# The values of the ``raises_asyncio_loop_scope`` ini option.
+LOOP_SCOPES = ('session', 'module')
+
+
+class AsyncioRunner:
+    """
+    ``pytest`` plugin running the coroutine test functions of the items handed to
+    :meth:`expect`, i.e., the ones carrying a ``raises`` expectation.  The plugin is only
+    registered once such an item is collected, or marked at run time.
+
+    Besides the exceptions propagating out of the test coroutine, the exceptions left
+    unhandled by the tasks it spawned (never retrieved, e.g., by awaiting the task) are
+    raised from the test, so that ``raises`` can match them.  They are captured through
+    the exception handler of the loop, which asyncio calls with the exception of a task
+    that was never retrieved once the task is released, and with the exceptions of the
+    callbacks it runs.  When the test coroutine returns, tasks still pending get one more
+    iteration of the loop, then are cancelled.  An exception of the test coroutine
+    itself takes precedence over the ones of its tasks, otherwise the first one reported
+    to the loop is raised.
+
+    One event loop is created per ``scope`` (``'session'`` or ``'module'``) and closed
+    when the session, or the last coroutine test of the module, finishes.
+    """
+
+    def __init__(self, scope):
+        self.scope = scope
+        # ``{scope key: loop}``, the key being ``None`` for the session.
+        self._loops = {}
+        # The node IDs of the items run, see `expect`.
+        self._expected = set()
+        # The exceptions reported to the loop by the running test.
+        self._exceptions = None
+
+    def expect(self, item):
+        """Run the test function of ``item``, a coroutine function, on the loop of its scope."""
+        self._expected.add(item.nodeid)
+
+    def _scope_key(self, item):
+        if self.scope == 'module':
+            module = item.getparent(pytest.Module)
+            return module.nodeid if module is not None else None
+        return None
+
+    def _loop(self, item):
+        key = self._scope_key(item)
+        loop = self._loops.get(key)
+        if loop is None:
+            # Modules run one after the other: the loop of the previous one is done.
+            for other_key in list(self._loops):
+                self._close_loop(other_key)
+            loop = self._loops[key] = asyncio.new_event_loop()
+            loop.set_exception_handler(self._exception_handler)
+        return loop
+
+    def _exception_handler(self, loop, context):
+        exception = context.get('exception')
+        if self._exceptions is not None and exception is not None:
+            self._exceptions.append(exception)
+        else:
+            loop.default_exception_handler(context)
+
+    def _close_loop(self, key):
+        loop = self._loops.pop(key, None)
+        if loop is None or loop.is_closed():
+            return
+        try:
+            _cancel_and_drain(loop, asyncio.all_tasks(loop))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            loop.close()
+
+    def run(self, item, testargs):
+        """Run the coroutine test function of ``item`` with ``testargs``, see the class."""
+        # pylint: disable=unused-variable
+        __tracebackhide__ = True
+        loop = self._loop(item)
+        self._exceptions = exceptions = []
+        try:
+            try:
+                loop.run_until_complete(item.obj(**testargs))
+            finally:
+                if asyncio.all_tasks(loop):
+                    loop.run_until_complete(asyncio.sleep(0))
+                _cancel_and_drain(loop, asyncio.all_tasks(loop))
+        finally:
+            self._exceptions = None
+        if exceptions:
+            raise exceptions[0]
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_pyfunc_call(self, pyfuncitem):
+        """Run the coroutine test functions carrying a ``raises`` expectation."""
+        # pylint: disable=unused-variable
+        __tracebackhide__ = True
+        if pyfuncitem.nodeid not in self._expected:
+            return None
+        funcargs = pyfuncitem.funcargs
+        # pylint: disable=protected-access
+        self.run(pyfuncitem, {arg: funcargs[arg] for arg in pyfuncitem._fixtureinfo.argnames})
+        return True
+
+    def pytest_runtest_teardown(self, item, nextitem):
+        if self.scope == 'module' and item.nodeid in self._expected:
+            key = self._scope_key(item)
+            if nextitem is None or self._scope_key(nextitem) != key:
+                self._close_loop(key)
+
+    def pytest_sessionfinish(self):
+        for key in list(self._loops):
+            self._close_loop(key)
+
+
+def _cancel_and_drain(loop, tasks):
+    """Cancel ``tasks`` and run ``loop`` until they are done."""
+    for task in tasks:
+        task.cancel()
+    if tasks:
+        loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""
+The exceptions raised as expected by the marked tests, kept past the validation that
+swallows them so that teardown fixtures and other plugins can inspect them.
+"""
+
+
+class CapturedException:
+    """
+    The exception a test raised as expected by its ``setup_raises`` / ``raises`` marker,
+    read through the ``raised_exception`` fixture or
+    :func:`pytest_raises.pytest_raises.get_raised_exception`:
+
+    - ``phase``: ``'setup'`` or ``'call'``, the phase that raised.
+    - ``exception``: the raised exception itself.
+    - ``matched``: the exception that satisfied the marker, i.e., the exception group
+      leaf (``group=True``) or exception chain link (``chained=True``) that matched,
+      ``exception`` otherwise.
+
+    All of them are ``None`` until the phase is validated, and when the test did not raise
+    as expected.  They are reset once the test is torn down, so that the exception (and the
+    locals of its traceback) does not outlive the test.
+    """
+    __slots__ = ('phase', 'exception', 'matched')
+
+    def __init__(self):
+        self.phase = None
+        self.exception = None
+        self.matched = None
+
+    def __bool__(self):
+        return self.exception is not None
+
+    def __repr__(self):
+        return '<CapturedException phase={!r} exception={!r} matched={!r}>'.format(self.phase, self.exception, self.matched)
+
+    def capture(self, phase, exception, matched):
+        self.phase = phase
+        self.exception = exception
+        self.matched = matched
+
+    def clear(self):
+        self.capture(None, None, None)
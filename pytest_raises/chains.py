@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+Walking of the exception chains raised by tests marked with ``chained=True``.
+"""
+
+# The number of links followed past the raised exception.
+MAX_CHAIN_DEPTH = 32
+
+
+class ExceptionChain:
+    """
+    The links of the chain of an exception: the exception itself, then the exception it
+    was raised from (``__cause__``) or, unless suppressed with ``raise ... from None``,
+    the exception being handled when it was raised (``__context__``), and so on.  These
+    are the exceptions shown by the interpreter's traceback, followed at most
+    ``max_depth`` links deep and stopping at the first exception seen twice.
+
+    ``links`` lists ``(path, exception)``, ``path`` locating the exception from the raised
+    one, e.g., ``'__cause__.__context__'`` (``''`` for the raised exception).
+    """
+    __slots__ = ('links', 'truncated')
+
+    def __init__(self, exception, max_depth=MAX_CHAIN_DEPTH):
+        self.links = []
+        self.truncated = False
+        seen = set()
+        path = ''
+        while exception is not None and id(exception) not in seen:
+            if len(self.links) > max_depth:
+                self.truncated = True
+                break
+            seen.add(id(exception))
+            self.links.append((path, exception))
+            if exception.__cause__ is not None:
+                attribute, exception = '__cause__', exception.__cause__
+            elif not exception.__suppress_context__:
+                attribute, exception = '__context__', exception.__context__
+            else:
+                break
+            path = path + '.' + attribute if path else attribute
+
+    def links_of_type(self, is_expected_type):
+        """Return the ``(path, exception)`` of the links whose type satisfies ``is_expected_type``."""
+        return [(path, exception) for path, exception in self.links if is_expected_type(type(exception))]
+
+    def type_summary(self):
+        """Return the types along the chain, e.g., ``'RuntimeError <- __cause__: OSError'``."""
+        summary = ' <- '.join(
+            '{}: {}'.format(path.rpartition('.')[2], type(exception).__name__) if path else type(exception).__name__
+            for path, exception in self.links
+        )
+        return summary + (' <- ...' if self.truncated else '')
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Compatibility shims over the supported versions of Python, ``pytest`` and ``pluggy``,
+used by :mod:`pytest_raises.pytest_raises`.
+
+.. warning::
+
+    **The contents of this module are "private", not intended to be used directly by external
+    projects!**
+"""
+import importlib
+import sys
+import types
+
+import pytest
+
+
+def _force_outcome_exception(outcome, exception):
+    outcome.force_exception(exception)
+
+
+def _set_outcome_private_excinfo(outcome, exception):  # pragma: no cover (pluggy < 1.1)
+    # pylint: disable=protected-access
+    outcome._excinfo = (type(exception), exception, exception.__traceback__)
+
+
+def _set_outcome_excinfo(outcome, exception):  # pragma: no cover (pluggy < 0.6)
+    outcome.excinfo = (type(exception), exception, exception.__traceback__)
+
+
+def _select_outcome_exception_setter():
+    """
+    Return the function used to fail a hook wrapper ``outcome`` with an exception, chosen
+    once according to the installed ``pluggy``:
+
+    - pluggy 1.1+: the public ``outcome.force_exception``.
+    - pluggy 0.6 to 1.0: ``outcome.excinfo`` is a read only property, so the private
+      ``outcome._excinfo`` it reads from is set.
+    - older pluggy (possibly vendored by ``pytest``): ``outcome.excinfo`` is a plain
+      attribute and is set directly.
+    """
+    try:
+        import pluggy  # pylint: disable=import-outside-toplevel
+    except ImportError:  # pragma: no cover (pytest < 3.3 vendors pluggy)
+        return _set_outcome_excinfo
+    if hasattr(getattr(pluggy, 'Result', None), 'force_exception'):
+        return _force_outcome_exception
+    for module_name in ('pluggy._result', 'pluggy.callers'):  # pragma: no cover (pluggy < 1.1)
+        try:
+            result_class = getattr(importlib.import_module(module_name), '_Result', None)
+        except ImportError:
+            continue
+        if isinstance(getattr(result_class, 'excinfo', None), property):
+            return _set_outcome_private_excinfo
+    return _set_outcome_excinfo  # pragma: no cover (pluggy < 0.6)
+
+
+_set_outcome_exception = _select_outcome_exception_setter()
+
+
+def _traceback_here():
+    """
+    Return a traceback holding only the frame of the caller, without raising an exception
+    to obtain it (``TracebackType`` can only be instantiated on Python 3.7+, older
+    versions fall back on raising from this frame).
+    """
+    frame = sys._getframe(1)  # pylint: disable=protected-access
+    if sys.version_info >= (3, 7):
+        return types.TracebackType(None, frame, frame.f_lasti, frame.f_lineno)
+    try:  # pragma: no cover (Python < 3.7)
+        raise RuntimeError
+    except RuntimeError:  # pragma: no cover (Python < 3.7)
+        return sys.exc_info()[2]
+
+
+class _NodeSlot:
+    """
+    A per node (test item or config) storage slot, read and written in O(1).  Uses the
+    node's ``stash`` on pytest 7+, and falls back to a private attribute named ``name``
+    on older versions.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._key = pytest.StashKey() if hasattr(pytest, 'StashKey') else None
+
+    def get(self, node, default=None):
+        if self._key is not None:
+            return node.stash.get(self._key, default)
+        return getattr(node, self.name, default)
+
+    def set(self, node, value):
+        if self._key is not None:
+            node.stash[self._key] = value
+        else:
+            setattr(node, self.name, value)
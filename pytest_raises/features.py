@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Registration of the plugins running the optional features of pytest-raises, once the
+first collected test uses them.
+"""
+import inspect
+
+
+class FeaturePlugins:
+    """
+    Registry of the plugins running an optional feature, e.g., ``raises(repeat=N)``: the
+    plugin of a feature is only registered with ``pluginmanager`` once an item uses it,
+    so that the per item hooks of the features no collected test uses never run.
+    ``factories`` is the ``{name: factory}`` of these plugins, ``factory()`` returning
+    the plugin registered as ``name``.
+    """
+
+    def __init__(self, pluginmanager, factories):
+        self._pluginmanager = pluginmanager
+        self._factories = factories
+        # ``{name: plugin}`` of the plugins created, registered or not.
+        self._plugins = {}
+
+    def add(self, name, factory):
+        """Add the ``factory`` of the plugin ``name``."""
+        self._factories[name] = factory
+
+    def has(self, name):
+        """Return whether there is a plugin ``name``, e.g., whether :meth:`add` was called for it."""
+        return name in self._factories
+
+    def get(self, name):
+        """Return the plugin ``name``, created on first use but not registered."""
+        plugin = self._plugins.get(name)
+        if plugin is None:
+            plugin = self._plugins[name] = self._factories[name]()
+        return plugin
+
+    def require(self, name):
+        """Return the plugin ``name``, registering it first if no item needed it yet."""
+        plugin = self.get(name)
+        if self._pluginmanager.get_plugin(name) is None:
+            self._pluginmanager.register(plugin, name)
+        return plugin
+
+    def require_for(self, item, specs):
+        """
+        Register the plugins of the features used by the marked ``item``, whose compiled
+        ``{marker_name: spec}`` are ``specs``.
+        """
+        raises_spec = specs['raises']
+        if raises_spec is None or raises_spec.usage_error:
+            return
+        if raises_spec.repeat > 1:
+            self.require('raises_repeat')
+        if self.has('raises_asyncio_runner') and inspect.iscoroutinefunction(getattr(item, 'obj', None)):
+            asyncio_runner = self.require('raises_asyncio_runner')
+            # The attempts of a `repeat=N` test are run by the repeat runner, on the loops of this one.
+            if raises_spec.repeat == 1:
+                asyncio_runner.expect(item)
+
+    def require_for_warns(self, item):
+        """Register the checker of the ``setup_warns`` / ``warns`` markers if ``item`` carries one."""
+        if self.get('raises_warns').expect(item):
+            self.require('raises_warns')
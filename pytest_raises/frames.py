@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Release of the traceback frames of the exceptions validated by pytest-raises, enabled
+with the ``raises_release_frames`` ini option.  Frames keep the locals of the test (and
+of everything it called) alive, e.g., large fixture values, for as long as anything
+references the exception.
+"""
+import os
+import traceback
+
+import _pytest
+import pluggy
+
+from pytest_raises.groups import BaseExceptionGroup as _BaseExceptionGroup
+
+# The number of innermost entries kept by :func:`render_traceback`.
+TRACEBACK_LIMIT = 10
+
+# Frames of ``pytest`` and ``pluggy`` themselves are trimmed from rendered tracebacks.
+_FRAMEWORK_DIRECTORIES = tuple(
+    os.path.dirname(module.__file__) + os.sep for module in (pluggy, _pytest)
+)
+
+
+def release_frames(exception):
+    """
+    Clear the frames of the tracebacks of ``exception``, of the exceptions it was chained
+    to (``__cause__`` / ``__context__``) and, for exception groups, of its sub-exceptions,
+    then drop the tracebacks themselves.  Frames still executing are left untouched.
+    """
+    seen = set()
+    pending = [exception]
+    while pending:
+        exception = pending.pop()
+        if exception is None or id(exception) in seen:
+            continue
+        seen.add(id(exception))
+        if exception.__traceback__ is not None:
+            traceback.clear_frames(exception.__traceback__)
+            exception.__traceback__ = None
+        pending.append(exception.__cause__)
+        pending.append(exception.__context__)
+        if _BaseExceptionGroup is not None and isinstance(exception, _BaseExceptionGroup):
+            pending.extend(exception.exceptions)
+
+
+def _is_hidden(frame):
+    if frame.f_code.co_filename.startswith(_FRAMEWORK_DIRECTORIES):
+        return True
+    return bool(frame.f_locals.get('__tracebackhide__', frame.f_globals.get('__tracebackhide__', False)))
+
+
+def render_traceback(tb, limit=TRACEBACK_LIMIT):
+    """
+    Render the traceback ``tb`` as ``traceback.format_tb`` does, without the frames of
+    ``pytest``, ``pluggy`` or hidden with ``__tracebackhide__``, and keeping only the
+    ``limit`` innermost entries.  Returns an empty string if no entry is left.
+    """
+    entries = []
+    while tb is not None:
+        if not _is_hidden(tb.tb_frame):
+            entries.append((tb.tb_frame, tb.tb_lineno))
+        tb = tb.tb_next
+    if not entries:
+        return ''
+    summary = traceback.StackSummary.extract(entries[-limit:], capture_locals=False)
+    trimmed = '  [{} entries trimmed]\n'.format(len(entries) - limit) if len(entries) > limit else ''
+    return 'Traceback (most recent call last):\n' + trimmed + ''.join(summary.format())
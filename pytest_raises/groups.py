@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+Flattening of the exception groups raised by tests marked with ``group=True``.
+"""
+import collections
+
+try:  # Python 3.11+
+    BaseExceptionGroup = BaseExceptionGroup  # pylint: disable=redefined-builtin,self-assigning-variable
+except NameError:  # pragma: no cover (Python < 3.11)
+    try:
+        from exceptiongroup import BaseExceptionGroup  # pylint: disable=import-error
+    except ImportError:
+        BaseExceptionGroup = None
+
+
+class GroupIndex:
+    """
+    The leaves of an exception group, i.e., the exceptions that are not groups themselves,
+    found by a single traversal of the group tree and indexed by type.
+
+    ``leaves`` lists ``(path, leaf)`` in depth first order, ``path`` locating the leaf
+    from the group, e.g., ``'exceptions[1].exceptions[0]'``.
+    """
+    __slots__ = ('leaves', 'by_type')
+
+    def __init__(self, group):
+        self.leaves = []
+        # ``{leaf type: [index in leaves]}``.
+        self.by_type = collections.OrderedDict()
+        stack = [('', group)]
+        while stack:
+            path, exception = stack.pop()
+            if isinstance(exception, BaseExceptionGroup):
+                prefix = path + '.' if path else ''
+                stack.extend(
+                    ('{}exceptions[{}]'.format(prefix, position), child)
+                    for position, child in reversed(list(enumerate(exception.exceptions)))
+                )
+            else:
+                self.by_type.setdefault(type(exception), []).append(len(self.leaves))
+                self.leaves.append((path, exception))
+
+    def leaves_of_type(self, is_expected_type):
+        """
+        Return the ``(path, leaf)`` of the leaves whose type satisfies ``is_expected_type``,
+        in depth first order.  The predicate is called once per distinct leaf type.
+        """
+        indices = []
+        for leaf_type, type_indices in self.by_type.items():
+            if is_expected_type(leaf_type):
+                indices.extend(type_indices)
+        return [self.leaves[index] for index in sorted(indices)]
+
+    def type_summary(self):
+        """Return the number of leaves of each type, e.g., ``'KeyError x 2, OSError x 1'``."""
+        return ', '.join(
+            '{} x {}'.format(leaf_type.__name__, len(indices)) for leaf_type, indices in self.by_type.items()
+        )
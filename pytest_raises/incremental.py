@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+``--raises-incremental``: deselection of the expected-raise tests that passed on a
+previous run and did not change since.
+"""
+import hashlib
+import inspect
+import os
+import sys
+import types
+
+import pytest
+
+# The ``config.cache`` key of the ``{nodeid: key}`` of the tests that passed.
+CACHE_KEY = 'pytest-raises/incremental'
+
+
+class IncrementalRecorder:
+    """
+    ``pytest`` plugin recording, in ``config.cache``, a key for every test carrying an
+    expectation that passed, and deselecting the tests whose key is unchanged on the next
+    runs.  The key of a test hashes:
+
+    - the source of the test function;
+    - ``spec_fingerprint(item)``, the compiled ``setup_raises`` / ``raises`` spec of the
+      test, ``None`` for tests carrying no expectation (these are always run); and
+    - the source of the project modules, i.e., the ones below the ``rootdir``, that the
+      test module and the modules defining its fixtures import, transitively.
+
+    Imports are discovered from the module namespaces (imported modules, and the modules
+    defining the imported functions and classes).  Changes to installed packages, or to
+    data files read by the tests, are not detected: run without ``--raises-incremental``
+    (or with ``--cache-clear``) after such changes.
+
+    The key of a test travels on its reports as ``raises_incremental_key``, and the cache is
+    updated from the reports: under ``pytest-xdist`` the workers collect, key and deselect
+    the tests, and the controller, which receives the reports of every worker, writes the
+    cache.
+    """
+
+    def __init__(self, config, spec_fingerprint):
+        self._spec_fingerprint = spec_fingerprint
+        self._root = str(getattr(config, 'rootpath', None) or config.rootdir) + os.sep
+        self._passed = dict(config.cache.get(CACHE_KEY, {}))
+        # ``{nodeid: key}`` of the tests collected by this process carrying an expectation.
+        self._keys = {}
+        self.deselected = 0
+        # Per session memos: ``{function or module: digest}`` and ``{path: digest}``.
+        self._digests = {}
+        self._file_digests = {}
+
+    def _file_digest(self, path):
+        digest = self._file_digests.get(path)
+        if digest is None:
+            try:
+                with open(path, 'rb') as source:
+                    digest = hashlib.sha256(source.read()).hexdigest()
+            except (IOError, OSError):
+                digest = 'missing'
+            self._file_digests[path] = digest
+        return digest
+
+    def _project_file(self, module):
+        path = getattr(module, '__file__', None)
+        if path and os.path.abspath(path).startswith(self._root):
+            return os.path.abspath(path)
+        return None
+
+    def _closure_digest(self, module):
+        """Hash the sources of ``module`` and of the project modules it imports, transitively."""
+        digest = self._digests.get(module)
+        if digest is not None:
+            return digest
+        paths = set()
+        pending, seen = [module], set()
+        while pending:
+            current = pending.pop()
+            if current.__name__ in seen:
+                continue
+            seen.add(current.__name__)
+            path = self._project_file(current)
+            if path is None:
+                continue
+            paths.add(path)
+            for value in list(vars(current).values()):
+                imported = value if isinstance(value, types.ModuleType) else sys.modules.get(getattr(value, '__module__', None) or '')
+                if isinstance(imported, types.ModuleType) and imported.__name__ not in seen:
+                    pending.append(imported)
+        digest = hashlib.sha256(
+            ''.join('{}:{}\n'.format(path, self._file_digest(path)) for path in sorted(paths)).encode('utf-8')
+        ).hexdigest()
+        self._digests[module] = digest
+        return digest
+
+    def _function_digest(self, function):
+        digest = self._digests.get(function)
+        if digest is None:
+            try:
+                source = inspect.getsource(function).encode('utf-8')
+            except (IOError, OSError, TypeError):
+                source = getattr(getattr(function, '__code__', None), 'co_code', b'')
+            digest = self._digests[function] = hashlib.sha256(source).hexdigest()
+        return digest
+
+    def key(self, item):
+        """Return the key of ``item``, ``None`` if it carries no expectation or is not a function."""
+        fingerprint = self._spec_fingerprint(item)
+        function = getattr(item, 'function', None)
+        module = getattr(item, 'module', None)
+        if fingerprint is None or function is None or module is None:
+            return None
+        modules = {module.__name__: module}
+        # pylint: disable=protected-access
+        for fixturedefs in getattr(getattr(item, '_fixtureinfo', None), 'name2fixturedefs', {}).values():
+            for fixturedef in fixturedefs:
+                fixture_module = sys.modules.get(getattr(fixturedef.func, '__module__', None) or '')
+                if fixture_module is not None:
+                    modules[fixture_module.__name__] = fixture_module
+        parts = [self._function_digest(function), fingerprint]
+        parts.extend(self._closure_digest(modules[name]) for name in sorted(modules))
+        return hashlib.sha256('\n'.join(parts).encode('utf-8')).hexdigest()
+
+    def pytest_collection_modifyitems(self, config, items):
+        selected, deselected = [], []
+        for item in items:
+            key = self.key(item)
+            if key is not None and self._passed.get(item.nodeid) == key:
+                deselected.append(item)
+                continue
+            if key is not None:
+                self._keys[item.nodeid] = key
+            selected.append(item)
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = selected
+            self.deselected = len(deselected)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item):
+        outcome = yield
+        key = self._keys.get(item.nodeid)
+        if key is not None:
+            outcome.get_result().raises_incremental_key = key
+
+    def pytest_runtest_logreport(self, report):
+        key = getattr(report, 'raises_incremental_key', None)
+        if key is None:
+            return
+        if report.failed or report.skipped:
+            # A failure (or skip) in any phase invalidates the test until it passes again.
+            self._passed.pop(report.nodeid, None)
+        elif report.when == 'call':
+            self._passed[report.nodeid] = key
+
+    def pytest_sessionfinish(self, session):
+        # The workers of `pytest-xdist` leave the cache to the controller.
+        if not hasattr(session.config, 'workerinput'):
+            session.config.cache.set(CACHE_KEY, self._passed)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.deselected:
+            terminalreporter.write_line(
+                'pytest-raises: {} unchanged expected-raise tests deselected (--raises-incremental)'.format(self.deselected)
+            )
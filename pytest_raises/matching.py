@@ -0,0 +1,610 @@
+# -*- coding: utf-8 -*-
+"""
+Alternative engines for the ``match`` argument of the pytest-raises markers, guarding the
+call phase against patterns that backtrack catastrophically:
+
+- :class:`BudgetedPattern`: the ``re`` engine, interrupted once a time budget is spent.
+- :class:`LinearPattern`: a linear time engine supporting a safe subset of the ``re``
+  syntax (no backreferences, lookarounds, atomic groups or possessive repeats).
+
+:class:`AnyPattern` matches the patterns of ``match_any`` in a single scan of the message.
+
+All of them mirror the part of the ``re.Pattern`` interface used by pytest-raises: a ``pattern``
+attribute and ``match(string, pos, endpos)``.
+"""
+import collections
+import re
+import signal
+import threading
+import time
+
+try:  # Python 3.11+
+    from re import _compiler as sre_compile, _constants as sre_constants, _parser as sre_parse
+except ImportError:  # pragma: no cover (Python < 3.11)
+    import sre_compile  # pylint: disable=deprecated-module
+    import sre_constants  # pylint: disable=deprecated-module
+    import sre_parse  # pylint: disable=deprecated-module
+
+ENGINES = ('re', 'linear')
+
+# The ``re`` methods selectable with ``match_mode``.
+MODES = ('match', 'search', 'fullmatch')
+
+# ``match_any`` lists of at least that many plain substrings are searched for with an
+# Aho-Corasick automaton, below it the ``re`` alternation is faster.
+AHO_CORASICK_THRESHOLD = 32
+
+# The characters making a pattern more than a plain substring.
+_METACHARACTERS = frozenset('.^$*+?{}[]\\|()')
+
+# ``re.Pattern`` is only exposed by name on Python 3.7+.
+_PATTERN_TYPE = type(re.compile(''))
+
+# Repeats are unrolled by the linear engine, bound the size of the resulting program.
+MAX_PROGRAM_SIZE = 10000
+
+
+class MatchBudgetExceeded(Exception):
+    """Raised by :meth:`BudgetedPattern.match` when the time budget is spent."""
+
+
+def _raise_budget_exceeded(signum, frame):  # pylint: disable=unused-argument
+    raise MatchBudgetExceeded()
+
+
+class BudgetedPattern:
+    """
+    A compiled ``re`` pattern whose ``match`` is interrupted, raising
+    :class:`MatchBudgetExceeded`, after ``timeout`` seconds.
+
+    The budget relies on ``SIGALRM`` interrupting the ``re`` engine, it is only enforced
+    in the main thread of platforms providing ``signal.setitimer`` (i.e., not Windows).
+    A timer already set by someone else (e.g., ``pytest-timeout``) is left alone if it
+    expires first, and is otherwise restored afterwards.
+    """
+    __slots__ = ('regex', 'timeout')
+
+    def __init__(self, regex, timeout):
+        self.regex = regex
+        self.timeout = timeout
+
+    @property
+    def pattern(self):
+        return self.regex.pattern
+
+    def _budgeted(self, method, string, pos, endpos):
+        endpos = len(string) if endpos is None else endpos
+        method = getattr(self.regex, method)
+        if not hasattr(signal, 'setitimer') or threading.current_thread() is not threading.main_thread():
+            return method(string, pos, endpos)  # pragma: no cover (no SIGALRM)
+
+        previous_handler = signal.signal(signal.SIGALRM, _raise_budget_exceeded)
+        previous_delay, previous_interval = signal.setitimer(signal.ITIMER_REAL, self.timeout)
+        if previous_delay and previous_delay <= self.timeout:
+            # The existing timer expires first, it takes precedence over the budget.
+            signal.setitimer(signal.ITIMER_REAL, previous_delay, previous_interval)
+            signal.signal(signal.SIGALRM, previous_handler)
+            return method(string, pos, endpos)
+
+        start = time.monotonic()
+        try:
+            return method(string, pos, endpos)
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_handler)
+            if previous_delay:
+                remaining = max(previous_delay - (time.monotonic() - start), 1e-6)
+                signal.setitimer(signal.ITIMER_REAL, remaining, previous_interval)
+
+    def match(self, string, pos=0, endpos=None):
+        return self._budgeted('match', string, pos, endpos)
+
+    def match_index(self, string, pos=0, endpos=None):
+        """Budgeted :meth:`AnyPattern.match_index`, for a wrapped :class:`AnyPattern`."""
+        return self._budgeted('match_index', string, pos, endpos)
+
+
+class ModePattern:
+    """
+    A compiled ``re`` pattern whose ``match`` performs ``regex.search`` or
+    ``regex.fullmatch`` instead, according to ``mode``.
+    """
+    __slots__ = ('regex', 'mode', '_method')
+
+    def __init__(self, regex, mode):
+        self.regex = regex
+        self.mode = mode
+        self._method = getattr(regex, mode)
+
+    @property
+    def pattern(self):
+        return self.regex.pattern
+
+    def match(self, string, pos=0, endpos=None):
+        return self._method(string, pos, len(string) if endpos is None else endpos)
+
+
+# Instructions of the linear engine's program.
+_CHAR, _SPLIT, _JUMP, _ASSERT, _MATCH = range(5)
+
+_NEWLINE = '\n'
+
+
+def _is_word(char, ascii_only):
+    return (char.isalnum() or char == '_') and (not ascii_only or char < '\x80')
+
+
+def _category_predicate(category, ascii_only):
+    """Return the predicate of an ``sre`` character category such as ``\\d``."""
+    digit = (lambda char: '0' <= char <= '9') if ascii_only else (lambda char: char.isdecimal())
+    space = (lambda char: char in ' \t\n\r\f\v') if ascii_only else (lambda char: char.isspace())
+    predicates = {
+        sre_constants.CATEGORY_DIGIT: digit,
+        sre_constants.CATEGORY_NOT_DIGIT: lambda char: not digit(char),
+        sre_constants.CATEGORY_SPACE: space,
+        sre_constants.CATEGORY_NOT_SPACE: lambda char: not space(char),
+        sre_constants.CATEGORY_WORD: lambda char: _is_word(char, ascii_only),
+        sre_constants.CATEGORY_NOT_WORD: lambda char: not _is_word(char, ascii_only),
+    }
+    if category not in predicates:
+        raise ValueError('unsupported character category {}'.format(category))
+    return predicates[category]
+
+
+def _literal_predicate(code, ignorecase):
+    literal = chr(code)
+    if ignorecase:
+        folded = literal.casefold()
+        return lambda char: char.casefold() == folded
+    return lambda char: char == literal
+
+
+def _set_predicate(items, ignorecase, ascii_only):
+    """Return the predicate of an ``sre`` character set such as ``[^a-z\\d]``."""
+    negate = False
+    tests = []
+    for op, av in items:
+        if op is sre_constants.NEGATE:
+            negate = True
+        elif op is sre_constants.LITERAL:
+            tests.append(_literal_predicate(av, ignorecase))
+        elif op is sre_constants.RANGE:
+            low, high = chr(av[0]), chr(av[1])
+            if ignorecase:
+                tests.append(lambda char, low=low, high=high: any(
+                    low <= variant <= high for variant in (char, char.lower(), char.upper())
+                ))
+            else:
+                tests.append(lambda char, low=low, high=high: low <= char <= high)
+        elif op is sre_constants.CATEGORY:
+            tests.append(_category_predicate(av, ascii_only))
+        else:
+            raise ValueError('unsupported character set item {}'.format(op))
+    if negate:
+        return lambda char: not any(test(char) for test in tests)
+    return lambda char: any(test(char) for test in tests)
+
+
+def _assertion(at_code, multiline, ascii_only):
+    """Return the ``(string, position, endpos) -> bool`` test of an ``sre`` anchor."""
+    def boundary(string, position, endpos):
+        before = position > 0 and _is_word(string[position - 1], ascii_only)
+        after = position < endpos and _is_word(string[position], ascii_only)
+        return before != after
+
+    def end(string, position, endpos):
+        return position == endpos or (position == endpos - 1 and string[position] == _NEWLINE)
+
+    assertions = {
+        sre_constants.AT_BEGINNING_STRING: lambda string, position, endpos: position == 0,
+        sre_constants.AT_END_STRING: lambda string, position, endpos: position == endpos,
+        sre_constants.AT_BOUNDARY: boundary,
+        sre_constants.AT_NON_BOUNDARY: lambda string, position, endpos: not boundary(string, position, endpos),
+    }
+    if multiline:
+        assertions[sre_constants.AT_BEGINNING] = lambda string, position, endpos: (
+            position == 0 or string[position - 1] == _NEWLINE
+        )
+        assertions[sre_constants.AT_END] = lambda string, position, endpos: (
+            position == endpos or string[position] == _NEWLINE
+        )
+    else:
+        assertions[sre_constants.AT_BEGINNING] = assertions[sre_constants.AT_BEGINNING_STRING]
+        assertions[sre_constants.AT_END] = end
+    if at_code not in assertions:
+        raise ValueError('unsupported anchor {}'.format(at_code))
+    return assertions[at_code]
+
+
+class _Compiler:
+    """Compiles an ``sre_parse`` tree into a program of the linear engine."""
+
+    def __init__(self):
+        self.program = []
+
+    def emit(self, *instruction):
+        if len(self.program) >= MAX_PROGRAM_SIZE:
+            raise ValueError('pattern too large for the linear engine (repeats are unrolled)')
+        self.program.append(list(instruction))
+        return len(self.program) - 1
+
+    def compile_sequence(self, items, flags):
+        for op, av in items:
+            self.compile_item(op, av, flags)
+
+    def compile_item(self, op, av, flags):  # pylint: disable=too-many-branches
+        ignorecase = bool(flags & re.IGNORECASE)
+        ascii_only = bool(flags & re.ASCII)
+        if op is sre_constants.LITERAL:
+            self.emit(_CHAR, _literal_predicate(av, ignorecase))
+        elif op is sre_constants.NOT_LITERAL:
+            literal = _literal_predicate(av, ignorecase)
+            self.emit(_CHAR, lambda char: not literal(char))
+        elif op is sre_constants.ANY:
+            dotall = bool(flags & re.DOTALL)
+            self.emit(_CHAR, lambda char: dotall or char != _NEWLINE)
+        elif op is sre_constants.IN:
+            self.emit(_CHAR, _set_predicate(av, ignorecase, ascii_only))
+        elif op is sre_constants.AT:
+            self.emit(_ASSERT, _assertion(av, bool(flags & re.MULTILINE), ascii_only))
+        elif op is sre_constants.BRANCH:
+            self.compile_branch(av[1], flags)
+        elif op is sre_constants.SUBPATTERN:
+            if len(av) == 4:  # Python 3.6+: (group, add_flags, del_flags, pattern)
+                flags = (flags | av[1]) & ~av[2]
+            self.compile_sequence(av[-1], flags)
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+            # Greediness does not change *whether* a pattern matches.
+            self.compile_repeat(av[0], av[1], av[2], flags)
+        else:
+            raise ValueError('unsupported syntax {} (backreferences, lookarounds, atomic groups and '
+                             'possessive repeats are not supported)'.format(op))
+
+    def compile_branch(self, alternatives, flags):
+        jumps = []
+        for index, alternative in enumerate(alternatives):
+            if index < len(alternatives) - 1:
+                split = self.emit(_SPLIT, None, None)
+                self.program[split][1] = len(self.program)
+                self.compile_sequence(alternative, flags)
+                jumps.append(self.emit(_JUMP, None))
+                self.program[split][2] = len(self.program)
+            else:
+                self.compile_sequence(alternative, flags)
+        for jump in jumps:
+            self.program[jump][1] = len(self.program)
+
+    def compile_repeat(self, minimum, maximum, items, flags):
+        for _ in range(minimum):
+            self.compile_sequence(items, flags)
+        if maximum == sre_constants.MAXREPEAT:
+            split = self.emit(_SPLIT, None, None)
+            self.program[split][1] = len(self.program)
+            self.compile_sequence(items, flags)
+            self.emit(_JUMP, split)
+            self.program[split][2] = len(self.program)
+        else:
+            splits = []
+            for _ in range(maximum - minimum):
+                split = self.emit(_SPLIT, None, None)
+                self.program[split][1] = len(self.program)
+                splits.append(split)
+                self.compile_sequence(items, flags)
+            for split in splits:
+                self.program[split][2] = len(self.program)
+
+
+class LinearPattern:
+    """
+    A pattern matched in ``O(len(pattern) * len(string))`` time by simulating all of its
+    alternatives at once (a Pike VM), instead of backtracking as ``re`` does.  Only tells
+    *whether* the pattern matches: ``match`` returns ``True`` rather than a match object,
+    and ``None`` as ``re`` does when the pattern does not match.
+
+    ``mode`` is the ``re`` method emulated by ``match``: ``'match'``, ``'search'`` or
+    ``'fullmatch'``.  :meth:`any` builds a single program out of several patterns, whose
+    :meth:`match_index` tells which of them matched.
+
+    Compilation raises ``ValueError`` for patterns outside the supported subset.
+    """
+
+    def __init__(self, pattern, flags=0, mode='match'):
+        self._compile([(pattern, flags)], mode)
+        self.pattern = pattern
+        self.flags = self._flags[0]
+
+    @classmethod
+    def any(cls, patterns, flags=0, mode='match'):
+        """
+        Return a :class:`LinearPattern` matching if any of ``patterns`` matches, strings
+        compiled with ``flags`` and compiled ``re`` patterns with their own flags.
+        """
+        linear = cls.__new__(cls)
+        linear._compile([  # pylint: disable=protected-access
+            (pattern.pattern, pattern.flags) if isinstance(pattern, _PATTERN_TYPE) else (pattern, flags) for pattern in patterns
+        ], mode)
+        linear.pattern = tuple(patterns)
+        linear.flags = flags
+        return linear
+
+    def _compile(self, patterns, mode):
+        if mode not in MODES:
+            raise ValueError('unsupported mode {!r}'.format(mode))
+        compiler = _Compiler()
+        self._flags = []
+        # Alternatives are tried in order, as the branches of an ``re`` alternation are.
+        splits = []
+        for index, (pattern, flags) in enumerate(patterns):
+            if isinstance(pattern, bytes):
+                raise ValueError('the linear engine only supports str patterns')
+            parsed = sre_parse.parse(pattern, flags)
+            state = getattr(parsed, 'state', None) or parsed.pattern  # `pattern` before Python 3.8
+            self._flags.append(state.flags)
+            if index < len(patterns) - 1:
+                split = compiler.emit(_SPLIT, None, None)
+                compiler.program[split][1] = len(compiler.program)
+                splits.append(split)
+            compiler.compile_sequence(parsed, state.flags)
+            compiler.emit(_MATCH, index)
+            if index < len(patterns) - 1:
+                compiler.program[splits[-1]][2] = len(compiler.program)
+        self.mode = mode
+        self._program = compiler.program
+        self._alternatives = len(patterns)
+
+    def _add_thread(self, threads, seen, pc, string, *, position, endpos):
+        stack = [pc]
+        while stack:
+            pc = stack.pop()
+            if pc in seen:
+                continue
+            seen.add(pc)
+            instruction = self._program[pc]
+            kind = instruction[0]
+            if kind == _JUMP:
+                stack.append(instruction[1])
+            elif kind == _SPLIT:
+                stack.append(instruction[2])
+                stack.append(instruction[1])
+            elif kind == _ASSERT:
+                if instruction[1](string, position, endpos):
+                    stack.append(pc + 1)
+            else:
+                threads.append(pc)
+
+    def match_index(self, string, pos=0, endpos=None):
+        """
+        Return the index of the pattern that matched, ``None`` if none did.  Among the
+        patterns matching at the leftmost position, the first one (in order) is reported,
+        as ``re`` reports the first matching branch of an alternation.
+        """
+        endpos = len(string) if endpos is None else min(endpos, len(string))
+        program = self._program
+        search = self.mode == 'search'
+        fullmatch = self.mode == 'fullmatch'
+        # A single pattern has no alternative to prefer, stop at its first match.
+        first_match_wins = self._alternatives == 1 and not fullmatch
+        matched = None
+        threads = []
+        self._add_thread(threads, set(), 0, string, position=pos, endpos=endpos)
+        for position in range(pos, endpos + 1):
+            next_threads = []
+            seen = set()
+            for pc in threads:
+                instruction = program[pc]
+                if instruction[0] == _MATCH:
+                    if fullmatch and position != endpos:
+                        continue
+                    if first_match_wins:
+                        return instruction[1]
+                    # Lower priority threads can no longer win, higher priority ones may.
+                    matched = instruction[1]
+                    break
+                if position < endpos and instruction[1](string[position]):
+                    self._add_thread(next_threads, seen, pc + 1, string, position=position + 1, endpos=endpos)
+            if search and matched is None and position < endpos:
+                # Unanchored: a new, lowest priority, attempt starts at every position.
+                self._add_thread(next_threads, seen, 0, string, position=position + 1, endpos=endpos)
+            # A search goes on while restarts remain, e.g., `\bbar` fails its first attempts on "foo bar".
+            if position == endpos or not (next_threads or search and matched is None):
+                return matched
+            threads = next_threads
+        return matched  # pragma: no cover (the loop always returns)
+
+    def match(self, string, pos=0, endpos=None):
+        return True if self.match_index(string, pos, endpos) is not None else None
+
+
+class AhoCorasick:  # pylint: disable=too-few-public-methods
+    """
+    An Aho-Corasick automaton finding occurrences of any of several plain substrings in a
+    single pass over the string, whatever the number of substrings.
+    """
+
+    def __init__(self, substrings):
+        # Per state: ``{char: next state}``, the failure state, and the index of the first
+        # (in order) substring ending at the state, if any.
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [None]
+        for index, substring in enumerate(substrings):
+            state = 0
+            for char in substring:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(None)
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            if self._output[state] is None:
+                self._output[state] = index
+        # Breadth first, so that the failure state of a state is always complete.
+        queue = collections.deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                inherited = self._output[self._fail[child]]
+                if inherited is not None and (self._output[child] is None or inherited < self._output[child]):
+                    self._output[child] = inherited
+        self._empty = self._output[0]
+
+    def search_index(self, string, pos=0, endpos=None):
+        """Return the index of a substring occurring in ``string[pos:endpos]``, ``None`` if none does."""
+        if self._empty is not None:
+            return self._empty
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for char in string[pos:endpos]:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state] is not None:
+                return output[state]
+        return None
+
+
+def _is_plain(pattern):
+    return isinstance(pattern, str) and not _METACHARACTERS.intersection(pattern)
+
+
+# The inline form of the flags that can be scoped to a group, e.g., ``(?i:...)``.
+_SCOPED_FLAGS = ((re.IGNORECASE, 'i'), (re.MULTILINE, 'm'), (re.DOTALL, 's'), (re.VERBOSE, 'x'))
+
+
+def _scoped(pattern, flags):
+    """Return ``pattern`` with ``flags`` scoped to it, ``None`` if some cannot be scoped."""
+    letters = ''.join(letter for flag, letter in _SCOPED_FLAGS if flags & flag)
+    remaining = flags & ~(re.IGNORECASE | re.MULTILINE | re.DOTALL | re.VERBOSE | re.UNICODE)
+    if remaining:
+        return None
+    return '(?{}:{})'.format(letters, pattern) if letters else pattern
+
+
+class AnyPattern:
+    """
+    Any of several patterns, compiled once into a single matcher so that a string is
+    scanned once rather than once per pattern:
+
+    - with the ``'linear'`` engine, a :class:`LinearPattern` running all the patterns;
+    - in ``'search'`` mode, when there are at least :data:`AHO_CORASICK_THRESHOLD` patterns
+      and all are plain substrings (no metacharacter, no flags), an :class:`AhoCorasick`
+      automaton;
+    - otherwise, a single ``re`` alternation of the patterns, each one in a named group
+      telling which pattern matched.  Patterns that cannot be combined, i.e., numbered
+      backreferences, global inline flags, or ``flags`` that cannot be scoped to a group,
+      are matched one after the other instead.
+
+    ``patterns`` are strings or compiled ``re`` patterns (whose flags then apply), ``flags``
+    apply to the strings and ``mode`` is the ``re`` method performed, see :data:`MODES`.
+    """
+
+    def __init__(self, patterns, flags=0, mode='match', engine='re'):
+        if not patterns:
+            raise ValueError('at least one pattern is required')
+        if mode not in MODES:
+            raise ValueError('unsupported mode {!r}'.format(mode))
+        self.pattern = tuple(patterns)
+        self.mode = mode
+        sources = []
+        for pattern in self.pattern:
+            if isinstance(pattern, _PATTERN_TYPE):
+                sources.append((pattern.pattern, pattern.flags))
+            elif isinstance(pattern, str):
+                sources.append((pattern, flags))
+            else:
+                raise TypeError('patterns must be strings or compiled patterns, not {!r}'.format(pattern))
+        self._linear = self._automaton = self._combined = self._regexes = None
+        if engine == 'linear':
+            self._linear = LinearPattern.any(self.pattern, flags, mode)
+        elif mode == 'search' and len(sources) >= AHO_CORASICK_THRESHOLD and all(
+            _is_plain(source) and not pattern_flags & ~re.UNICODE for source, pattern_flags in sources
+        ):
+            self._automaton = AhoCorasick([source for source, _ in sources])
+        else:
+            self._regexes = [re.compile(source, pattern_flags) for source, pattern_flags in sources]
+            scoped = [_scoped(source, pattern_flags) for source, pattern_flags in sources]
+            if all(part is not None for part in scoped) and not any(_has_backreference(regex) for regex in self._regexes):
+                try:
+                    self._combined = getattr(re.compile('|'.join(
+                        '(?P<_any{}>{})'.format(index, part) for index, part in enumerate(scoped)
+                    )), mode)
+                except re.error:
+                    pass
+            if self._combined is not None:
+                self._regexes = None
+            else:
+                self._regexes = [getattr(regex, mode) for regex in self._regexes]
+
+    def match_index(self, string, pos=0, endpos=None):
+        """
+        Return the index of the pattern that matched ``string[pos:endpos]``, ``None`` if
+        none did.  Among several matching patterns, the first one (in order) matching at the
+        leftmost position is reported; the Aho-Corasick automaton reports the first one
+        ending at the leftmost position instead.
+        """
+        endpos = len(string) if endpos is None else endpos
+        if self._linear is not None:
+            return self._linear.match_index(string, pos, endpos)
+        if self._automaton is not None:
+            return self._automaton.search_index(string, pos, endpos)
+        if self._combined is not None:
+            found = self._combined(string, pos, endpos)
+            return int(found.lastgroup[4:]) if found is not None else None
+        for index, regex in enumerate(self._regexes):
+            if regex(string, pos, endpos) is not None:
+                return index
+        return None
+
+    def match(self, string, pos=0, endpos=None):
+        return True if self.match_index(string, pos, endpos) is not None else None
+
+
+def _has_backreference(regex):
+    """Tell whether ``regex`` refers back to its groups, which combining would renumber."""
+    pending = [sre_parse.parse(regex.pattern, regex.flags)]
+    while pending:
+        value = pending.pop()
+        if isinstance(value, sre_parse.SubPattern):
+            for op, av in value:
+                if op in (sre_constants.GROUPREF, sre_constants.GROUPREF_EXISTS):
+                    return True
+                pending.append(av)
+        elif isinstance(value, (list, tuple)):
+            pending.extend(value)
+    return False
+
+
+def longest_match_end(regex, string, endpos):
+    """
+    Return the end of the match, in ``string[:endpos]``, of the longest leading part of
+    the pattern of ``regex`` that matches it (``0`` if none does), i.e., how far the
+    pattern got before it failed, or ``None`` if ``regex`` cannot be told.
+
+    The leading parts are sequences of the top level items of the pattern, their number
+    is found by bisection: a part matching implies its own leading parts match.  Only
+    plain ``re`` patterns, possibly in ``'search'`` / ``'fullmatch'`` mode (the latter
+    tried as ``'match'``), are supported; budgeted and linear patterns are not run again.
+    """
+    mode = 'match'
+    if isinstance(regex, ModePattern):
+        mode = 'search' if regex.mode == 'search' else 'match'
+        regex = regex.regex
+    if not isinstance(regex, _PATTERN_TYPE) or not isinstance(regex.pattern, str):
+        return None
+    parsed = sre_parse.parse(regex.pattern, regex.flags)
+    state = getattr(parsed, 'state', None) or parsed.pattern  # `pattern` before Python 3.8
+    found, low, high = 0, 0, len(parsed.data)
+    while low < high:
+        middle = (low + high + 1) // 2
+        part = sre_compile.compile(sre_parse.SubPattern(state, parsed.data[:middle]), state.flags)
+        matched = getattr(part, mode)(string, 0, endpos)
+        if matched is not None:
+            found, low = matched.end(), middle
+        else:
+            high = middle - 1
+    return found
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+The messages handled by the validation of :mod:`pytest_raises.pytest_raises`: the message
+of the raised exception, and the failure messages, both rendered lazily.
+
+.. warning::
+
+    **The contents of this module are "private", not intended to be used directly by external
+    projects!**
+"""
+from pytest_raises.matching import longest_match_end
+
+
+class _LazyMessage:
+    """
+    A failure message formatted from ``template`` and ``args`` only when it is first
+    rendered, e.g., when ``pytest`` builds the report of a failed test.  Used as the sole
+    argument of :class:`ExpectedException` / :class:`ExpectedMessage`, so that
+    ``str(exception)`` returns the formatted message.
+    """
+    __slots__ = ('template', 'args', '_text')
+
+    def __init__(self, template, *args):
+        self.template = template
+        self.args = args
+        self._text = None
+
+    def __str__(self):
+        if self._text is None:
+            self._text = self.template.format(*self.args)
+        return self._text
+
+    def __repr__(self):
+        return repr(str(self))
+
+
+class _RaisedMessage:
+    """
+    The message of a raised exception, shared by the matching and reporting steps.
+
+    ``str(exception)`` is called at most once, and only when the message is first needed.
+    With a non-zero ``max_length`` (see the ``raises_max_message_length`` ini option),
+    only the first ``max_length`` characters take part in matching, and the message is
+    rendered in failure reports with its middle replaced by a truncation marker.
+    """
+    __slots__ = ('exception', 'max_length', '_text')
+
+    def __init__(self, exception, max_length):
+        self.exception = exception
+        self.max_length = max_length
+        self._text = None
+
+    @property
+    def text(self):
+        """The complete ``str(exception)``."""
+        if self._text is None:
+            self._text = str(self.exception)
+        return self._text
+
+    @property
+    def computed(self):
+        """Whether :attr:`text` was computed, i.e., ``str(exception)`` was called."""
+        return self._text is not None
+
+    @property
+    def end(self):
+        """The end index of :attr:`text` taking part in matching."""
+        return min(len(self.text), self.max_length) if self.max_length else len(self.text)
+
+    def contains(self, message):
+        return self.text.find(message, 0, self.end) != -1
+
+    def matches(self, regex):
+        return regex.match(self.text, 0, self.end) is not None
+
+    def match_index(self, regex):
+        return regex.match_index(self.text, 0, self.end)
+
+    def truncated(self, max_length):
+        """Return :attr:`text` truncated in the middle to ``max_length`` characters, see :func:`_truncate`."""
+        return _truncate(self.text, max_length)
+
+    def __str__(self):
+        return self.truncated(self.max_length)
+
+
+def _truncate(text, max_length):
+    """
+    Return ``text`` with its middle replaced by a truncation marker so that only
+    ``max_length`` of its characters are kept, ``text`` itself if it is short enough or
+    ``max_length`` is zero.
+    """
+    if not max_length or len(text) <= max_length:
+        return text
+    head = max_length // 2
+    tail = max_length - head
+    return '{}...[{} characters truncated]...{}'.format(
+        text[:head], len(text) - max_length, text[len(text) - tail:]
+    )
+
+
+# Raised messages longer than that are shown around the point where they diverge only.
+COMPACT_LENGTH = 160
+
+# The number of characters shown on each side of the point of divergence.
+CONTEXT = 40
+
+
+def _clip(text, context=CONTEXT):
+    return text if len(text) <= context else text[:context] + '...'
+
+
+def _excerpt(text, position, context=CONTEXT):
+    """Return the window of ``text`` around ``position``, elided on the sides it cuts."""
+    start = max(position - context, 0)
+    end = min(position + context, len(text))
+    return '{}{}{}'.format('...' if start else '', text[start:end], '...' if end < len(text) else '')
+
+
+def _longest_part_found(message, text, end):
+    """
+    Return ``(length, position)`` of the longest leading part of ``message`` found in
+    ``text[:end]``, ``position`` being where its first occurrence ends.  A part being found
+    implies its own leading parts are, so its length is found by bisection.
+    """
+    low, high, position = 0, len(message), 0
+    while low < high:
+        middle = (low + high + 1) // 2
+        index = text.find(message[:middle], 0, end)
+        if index != -1:
+            low, position = middle, index + middle
+        else:
+            high = middle - 1
+    return low, position
+
+
+class _MismatchMessage:
+    """
+    The failure message of a raised message, ``raised_message`` (a :class:`_RaisedMessage`),
+    that does not contain ``message`` or does not match ``regex`` (``patterns`` for
+    ``match_any``), ``suffix`` being appended to the description of the pattern.  Rendered
+    only when first needed, as :class:`_LazyMessage` is.
+
+    Raised messages of at most :data:`COMPACT_LENGTH` characters are shown whole.  Longer
+    ones are only shown :data:`CONTEXT` characters around the point where they diverge from
+    the expectation: the end of the longest leading part of ``message`` that they contain,
+    or of the match of the longest leading part of the pattern of ``regex`` (see
+    :func:`~pytest_raises.matching.longest_match_end`), their beginning otherwise.
+    """
+    __slots__ = ('raised_message', 'message', 'regex', 'patterns', 'suffix', '_text')
+
+    def __init__(self, raised_message, message=None, regex=None, patterns=None, suffix=''):
+        self.raised_message = raised_message
+        self.message = message
+        self.regex = regex
+        self.patterns = patterns
+        self.suffix = suffix
+        self._text = None
+
+    def _expectation(self, shown):
+        if self.message is not None:
+            return '"{}" not in "{}"'.format(self.message, shown)
+        if self.patterns is not None:
+            return 'None of {} matches raised message "{}"{}'.format(list(self.patterns), shown, self.suffix)
+        return '"{}" does not match raised message "{}"{}'.format(self.regex.pattern, shown, self.suffix)
+
+    def _render(self):
+        raised_message = self.raised_message
+        text, end = raised_message.text, raised_message.end
+        if len(text) <= COMPACT_LENGTH:
+            return self._expectation(raised_message)
+        detail = ''
+        position = 0
+        if self.message is not None:
+            length, position = _longest_part_found(self.message, text, end)
+            if length:
+                detail = '; the longest part found, "{}", ends at character {}, followed by "{}" instead of "{}"'.format(
+                    _clip(self.message[:length]), position, _clip(text[position:]), _clip(self.message[length:])
+                )
+            else:
+                detail = '; none of it is found'
+        elif self.regex is not None:
+            position = longest_match_end(self.regex, text, end) or 0
+            if position:
+                detail = '; the longest matching part of the pattern matches up to character {}, followed by "{}"'.format(
+                    position, _clip(text[position:])
+                )
+        return '{} (raised message of {} characters{})'.format(self._expectation(_excerpt(text, position)), len(text), detail)
+
+    def __str__(self):
+        if self._text is None:
+            self._text = self._render()
+        return self._text
+
+    def __repr__(self):
+        return repr(str(self))
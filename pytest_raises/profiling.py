@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+Instrumentation of the validation performed by pytest-raises, enabled with the
+``--raises-profile`` / ``--raises-profile-json`` command line options.
+"""
+import json
+import time
+
+import pytest
+
+# The steps of a validation, in the order they happen.
+STEPS = ('lookup', 'str', 'match', 'failure')
+
+# The number of validations, and of exception types, listed in the terminal summary.
+TOP = 10
+
+
+class ValidationProfiler:
+    """
+    ``pytest`` plugin recording the time spent validating each marked test, broken down
+    into :data:`STEPS`:
+
+    - ``lookup``: reading the compiled marker spec of the test.
+    - ``str``: computing the message of the raised exception, i.e., its ``__str__``.
+    - ``match``: checking the exception type and the ``message`` / ``match`` arguments.
+    - ``failure``: building the failure of a test that did not raise as expected.
+
+    The slowest validations and slowest exception ``__str__`` implementations are listed
+    in the terminal summary, and everything is written to ``json_path`` if given.
+
+    The timings of a phase travel on its report as ``raises_profile``, and are only
+    aggregated from the reports logged: under ``pytest-xdist`` the workers (``worker``
+    true) leave the summary and the JSON to the controller.
+
+    Usage from the validation::
+
+        profiler.start()
+        ...
+        profiler.lap('lookup')
+        ...
+        profiler.stop(item.nodeid, 'call')
+    """
+
+    def __init__(self, json_path=None, worker=False):
+        self.json_path = json_path
+        self.worker = worker
+        # ``(total, nodeid, phase, {step: seconds})`` of every validation.
+        self.validations = []
+        # ``{exception type name: [calls, total seconds, max seconds]}``.
+        self.exception_str = {}
+        self._last = 0.0
+        self._steps = {}
+        # The validations and ``[exception type name, seconds]`` not reported yet.
+        self._pending = {'validations': [], 'exception_str': []}
+
+    def start(self):
+        self._steps = {}
+        self._last = time.perf_counter()
+
+    def lap(self, step):
+        """Attribute the time elapsed since the previous lap to ``step``, and return it."""
+        now = time.perf_counter()
+        elapsed = now - self._last
+        self._steps[step] = self._steps.get(step, 0.0) + elapsed
+        self._last = now
+        return elapsed
+
+    def record_str(self, exception, seconds):
+        """Record that computing ``str(exception)`` took ``seconds``."""
+        name = '{}.{}'.format(type(exception).__module__, type(exception).__name__)
+        self._pending['exception_str'].append([name, seconds])
+
+    def stop(self, nodeid, phase):
+        # The laps cover the validation from its start up to the last one.
+        total = sum(self._steps.values()) + time.perf_counter() - self._last
+        self._pending['validations'].append({'nodeid': nodeid, 'phase': phase, 'total': total, 'steps': self._steps})
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self):
+        outcome = yield
+        if self._pending['validations'] or self._pending['exception_str']:
+            outcome.get_result().raises_profile = self._pending
+            self._pending = {'validations': [], 'exception_str': []}
+
+    def pytest_runtest_logreport(self, report):
+        profile = getattr(report, 'raises_profile', None)
+        if profile is None or self.worker:
+            return
+        for validation in profile['validations']:
+            self.validations.append((validation['total'], validation['nodeid'], validation['phase'], validation['steps']))
+        for name, seconds in profile['exception_str']:
+            stats = self.exception_str.setdefault(name, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = max(stats[2], seconds)
+
+    def _slowest_validations(self, limit=None):
+        return sorted(self.validations, key=lambda validation: validation[0], reverse=True)[:limit]
+
+    def _slowest_exception_str(self, limit=None):
+        return sorted(self.exception_str.items(), key=lambda item: item[1][2], reverse=True)[:limit]
+
+    def to_json(self):
+        return {
+            'validations': [
+                {'nodeid': nodeid, 'phase': phase, 'total': total, **{step: steps.get(step, 0.0) for step in STEPS}}
+                for total, nodeid, phase, steps in self._slowest_validations()
+            ],
+            'exception_str': [
+                {'type': name, 'calls': calls, 'total': total, 'max': maximum}
+                for name, (calls, total, maximum) in self._slowest_exception_str()
+            ],
+        }
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.worker:
+            return
+        terminalreporter.write_sep('=', 'pytest-raises: slowest {} validations'.format(TOP))
+        terminalreporter.write_line('{:>10} {} {:<5}  {}'.format(
+            'total', ' '.join('{:>10}'.format(step) for step in STEPS), 'phase', 'test'
+        ))
+        for total, nodeid, phase, steps in self._slowest_validations(TOP):
+            terminalreporter.write_line('{:>9.6f}s {} {:<5}  {}'.format(
+                total, ' '.join('{:>9.6f}s'.format(steps.get(step, 0.0)) for step in STEPS), phase, nodeid
+            ))
+
+        terminalreporter.write_sep('=', 'pytest-raises: slowest {} exception __str__'.format(TOP))
+        terminalreporter.write_line('{:>10} {:>10} {:>8}  {}'.format('max', 'total', 'calls', 'exception'))
+        for name, (calls, total, maximum) in self._slowest_exception_str(TOP):
+            terminalreporter.write_line('{:>9.6f}s {:>9.6f}s {:>8}  {}'.format(maximum, total, calls, name))
+
+        if self.json_path:
+            terminalreporter.write_line('pytest-raises: profile written to {}'.format(self.json_path))
+
+    def pytest_sessionfinish(self):
+        if self.json_path and not self.worker:
+            with open(self.json_path, 'w', encoding='utf-8') as output:
+                json.dump(self.to_json(), output, indent=2)
+
+
+def _lap(profiler, step):
+    """
+    Attribute the time elapsed since the previous step to ``step`` when profiling, see
+    :class:`ValidationProfiler`.
+
+    .. warning::
+
+        **This is a "private" function not intended to be called directly by external projects!**
+    """
+    if profiler is not None:
+        profiler.lap(step)
+
+
+def _profile_message(profiler, spec, raised_message):
+    """
+    Compute ``raised_message`` eagerly when profiling, so that the cost of the exception's
+    ``__str__`` is told apart from the matching.  Messages ``spec`` does not check, e.g.,
+    with ``attrs`` / ``args`` only, are left alone.
+
+    .. warning::
+
+        **This is a "private" function not intended to be called directly by external projects!**
+    """
+    if profiler is None or raised_message.exception is None:
+        return
+    if spec.message is not None or spec.match_regex is not None:
+        raised_message.text  # pylint: disable=pointless-statement
+        profiler.record_str(raised_message.exception, profiler.lap('str'))
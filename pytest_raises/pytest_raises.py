@@ -1,9 +1,28 @@
 # -*- coding: utf-8 -*-
-import re
-import sys
+import time
 
 import pytest
 
+from pytest_raises.asyncio_runner import LOOP_SCOPES, AsyncioRunner
+from pytest_raises.captured import CapturedException
+from pytest_raises.chains import ExceptionChain
+from pytest_raises.compat import _NodeSlot, _set_outcome_exception, _traceback_here
+from pytest_raises.features import FeaturePlugins
+from pytest_raises.frames import release_frames, render_traceback
+from pytest_raises.groups import BaseExceptionGroup as _BaseExceptionGroup, GroupIndex
+from pytest_raises.incremental import IncrementalRecorder
+from pytest_raises.matching import ENGINES, MatchBudgetExceeded
+from pytest_raises.messages import _LazyMessage, _MismatchMessage, _RaisedMessage
+from pytest_raises.profiling import ValidationProfiler, _lap, _profile_message
+from pytest_raises.repeat import RepeatFailure, RepeatRunner
+from pytest_raises.reporting import MESSAGE_LENGTH, OutcomeReport, _failure_payload
+from pytest_raises.scopes import SetupRaised, SetupVerdicts
+from pytest_raises.specs import (
+    REGEX_CACHE, _SPEC_CACHE, _TYPE_VERDICTS, _closest_markers, _compile_raises_marker, _describe_exception_classes,
+    _is_expected_type, _raises_table_spec
+)
+from pytest_raises.warns import _WARNS_MARKER_NAMES, WarnsChecker
+
 
 class ExpectedException(Exception):       # pragma: no cover
     pass                                  # pragma: no cover
@@ -13,10 +32,153 @@ class ExpectedMessage(Exception):         # pragma: no cover
     pass                                  # pragma: no cover
 
 
+class ExpectedAttributes(Exception):      # pragma: no cover
+    pass                                  # pragma: no cover
+
+
+class ExpectedWarning(Exception):         # pragma: no cover
+    pass                                  # pragma: no cover
+
+
 class PytestRaisesUsageError(Exception):  # pragma: no cover
     pass                                  # pragma: no cover
 
 
+# The compiled ``{marker_name: spec_or_None}`` of a test item.
+_ITEM_SPECS = _NodeSlot('_pytest_raises_specs')
+# The node IDs of the marked items of a session, stored on the config.
+_MARKED_NODEIDS = _NodeSlot('_pytest_raises_marked_nodeids')
+# The ``setup_raises`` failure message handed from the setup phase to the call phase.
+_SETUP_FAILURE = _NodeSlot('_pytest_raises_setup_failure')
+# The :class:`CapturedException` of an item, see :func:`get_raised_exception`.
+_CAPTURED = _NodeSlot('_pytest_raises_captured')
+# The ``(marker_name, ExceptionClass, failure_message)`` a marked item failed with, turned
+# into the ``raises_failure`` attribute of its call phase report.
+_FAILURE = _NodeSlot('_pytest_raises_failure')
+# Which exception group leaf, or exception chain link, a ``group=True`` or ``chained=True``
+# marker matched.
+_MATCHED_DETAIL = _NodeSlot('_pytest_raises_matched_detail')
+# The :class:`ValidationProfiler` of the session, with ``--raises-profile``.
+_PROFILER = _NodeSlot('_pytest_raises_profiler')
+# The :class:`OutcomeReport` of the session, with ``--raises-report``.
+_REPORTER = _NodeSlot('_pytest_raises_reporter')
+# The ``(raises_match_engine, raises_match_timeout)`` ini options, stored on the config.
+_MATCH_DEFAULTS = _NodeSlot('_pytest_raises_match_defaults')
+# The ``raises_max_message_length`` ini option, stored on the config.
+_MAX_MESSAGE_LENGTH = _NodeSlot('_pytest_raises_max_message_length')
+# The ``raises_release_frames`` ini option, stored on the config.
+_RELEASE_FRAMES = _NodeSlot('_pytest_raises_release_frames')
+# The exception of the last attempt of a `repeat=N` test, if it raised as expected.
+_REPEAT_MATCHED = _NodeSlot('_pytest_raises_repeat_matched')
+# The :class:`~pytest_raises.features.FeaturePlugins` of the session.
+_FEATURES = _NodeSlot('_pytest_raises_features')
+
+_MARKER_NAMES = ('setup_raises', 'raises')
+# The markers compiled into the specs of an item, see :func:`_compile_item_specs`.
+_SPEC_MARKER_NAMES = frozenset(_MARKER_NAMES + ('raises_table',))
+# The markers scanned for on the items that miss the index, see `_is_raises_marked`.
+_OWN_MARKER_NAMES = _SPEC_MARKER_NAMES.union(_WARNS_MARKER_NAMES)
+
+# Shared by every item carrying neither marker, so that unmarked items cost no allocation.
+_UNMARKED_SPECS = {'setup_raises': None, 'raises': None}
+
+
+def _compile_item_specs(item):
+    """
+    Compile and store the ``setup_raises`` / ``raises`` specs for ``item``, returning the
+    ``{marker_name: spec_or_None}`` dictionary stored.
+
+    .. warning::
+
+        **This is a "private" function not intended to be called directly by external projects!**
+    """
+    match_defaults = _MATCH_DEFAULTS.get(item.config, ('re', 0))
+    setup_marker, raises_marker, table_marker = _closest_markers(item)
+    specs = {
+        'setup_raises': _compile_raises_marker('setup_raises', setup_marker, match_defaults) if setup_marker else None,
+        'raises': _compile_raises_marker('raises', raises_marker, match_defaults) if raises_marker else None,
+    }
+    if specs['raises'] is None and table_marker:
+        specs['raises'] = _raises_table_spec(item, table_marker, match_defaults)
+    if not any(specs.values()):
+        specs = _UNMARKED_SPECS
+    _ITEM_SPECS.set(item, specs)
+    return specs
+
+
+def _get_item_spec(item, marker_name):
+    """
+    Return the compiled spec of ``marker_name`` for ``item``, or ``None`` if ``item`` is
+    not marked with it.  Items that did not go through ``pytest_collection_modifyitems``
+    (e.g., created by other plugins at run time) are compiled on first access.
+
+    .. warning::
+
+        **This is a "private" function not intended to be called directly by external projects!**
+    """
+    specs = _ITEM_SPECS.get(item)
+    if specs is None:
+        specs = _compile_item_specs(item)
+    return specs[marker_name]
+
+
+def _spec_fingerprint(item):
+    """
+    Return a string identifying the expectations of ``item`` across sessions (the compiled
+    ``setup_raises`` / ``raises`` specs without their compiled pattern), or ``None`` if it
+    carries none.  Used by ``--raises-incremental``.
+
+    .. warning::
+
+        **This is a "private" function not intended to be called directly by external projects!**
+    """
+    specs = [_get_item_spec(item, marker_name) for marker_name in _MARKER_NAMES]
+    if not any(specs):
+        return None
+    return repr([spec and spec._replace(match_regex=None) for spec in specs])
+
+
+def _is_raises_marked(item):
+    """
+    Return whether ``item`` carries a ``setup_raises`` or ``raises`` marker.  This is the
+    gate of both hook wrappers: it is a single set lookup into the node ID index built by
+    ``pytest_collection_modifyitems``, so that unmarked items skip all of this plugin's
+    work.  Without an index (collection did not go through this plugin) the markers of
+    ``item`` are compiled instead.
+
+    Markers added to ``item`` itself after collection, e.g., by a fixture calling
+    ``request.node.add_marker(pytest.mark.raises(...))``, miss the index: the own markers
+    of an item that misses it are scanned, and its specs compiled again if one of them
+    is a marker of this plugin: the item is then added to the index, and the plugins its
+    specs need are registered (see :class:`~pytest_raises.features.FeaturePlugins`).  A
+    ``setup_warns`` / ``warns`` marker found there is handed to the
+    :class:`~pytest_raises.warns.WarnsChecker`.
+
+    .. warning::
+
+        **This is a "private" function not intended to be called directly by external projects!**
+    """
+    marked_nodeids = _MARKED_NODEIDS.get(item.config)
+    if marked_nodeids is not None:
+        if item.nodeid in marked_nodeids:
+            return True
+        own_markers = getattr(item, 'own_markers', ())
+        names = [marker.name for marker in own_markers if marker.name in _OWN_MARKER_NAMES] if own_markers else ()
+        if not _SPEC_MARKER_NAMES.issuperset(names):
+            _FEATURES.get(item.config).require_for_warns(item)
+        if _SPEC_MARKER_NAMES.isdisjoint(names):
+            return False
+    specs = _ITEM_SPECS.get(item)
+    if specs is None or (specs is _UNMARKED_SPECS and marked_nodeids is not None):
+        specs = _compile_item_specs(item)
+    if specs is _UNMARKED_SPECS:
+        return False
+    if marked_nodeids is not None:
+        marked_nodeids.add(item.nodeid)
+    _FEATURES.get(item.config).require_for(item, specs)
+    return True
+
+
 def _pytest_fail_by_mark_or_set_excinfo(item, outcome, marker_name, ExceptionClass, failure_message, traceback):
     """
     Defer a test failure to a later stage, or set ``excinfo`` of ``outcome``, depending
@@ -31,13 +193,13 @@ def _pytest_fail_by_mark_or_set_excinfo(item, outcome, marker_name, ExceptionCla
     Depending on the stage at which this function is called, one of two actions will
     be performed:
 
-    1. ``marker_name='setup_raises'``: a "secret" marker will be added to ``item``
-       indicating that the test failed.  This marker is then checked at a later stage
+    1. ``marker_name='setup_raises'``: the failure message is stored in a per item slot
+       indicating that the test failed.  This slot is then checked at a later stage
        when it is safe to fail.  See documentation for :func:`_pytest_raises_validation`
        for more information.
-    2. ``marker_name='raises'``: the ``outcome.excinfo`` will be populated with an
-       exception traceback that will eventually (through ``pytest``) mark the test as
-       failed.
+    2. ``marker_name='raises'``: the ``outcome`` will be failed with an instance of
+       ``ExceptionClass`` (see :func:`~pytest_raises.compat._select_outcome_exception_setter`), which will
+       eventually (through ``pytest``) mark the test as failed.
 
     **Parameters**
 
@@ -57,53 +219,50 @@ def _pytest_fail_by_mark_or_set_excinfo(item, outcome, marker_name, ExceptionCla
         - ``'raises'``: call originates from ``pytest_runtest_call`` hook wrapper.
 
     ``ExceptionClass``
-        The exception class to re-raise.  Expected to be :class:`ExpectedException` or
+        The exception class to fail with.  Expected to be :class:`ExpectedException` or
         :class:`ExpectedMessage`, but not strictly required.
 
     ``failure_message``
-        The string failure message to mark with or re-raise, depending on the value
-        of ``marker_name``.
+        The failure message to mark with or fail with, depending on the value of
+        ``marker_name``.  Either a string or a :class:`_LazyMessage`, which is only
+        formatted if the failure is rendered.
 
     ``traceback``
         The traceback information if available, ``None`` otherwise.
+
+    With the ``raises_release_frames`` ini option, the failure is rendered right away,
+    see :func:`_pytest_raises_validation`.
     """
     # pylint: disable=unused-variable
     __tracebackhide__ = True
+    release = _RELEASE_FRAMES.get(item.config, False)
+    if release:
+        # Render everything now, the raised exception and its frames are released next.
+        failure_message = str(failure_message)
+    _FAILURE.set(item, (marker_name, ExceptionClass, failure_message))
     if marker_name == 'setup_raises':
         # In the later stage when `fail` is called, it is nice to "simulate" an
         # exception by putting the expected exception class's name as a prefix.
-        failure_message = '{}: {}'.format(ExceptionClass.__name__, failure_message)
-        item.add_marker(pytest.mark.setup_raises_expected_exc_or_message_not_found(failure_message))
+        failure_message = _LazyMessage('{}: {}', ExceptionClass.__name__, failure_message)
+        _SETUP_FAILURE.set(item, str(failure_message) if release else failure_message)
+    elif release:
+        # Fail with the pre-rendered, trimmed traceback of the raised exception instead
+        # of the traceback itself.
+        rendered = render_traceback(traceback) if traceback is not None else ''
+        _set_outcome_exception(outcome, pytest.fail.Exception(
+            '{}{}: {}'.format(rendered, ExceptionClass.__name__, failure_message), pytrace=False
+        ))
     else:  # marker_name == 'raises'
-        # Avoid "while handling exception another exception occurred" scenarios.
-        if issubclass(ExceptionClass, PytestRaisesUsageError):
-            failure_message = '{}: {}'.format(ExceptionClass.__name__, failure_message)
-            pytest.fail(failure_message, pytrace=False)
-        else:
-            try:
-                raise ExceptionClass(failure_message)
-            except(ExceptionClass):
-                # 1. Try and set ``outcome.excinfo``.
-                # 2. Sometimes (unknown when) ``outcome.excinfo`` will trigger an
-                #    AttributeError even when the test raised.  So try and set the
-                #    undocumented ``outcome._excinfo`` attribute instead.
-                # 3. If setting ``outcome._excinfo`` fails, fallback on ``pytest.fail``.
-                excinfo = sys.exc_info()
-                if traceback:
-                    excinfo = excinfo[:2] + (traceback, )
-                try:
-                    outcome.excinfo = excinfo
-                # pylint: disable=bare-except
-                except:
-                    try:
-                        # pylint: disable=protected-access
-                        outcome._excinfo = excinfo
-                    # pylint: disable=bare-except
-                    except:  # pragma: no cover (no tests hit this, kept for safety).
-                        pytest.fail(failure_message, pytrace=False)
-
-
-def _pytest_raises_validation(item, outcome, marker_name):
+        # The exception is built directly rather than raised and caught, it gets the
+        # traceback of the exception raised by the test (if any).
+        exception = ExceptionClass(failure_message)
+        if traceback is None:
+            # Nothing was raised: point at this (hidden) frame, as a `raise` here would.
+            traceback = _traceback_here()
+        _set_outcome_exception(outcome, exception.with_traceback(traceback))
+
+
+def _pytest_raises_validation(item, outcome, marker_name, raised_message, profiler=None):
     """
     Validate that the test ``item`` and corresponding ``outcome`` raised an exception
     of the correct class, and if supplied the exception message was as expected.  A
@@ -118,8 +277,14 @@ def _pytest_raises_validation(item, outcome, marker_name):
     3. The test was marked with either ``@pytest.mark.setup_raises`` or
        ``@pytest.mark.raises``, but no exception was raised.
 
+    The markers themselves are not inspected here: they are compiled once during
+    collection (see :func:`_compile_raises_marker`) and this method reads the stored
+    spec.  Misused markers never reach this method, they are failed by
+    :func:`_pytest_raises_fail_early` before the test body runs.
+
     In order to support hook wrappers for both ``pytest_runtest_setup`` and
-    ``pytest_runtest_call``, a "handshake" must be performed using a "secret" marker.
+    ``pytest_runtest_call``, a "handshake" must be performed using a per item slot
+    (``item.stash`` on pytest 7+).
     This handshake is only possible because this extension implements a hook wrapper
     for both ``pytest_runtest_setup`` and ``pytest_runtest_call``.  To better explain
     the handshake, we first examine the ``pytest_runtest_call`` hook wrapper.
@@ -130,8 +295,8 @@ def _pytest_raises_validation(item, outcome, marker_name):
         2. This method is called.  If any of the three cases above that indicate failure
            happen, the test is failed.
         3. The test is failed by calling :func:`_pytest_fail_by_mark_or_set_excinfo`,
-           which in this case will set ``outcome.excinfo``.
-        4. By setting ``outcome.excinfo``, ``pytest`` will take over at a later stage
+           which in this case will fail ``outcome`` with the exception.
+        4. By failing ``outcome``, ``pytest`` will take over at a later stage
            and report the test as failed with our message.
 
     ``@pytest.mark.setup_raises(...)`` execution:
@@ -140,12 +305,12 @@ def _pytest_raises_validation(item, outcome, marker_name):
         2. This method is called, If any of the three cases above that indicate failure
            happen, the test is *marked* for failure.
         3. The test is failed by calling :func:`_pytest_fail_by_mark_or_set_excinfo`,
-           which adds a "secret" marker that includes the failure message.
+           which stores the failure message in the item's slot.
         4. Officially, the entire ``pytest_runtest_setup`` phase is completed without
            any formal failure by this extension.
-        5. The ``pytest_runtest_call`` is triggered by ``pytest``, and this method is
-           called again.
-        6. The "secret" marker is detected, and an explicit invocation of
+        5. The ``pytest_runtest_call`` is triggered by ``pytest``, and
+           :func:`_pytest_raises_fail_early` is called before the test body runs.
+        6. The failure message is found in the slot, and an explicit invocation of
            ``pytest.fail`` is issued, ultimately failing the test.
 
     This process is unfortunately a little contrived.  However, it is done this way
@@ -161,13 +326,18 @@ def _pytest_raises_validation(item, outcome, marker_name):
 
     .. note::
 
-        The use of this handshake has an important implication!  Since the "secret"
-        marker must be checked for first in order to fail out early, this means that
+        The use of this handshake has an important implication!  Since the slot
+        must be checked for first in order to fail out early, this means that
         marking a test case with **both** ``@pytest.mark.setup_raises`` and
         ``@pytest.mark.raises`` **cannot** be supported.  In practice, this should not
         be done (it does not make sense, if your setup fails you cannot run the test
         reliably).
 
+    With the ``raises_release_frames`` ini option, the frames of the raised exception are
+    released once it has been validated (see :func:`~pytest_raises.frames.release_frames`)
+    so that the locals of passing tests do not outlive them.  Failures are then rendered
+    right away, with a trimmed traceback, by :func:`_pytest_fail_by_mark_or_set_excinfo`.
+
     **Parameters**
 
     ``item``
@@ -184,124 +354,629 @@ def _pytest_raises_validation(item, outcome, marker_name):
 
         - ``'setup_raises'``: call originates from ``pytest_runtest_setup`` hook wrapper.
         - ``'raises'``: call originates from ``pytest_runtest_call`` hook wrapper.
+
+    ``raised_message``
+        The :class:`~pytest_raises.messages._RaisedMessage` of the exception in ``outcome``,
+        shared with the reporting of the validation.
+
+    ``profiler``
+        The :class:`~pytest_raises.profiling.ValidationProfiler` to report the time of
+        each validation step to, ``None`` unless ``--raises-profile`` was given.
     """
     # pylint: disable=unused-variable
     __tracebackhide__ = True
-    # Pytest 3.5+ has a new function for getting a maker from a node
-    # In order to maintain compatability, prefer the newer function
-    # (get_closest_marker) but use the old function (get_marker) if it
-    # doesn't exist.
-    marker_get_func = item.get_closest_marker if hasattr(item, 'get_closest_marker') else item.get_marker
-
-    # Short-circuit: if the "secret" marker is found, then this test failed during setup
-    # and it is now safe to ``pytest.fail`` without causing an ERROR.
-    secret_marker = marker_get_func('setup_raises_expected_exc_or_message_not_found')
-    if secret_marker:
-        # NOTE: pytrace=False because the existing call stack is unrelated to the
-        # original failure processed during `pytest_runtest_setup` hook wrapper.
-        pytest.fail(secret_marker.args[0], pytrace=False)
+    spec = _get_item_spec(item, marker_name)
+    _lap(profiler, 'lookup')
+    if spec:
+        # Misused markers are reported by :func:`_pytest_raises_fail_early` before the
+        # test body runs.  Swallow any setup failure so that the call phase gets to do so.
+        if spec.usage_error:
+            outcome.force_result(None)
+            return
 
-    raises_marker = marker_get_func(marker_name)
-    if raises_marker:
-        exception = raises_marker.kwargs.get('exception', Exception)
-        try:
-            if not issubclass(exception, BaseException):
-                failure_message = '@pytest.mark.{0}: supplied `exception={1}` is not a subclass of `BaseException`.'.format(
-                    marker_name, exception
-                )
-                _pytest_fail_by_mark_or_set_excinfo(
-                    item, outcome, marker_name, PytestRaisesUsageError, failure_message, None
-                )
-                return
-        except TypeError:
-            failure_message = '@pytest.mark.{}: supplied `exception` argument must be a Class, e.g., `exception=RuntimeError`.'.format(
-                marker_name
-            )
+        raised_exception = raised_message.exception
+        traceback = outcome.excinfo[2] if outcome.excinfo else None
+
+        # This plugin needs to work around the other hooks, see:
+        # https://docs.pytest.org/en/latest/writing_plugins.html#hookwrapper-executing-around-other-hooks
+        outcome.force_result(None)
+
+        features = _FEATURES.get(item.config)
+        if marker_name == 'setup_raises':
+            # The test body is skipped by `SetupRaised`, only registered once a setup raised.
+            if raised_exception is not None:
+                features.require('raises_setup_raised')
+            features.get('raises_setup_raised').record(item, raised_exception is not None)
+        setup_verdicts = features.require('raises_setup_verdicts') if spec.scope != 'function' else None
+        previous_failure = _FAILURE.get(item)
+        if setup_verdicts is not None and _reuse_setup_verdict(item, spec, marker_name, setup_verdicts, raised_exception):
+            return
+
+        _profile_message(profiler, spec, raised_message)
+        repeat_matched = _REPEAT_MATCHED.get(item) if spec.repeat > 1 else None
+        if repeat_matched is not None:
+            _REPEAT_MATCHED.set(item, None)
+        if isinstance(raised_exception, RepeatFailure):
+            # An attempt of a `repeat=N` test did not raise as expected, see `RepeatRunner`.
+            failure_class, failure_message = raised_exception.failure_class, raised_exception.failure_message
+        elif raised_exception is not None and raised_exception is repeat_matched:
+            # The last attempt, re-raised by `RepeatRunner`, was already checked.
+            failure_class, failure_message = ExpectedException, None
+        else:
+            failure_class, failure_message = _expectation_failure(item, spec, marker_name, raised_exception, raised_message)
+        _lap(profiler, 'match')
+        if failure_message is not None:
             _pytest_fail_by_mark_or_set_excinfo(
-                item, outcome, marker_name, PytestRaisesUsageError, failure_message, None
+                item, outcome, marker_name, failure_class, failure_message, traceback
             )
-            return
+        _lap(profiler, 'failure')
+        if setup_verdicts is not None:
+            _store_setup_verdict(item, spec, setup_verdicts, raised_exception, previous_failure)
+        if raised_exception is not None and _RELEASE_FRAMES.get(item.config, False):
+            release_frames(raised_exception)
 
-        message = raises_marker.kwargs.get('message', None)
-        match_pattern = raises_marker.kwargs.get('match', None)
-        match_flags = raises_marker.kwargs.get('match_flags', 0)  # 0 means no flags for `re.match`
 
-        # Only `message` or `match` should be supplied at a time, not both.
-        if message and match_pattern:
-            failure_message = '@pytest.mark.{}: only `message="{}"` *OR* `match="{}"` allowed, not both.'.format(
-                marker_name, message, match_pattern
-            )
-            _pytest_fail_by_mark_or_set_excinfo(
-                item, outcome, marker_name, PytestRaisesUsageError, failure_message, None
+def _reuse_setup_verdict(item, spec, marker_name, setup_verdicts, raised_exception):
+    """
+    Apply the verdict another item of the ``scope`` of ``spec`` reached for the very same
+    ``raised_exception``, returning whether there was one, see
+    :class:`~pytest_raises.scopes.SetupVerdicts`.
+
+    .. warning::
+
+        **This is a "private" function not intended to be called directly by external projects!**
+    """
+    verdict = setup_verdicts.get(item, spec, raised_exception)
+    if verdict is None:
+        return False
+    _FAILURE.set(item, verdict[0] or _FAILURE.get(item))
+    _SETUP_FAILURE.set(item, verdict[1])
+    _MATCHED_DETAIL.set(item, verdict[2])
+    if verdict[3] is not None:
+        _capture(item, marker_name, raised_exception, verdict[3])
+    return True
+
+
+def _store_setup_verdict(item, spec, setup_verdicts, raised_exception, previous_failure):
+    """
+    Store the verdict of the validation of ``raised_exception`` for the next items of the
+    ``scope`` of ``spec``, see :func:`_reuse_setup_verdict`.
+
+    .. warning::
+
+        **This is a "private" function not intended to be called directly by external projects!**
+    """
+    failure = _FAILURE.get(item)
+    captured = _CAPTURED.get(item)
+    setup_verdicts.set(item, spec, raised_exception, (
+        failure if failure is not previous_failure else None, _SETUP_FAILURE.get(item), _MATCHED_DETAIL.get(item),
+        captured.matched if captured else None
+    ))
+
+
+def _expectation_failure(item, spec, marker_name, raised_exception, raised_message):
+    """
+    Check ``raised_exception`` (``None`` if nothing was raised), whose message is
+    ``raised_message``, against ``spec``, returning ``(failure_class, failure_message)``
+    where ``failure_message`` is ``None`` when it was raised as expected.  The cases of
+    :func:`_pytest_raises_validation` are told apart here.
+
+    .. warning::
+
+        **This is a "private" function not intended to be called directly by external projects!**
+    """
+    # Recorded afresh by every check, e.g., of each attempt of a `repeat=N` test.
+    _MATCHED_DETAIL.set(item, None)
+    if raised_exception is not None and (spec.group or spec.chained):
+        # With `group=True` / `chained=True`, cases 1 and 2 apply to the leaves of the
+        # raised group / the links of the raised exception's chain.
+        return _nested_failure(item, spec, marker_name, raised_exception, raised_message)
+    # Case 1: test raised exception is correct class (or derived type), check
+    # message if provided by user.
+    if raised_exception is not None and _is_expected_type(type(raised_exception), spec):
+        failure_class, failure_message = _message_failure(item, spec, marker_name, raised_message)
+        if failure_message is None:
+            _capture(item, marker_name, raised_exception, raised_exception)
+        return failure_class, failure_message
+    # Case 2: test raised exception, but it was of an unexpected type.
+    if raised_exception is not None:
+        return ExpectedException, _LazyMessage(
+            'Expected exception of type {}{}, but got exception of type {} with message: {}',
+            _describe_exception_classes(spec.exception),
+            ' excluding {}'.format(_describe_exception_classes(spec.exclude)) if spec.exclude else '',
+            type(raised_exception), raised_message
+        )
+    # Case 3: test did _not_ raise exception, but was expected to.
+    return ExpectedException, _LazyMessage(
+        'Expected exception {}, but it did not raise', _describe_exception_classes(spec.exception)
+    )
+
+
+def _attempt_failure(item, spec, raised_exception):
+    """
+    Check an attempt of a ``raises(repeat=N)`` test, see
+    :class:`~pytest_raises.repeat.RepeatRunner`.
+
+    .. warning::
+
+        **This is a "private" function not intended to be called directly by external projects!**
+    """
+    raised_message = _RaisedMessage(raised_exception, _MAX_MESSAGE_LENGTH.get(item.config, 0))
+    failure_class, failure_message = _expectation_failure(item, spec, 'raises', raised_exception, raised_message)
+    _REPEAT_MATCHED.set(item, raised_exception if failure_message is None else None)
+    return failure_class, failure_message
+
+
+_MISSING = object()
+
+
+def _attributes_failure(spec, raised_exception):
+    """
+    Compare the attributes of ``raised_exception`` to the ``attrs`` / ``args`` of ``spec``,
+    returning the failure message of the first one that differs, ``None`` if none does.
+
+    .. warning::
+
+        **This is a "private" function not intended to be called directly by external projects!**
+    """
+    if spec.args is not None and raised_exception.args != spec.args:
+        return _LazyMessage('Expected `args={!r}`, but got `args={!r}`', spec.args, raised_exception.args)
+    for name, expected in spec.attrs:
+        value = getattr(raised_exception, name, _MISSING)
+        if value is _MISSING:
+            return _LazyMessage('Expected `{}={!r}`, but the exception has no `{}` attribute', name, expected, name)
+        if value != expected:
+            return _LazyMessage('Expected `{}={!r}`, but got `{}={!r}`', name, expected, name, value)
+    return None
+
+
+def _message_failure(item, spec, marker_name, raised_message):
+    """
+    Check ``raised_message`` against the ``attrs`` / ``args`` and then ``message`` /
+    ``match`` / ``match_any`` of ``spec``, returning ``(failure_class, failure_message)`` where ``failure_message`` is
+    ``None`` when it matches.  The pattern of ``match_any`` that matched is recorded for
+    the report of ``item``.
+
+    .. warning::
+
+        **This is a "private" function not intended to be called directly by external projects!**
+    """
+    if spec.attrs or spec.args is not None:
+        # Compared first, without computing the message of the exception.
+        attributes_failure = _attributes_failure(spec, raised_message.exception)
+        if attributes_failure is not None:
+            return ExpectedAttributes, attributes_failure
+    match_regex = spec.match_regex
+    if spec.message is not None:
+        if not raised_message.contains(spec.message):
+            return ExpectedMessage, _MismatchMessage(raised_message, message=spec.message)
+    elif match_regex is not None:
+        mode = ' (match_mode="{}")'.format(spec.match_mode) if spec.match_mode != 'match' else ''
+        try:
+            if not spec.match_any:
+                matched = raised_message.matches(match_regex)
+                return ExpectedMessage, None if matched else _MismatchMessage(raised_message, regex=match_regex, suffix=mode)
+            index = raised_message.match_index(match_regex)
+            if index is None:
+                return ExpectedMessage, _MismatchMessage(raised_message, patterns=spec.match_pattern, suffix=mode)
+            pattern = spec.match_pattern[index]
+            _MATCHED_DETAIL.set(item, 'matched match_any pattern {}: {!r}'.format(index, getattr(pattern, 'pattern', pattern)))
+        except MatchBudgetExceeded:
+            return PytestRaisesUsageError, _LazyMessage(
+                '@pytest.mark.{}: `{}` exceeded its time budget of {}s against a message of {} '
+                'characters, the pattern probably backtracks catastrophically (consider '
+                '`match_engine="linear"`).',
+                marker_name,
+                'match_any={!r}'.format(list(spec.match_pattern)) if spec.match_any else 'match="{}"'.format(match_regex.pattern),
+                match_regex.timeout, raised_message.end
             )
-            return
+    return ExpectedMessage, None
 
-        raised_exception = outcome.excinfo[1] if outcome.excinfo else None
-        traceback = outcome.excinfo[2] if outcome.excinfo else None
 
-        # This plugin needs to work around the other hooks, see:
-        # https://docs.pytest.org/en/latest/writing_plugins.html#hookwrapper-executing-around-other-hooks
-        outcome.force_result(None)
+def _nested_failure(item, spec, marker_name, raised_exception, raised_message):
+    """
+    Check that ``raised_exception`` holds an exception expected by ``spec``, returning
+    ``(failure_class, failure_message)`` as :func:`_message_failure` does:
+
+    - ``group=True``: ``raised_exception`` must be an exception group, flattened once into
+      a :class:`~pytest_raises.groups.GroupIndex` whose leaves are checked.
+    - ``chained=True``: the links of the :class:`~pytest_raises.chains.ExceptionChain` of
+      ``raised_exception`` are checked.
+
+    Candidates are selected by type (see :func:`_is_expected_type`) before any message is
+    computed.  The candidate that matched is recorded for the report of ``item``.
 
-        # Case 1: test raised exception is correct class (or derived type), check
-        # message if provided by user.
-        if isinstance(raised_exception, exception):
-            raised_message = str(raised_exception)
-            failure_message = None
-            if message is not None:
-                if message not in raised_message:
-                    failure_message = '"{}" not in "{}"'.format(message, raised_message)
-            elif match_pattern is not None:
-                if not re.match(match_pattern, raised_message, match_flags):
-                    failure_message = '"{}" does not match raised message "{}"'.format(match_pattern, raised_message)
-            if failure_message:
-                _pytest_fail_by_mark_or_set_excinfo(
-                    item, outcome, marker_name, ExpectedMessage, failure_message, traceback
-                )
-        # Case 2: test raised exception, but it was of an unexpected type.
-        elif raised_exception:
-            failure_message = 'Expected exception of type {}, but got exception of type {} with message: {}'.format(
-                exception, type(raised_exception), str(raised_exception)
+    .. warning::
+
+        **This is a "private" function not intended to be called directly by external projects!**
+    """
+    expected = _describe_exception_classes(spec.exception)
+    excluding = ' excluding {}'.format(_describe_exception_classes(spec.exclude)) if spec.exclude else ''
+    if spec.chained:
+        nested, words = ExceptionChain(raised_exception), ('exception chain', 'links', 'link')
+        candidates = nested.links_of_type(lambda link_type: _is_expected_type(link_type, spec))
+        if not candidates:
+            return ExpectedException, _LazyMessage(
+                'Expected exception of type {}{} in the exception chain, but got the chain: {}',
+                expected, excluding, nested.type_summary()
             )
-            _pytest_fail_by_mark_or_set_excinfo(
-                item, outcome, marker_name, ExpectedException, failure_message, traceback
+    elif not isinstance(raised_exception, _BaseExceptionGroup):
+        return ExpectedException, _LazyMessage(
+            'Expected an exception group with a leaf of type {}{}, but got exception of type {} with message: {}',
+            expected, excluding, type(raised_exception), raised_message
+        )
+    else:
+        nested, words = GroupIndex(raised_exception), ('exception group', 'leaves', 'leaf')
+        candidates = nested.leaves_of_type(lambda leaf_type: _is_expected_type(leaf_type, spec))
+        if not candidates:
+            return ExpectedException, _LazyMessage(
+                'Expected an exception group with a leaf of type {}{}, but none of its {} leaves is: {}',
+                expected, excluding, len(nested.leaves), nested.type_summary()
             )
-        # Case 3: test did _not_ raise exception, but was expected to.
+    return _candidates_failure(item, spec, marker_name, raised_message, candidates=candidates, words=words)
+
+
+def _candidates_failure(item, spec, marker_name, raised_message, *, candidates, words):
+    """
+    Check the ``(path, exception)`` ``candidates`` selected by :func:`_nested_failure` in
+    turn, until one of them satisfies the message expectations of ``spec``.  ``words`` is
+    the ``(kind, parts, part)`` describing them, e.g., ``('exception group', 'leaves',
+    'leaf')``.
+
+    .. warning::
+
+        **This is a "private" function not intended to be called directly by external projects!**
+    """
+    kind, parts, part = words
+    first_failure = None
+    for path, candidate in candidates:
+        path = path or '(raised exception)'
+        if candidate is raised_message.exception:
+            candidate_message = raised_message
         else:
-            failure_message = 'Expected exception {}, but it did not raise'.format(exception)
-            _pytest_fail_by_mark_or_set_excinfo(
-                item, outcome, marker_name, ExpectedException, failure_message, traceback
+            candidate_message = _RaisedMessage(candidate, raised_message.max_length)
+        failure_class, failure_message = _message_failure(item, spec, marker_name, candidate_message)
+        if failure_message is None:
+            # Followed by the `match_any` pattern that matched, if any.
+            _MATCHED_DETAIL.set(item, ', '.join(filter(None, [
+                'matched {} {} {}: {!r}'.format(kind, part, path, candidate), _MATCHED_DETAIL.get(item)
+            ])))
+            _capture(item, marker_name, raised_message.exception, candidate)
+            return failure_class, None
+        if failure_class is PytestRaisesUsageError:
+            return failure_class, failure_message
+        first_failure = first_failure or (path, failure_message)
+    return ExpectedMessage, _LazyMessage(
+        'None of the {} {} of type {}{} in the {} matches, e.g., {}: {}',
+        len(candidates), parts, _describe_exception_classes(spec.exception),
+        ' excluding {}'.format(_describe_exception_classes(spec.exclude)) if spec.exclude else '',
+        kind, first_failure[0], first_failure[1]
+    )
+
+
+def _capture(item, marker_name, exception, matched):
+    """
+    Record in the :class:`CapturedException` of ``item`` that ``exception`` was raised as
+    expected by ``marker_name``, ``matched`` being the exception that satisfied it.
+
+    .. warning::
+
+        **This is a "private" function not intended to be called directly by external projects!**
+    """
+    captured = _CAPTURED.get(item)
+    if captured is None:
+        captured = CapturedException()
+        _CAPTURED.set(item, captured)
+    captured.capture('setup' if marker_name == 'setup_raises' else 'call', exception, matched)
+
+
+def get_raised_exception(item):
+    """
+    Return the :class:`~pytest_raises.captured.CapturedException` of the exception the test
+    ``item`` raised as expected by its ``setup_raises`` / ``raises`` marker, or ``None`` if
+    it did not (yet).  Meant for teardown fixtures (see the ``raised_exception`` fixture)
+    and for the hooks of other plugins, e.g., ``pytest_runtest_makereport``: the exception
+    is released once ``item`` is torn down.
+    """
+    captured = _CAPTURED.get(item)
+    return captured if captured else None
+
+
+@pytest.fixture(name='raised_exception')
+def _raised_exception_fixture(request):
+    """
+    The ``raised_exception`` fixture: the :class:`~pytest_raises.captured.CapturedException`
+    of the test, filled in once the test raised as expected: read it in the teardown of a
+    fixture, after its ``yield``.
+    """
+    captured = _CAPTURED.get(request.node)
+    if captured is None:
+        captured = CapturedException()
+        _CAPTURED.set(request.node, captured)
+    return captured
+
+
+def _profiled_validation(item, outcome, marker_name):
+    """
+    Run :func:`_pytest_raises_validation`, timing it if ``--raises-profile`` was given and
+    recording its outcome if ``--raises-report`` was given, when ``item`` carries the
+    marker of the phase.
+
+    .. warning::
+
+        **This is a "private" function not intended to be called directly by external projects!**
+    """
+    # pylint: disable=unused-variable
+    __tracebackhide__ = True
+    profiler = _PROFILER.get(item.config)
+    reporter = _REPORTER.get(item.config)
+    # Only the phases of the markers an item carries are validations worth reporting.
+    spec = _get_item_spec(item, marker_name) if profiler is not None or reporter is not None else None
+    # The validation consumes the outcome, and records any failure in ``_FAILURE``.
+    raised_exception = outcome.excinfo[1] if outcome.excinfo else None
+    raised_message = _RaisedMessage(raised_exception, _MAX_MESSAGE_LENGTH.get(item.config, 0))
+    if spec is None:
+        _pytest_raises_validation(item, outcome, marker_name, raised_message)
+        return
+    phase = 'setup' if marker_name == 'setup_raises' else 'call'
+    previous_failure = _FAILURE.get(item)
+    start = time.perf_counter()
+    if profiler is not None:
+        profiler.start()
+    try:
+        _pytest_raises_validation(item, outcome, marker_name, raised_message, profiler)
+    finally:
+        if profiler is not None:
+            profiler.stop(item.nodeid, phase)
+        if reporter is not None:
+            duration = time.perf_counter() - start
+            failure = _FAILURE.get(item)
+            reporter.record(
+                item, phase, spec, raised_exception,
+                message=raised_message.truncated(MESSAGE_LENGTH) if raised_message.computed else None,
+                failure=failure if failure is not previous_failure else None, duration=duration
             )
 
 
+def _pytest_raises_fail_early(item):
+    """
+    Fail ``item`` with a :class:`PytestRaisesUsageError` if either of its markers was
+    misused, or with the message stored by a failed ``setup_raises`` validation.  Called
+    from the ``pytest_runtest_call`` hook wrapper *before* the test body runs, so that
+    neither a typo in a marker nor an incomplete setup costs an execution of the test.
+
+    .. warning::
+
+        **This is a "private" function not intended to be called directly by external projects!**
+    """
+    # pylint: disable=unused-variable
+    __tracebackhide__ = True
+    for marker_name in _MARKER_NAMES:
+        spec = _get_item_spec(item, marker_name)
+        if spec and spec.usage_error:
+            _FAILURE.set(item, (marker_name, PytestRaisesUsageError, spec.usage_error))
+            failure_message = '{}: {}'.format(PytestRaisesUsageError.__name__, spec.usage_error)
+            pytest.fail(failure_message, pytrace=False)
+
+    # This test failed during setup and it is now safe to ``pytest.fail`` without causing
+    # an ERROR.
+    setup_failure = _SETUP_FAILURE.get(item)
+    if setup_failure is not None:
+        # Consume the message, a re-run of the item (e.g., by pytest-rerunfailures) starts clean.
+        _SETUP_FAILURE.set(item, None)
+        # NOTE: pytrace=False because the existing call stack is unrelated to the
+        # original failure processed during `pytest_runtest_setup` hook wrapper.
+        pytest.fail(str(setup_failure), pytrace=False)
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(config, items):
+    """
+    Compile the ``setup_raises`` / ``raises`` markers of every collected item once, so
+    that the run time hook wrappers only need to read the stored specs, and index the
+    node IDs of the marked items (see :func:`_is_raises_marked`), registering the plugins
+    of the features they use (see :class:`~pytest_raises.features.FeaturePlugins`).  Runs last so that
+    markers added by other plugins' ``pytest_collection_modifyitems`` are seen.
+    """
+    marked_nodeids = set()
+    features = _FEATURES.get(config)
+    for item in items:
+        specs = _compile_item_specs(item)
+        if specs is not _UNMARKED_SPECS:
+            marked_nodeids.add(item.nodeid)
+            features.require_for(item, specs)
+        features.require_for_warns(item)
+    _MARKED_NODEIDS.set(config, marked_nodeids)
+
+
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_setup(item):
     # pylint: disable=unused-variable
     __tracebackhide__ = True
     outcome = yield
-    _pytest_raises_validation(item, outcome, 'setup_raises')
+    # Checked once the fixtures, which may add a marker to the item, are set up.
+    if _is_raises_marked(item):
+        _profiled_validation(item, outcome, 'setup_raises')
 
 
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_call(item):
     # pylint: disable=unused-variable
     __tracebackhide__ = True
+    if not _is_raises_marked(item):
+        yield
+        return
+    _pytest_raises_fail_early(item)
+    outcome = yield
+    _profiled_validation(item, outcome, 'raises')
+
+
+def pytest_addoption(parser):
+    parser.addini(
+        'raises_match_engine',
+        'default engine of `match` arguments: `re`, or `linear` for a linear time engine supporting a '
+        'safe subset of the `re` syntax (default: re).',
+        default='re'
+    )
+    parser.addini(
+        'raises_match_timeout',
+        'default time budget in seconds of `match` arguments using the `re` engine, 0 for no budget '
+        '(default: 0).',
+        default='0'
+    )
+    group = parser.getgroup('raises')
+    group.addoption(
+        '--raises-profile', action='store_true', default=False,
+        help='time the validation of tests marked with raises / setup_raises, and list the slowest '
+             'validations and exception __str__ implementations in the terminal summary.'
+    )
+    group.addoption(
+        '--raises-report', metavar='PATH', default=None,
+        help='write a JSON-lines record of every validation of raises / setup_raises to PATH, and add '
+             'the same data to the JUnit XML properties of the tests.'
+    )
+    group.addoption(
+        '--raises-incremental', action='store_true', default=False,
+        help='deselect the tests marked with raises / setup_raises that passed on a previous run, when '
+             'neither their source, their marker nor the source of the project modules they import changed.'
+    )
+    group.addoption(
+        '--raises-profile-json', metavar='PATH', default=None,
+        help='write the --raises-profile data as JSON to PATH (implies --raises-profile).'
+    )
+    parser.addini(
+        'raises_asyncio_loop_scope',
+        'scope of the event loops running the coroutine tests marked with raises: `session` or `module` '
+        '(default: session).',
+        default='session'
+    )
+    parser.addini(
+        'raises_release_frames',
+        'release the traceback frames of the exceptions validated by raises / setup_raises, rendering '
+        'a trimmed traceback for failures (default: false).',
+        type='bool',
+        default=False
+    )
+    parser.addini(
+        'raises_max_message_length',
+        'maximum number of characters of a raised exception message used for `message` / '
+        '`match` checks and failure reports, 0 for no limit (default: 0).',
+        default='0'
+    )
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """
+    Attach the failure of a marked item to its call phase report as ``raises_failure``
+    (see :func:`~pytest_raises.reporting._failure_payload`).  Reports of passing or unmarked items get no such
+    attribute.  The exception group leaf, or exception chain link, matched by a
+    ``group=True`` or ``chained=True`` marker is added as a ``pytest-raises`` report
+    section, shown with ``-rP``.
+    """
+    # Wraps every phase of every item: the index, which `_is_raises_marked` extends with
+    # the items marked at run time, is checked before anything else.
+    marked_nodeids = _MARKED_NODEIDS.get(item.config)
+    if call.when == 'setup' or not (item.nodeid in marked_nodeids if marked_nodeids is not None else _is_raises_marked(item)):
+        yield
+        return
     outcome = yield
-    _pytest_raises_validation(item, outcome, 'raises')
+    if call.when == 'teardown':
+        captured = _CAPTURED.get(item)
+        if captured is not None:
+            captured.clear()
+            _CAPTURED.set(item, None)
+        return
+    failure = _FAILURE.get(item)
+    if failure is not None:
+        _FAILURE.set(item, None)
+        outcome.get_result().raises_failure = _failure_payload(failure)
+    matched_detail = _MATCHED_DETAIL.get(item)
+    if matched_detail is not None:
+        _MATCHED_DETAIL.set(item, None)
+        outcome.get_result().sections.append(('pytest-raises', matched_detail))
+
+
+def _getini_non_negative(config, name, convert, description):
+    """Return the ini option ``name`` converted by ``convert``, which must be non-negative."""
+    try:
+        value = convert(config.getini(name))
+        if value < 0:
+            raise ValueError
+    except ValueError:
+        raise pytest.UsageError('{}: expected a non-negative {}, got {!r}.'.format(
+            name, description, config.getini(name)
+        )) from None
+    return value
 
 
 # NOTE: this gets evaluated by consuming packages only.
 def pytest_configure(config):  # pragma: no cover
     """
-    Register the markers with pytest.
+    Register the markers with pytest, and read the ini options of this plugin.
 
     See: https://docs.pytest.org/en/latest/writing_plugins.html#registering-markers
     """
-    config.addinivalue_line(
-        'markers',
-        'setup_raises: expect pytest_runtest_setup phase to raise.'
-    )
-    config.addinivalue_line(
-        'markers',
-        'raises: expect pytest_runtest_call phase to raise.'
-    )
+    _MAX_MESSAGE_LENGTH.set(config, _getini_non_negative(config, 'raises_max_message_length', int, 'integer'))
+    _RELEASE_FRAMES.set(config, config.getini('raises_release_frames'))
+    match_engine = config.getini('raises_match_engine')
+    if match_engine not in ENGINES:
+        raise pytest.UsageError('raises_match_engine: expected one of {}, got {!r}.'.format(
+            ', '.join(ENGINES), match_engine
+        ))
+    _MATCH_DEFAULTS.set(config, (match_engine, _getini_non_negative(config, 'raises_match_timeout', float, 'number')))
+
+    loop_scope = config.getini('raises_asyncio_loop_scope')
+    if loop_scope not in LOOP_SCOPES:
+        raise pytest.UsageError('raises_asyncio_loop_scope: expected one of {}, got {!r}.'.format(
+            ', '.join(LOOP_SCOPES), loop_scope
+        ))
+    features = FeaturePlugins(config.pluginmanager, {
+        'raises_repeat': lambda: RepeatRunner(
+            lambda item: _get_item_spec(item, 'raises'), _attempt_failure,
+            features.get('raises_asyncio_runner').run if features.has('raises_asyncio_runner') else None
+        ),
+        # Registered after the raises hook wrappers, so that it sees the call phase outcome they validated.
+        'raises_warns': lambda: WarnsChecker(ExpectedWarning, PytestRaisesUsageError),
+        'raises_setup_raised': SetupRaised,
+        'raises_setup_verdicts': SetupVerdicts,
+    })
+    # Coroutine tests are left to pytest-asyncio when it is active.
+    if not config.pluginmanager.hasplugin('asyncio'):
+        features.add('raises_asyncio_runner', lambda: AsyncioRunner(loop_scope))
+    _FEATURES.set(config, features)
+
+    if config.getoption('raises_incremental'):
+        if getattr(config, 'cache', None) is None:
+            raise pytest.UsageError('--raises-incremental requires the cacheprovider plugin.')
+        config.pluginmanager.register(IncrementalRecorder(config, _spec_fingerprint), 'raises_incremental')
+
+    report_path = config.getoption('raises_report')
+    if report_path:
+        # Under pytest-xdist, the controller starts the report and the workers append to it.
+        reporter = OutcomeReport(report_path, truncate=not hasattr(config, 'workerinput'))
+        _REPORTER.set(config, reporter)
+        config.pluginmanager.register(reporter, 'raises_reporter')
+
+    profile_json = config.getoption('raises_profile_json')
+    if config.getoption('raises_profile') or profile_json:
+        profiler = ValidationProfiler(json_path=profile_json, worker=hasattr(config, 'workerinput'))
+        _PROFILER.set(config, profiler)
+        config.pluginmanager.register(profiler, 'raises_profiler')
+
+    for marker_line in (
+        'setup_raises: expect pytest_runtest_setup phase to raise.',
+        'raises: expect pytest_runtest_call phase to raise.',
+        'raises_table(table): expect pytest_runtest_call phase to raise, per parameter ID of the test: '
+        'table is a mapping {param_id: expectation} or a callable expectation = table(param_id).',
+        'setup_warns(category=Warning, match=None): expect pytest_runtest_setup phase to emit a warning.',
+        'warns(category=Warning, match=None): expect pytest_runtest_call phase to emit a warning.',
+    ):
+        config.addinivalue_line('markers', marker_line)
+
+
+def pytest_unconfigure():  # pragma: no cover
+    """Release the compiled marker specs of the session."""
+    _SPEC_CACHE.clear()
+    _TYPE_VERDICTS.clear()
+    REGEX_CACHE.clear()
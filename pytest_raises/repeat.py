@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+``raises(repeat=N)``: the test function is run ``N`` times within a single call phase,
+every attempt being expected to raise.
+"""
+import inspect
+import time
+
+import pytest
+
+
+class RepeatFailure(Exception):
+    """
+    Raised out of the call phase of a repeated test when an attempt did not raise as
+    expected, carrying the ``failure_class`` and ``failure_message`` to fail the test with.
+    """
+
+    def __init__(self, failure_class, failure_message):
+        super().__init__(failure_message)
+        self.failure_class = failure_class
+        self.failure_message = failure_message
+
+
+class RepeatRunner:
+    """
+    ``pytest`` plugin running the test functions of the items whose ``raises`` spec has a
+    ``repeat`` above 1 that many times, each attempt being checked by
+    ``check(item, spec, raised_exception)``, which returns ``(failure_class,
+    failure_message)``, the message being ``None`` when the attempt raised as expected.
+
+    Every attempt is run, and timed, even after a failure.  The call phase then raises the
+    exception of the last attempt if all of them raised as expected, otherwise a
+    :class:`RepeatFailure` describing the first one that did not.  Coroutine test functions
+    are run through ``run_coroutine(item, testargs)`` when given, they are otherwise left
+    to the plugin running them (e.g., ``pytest-asyncio``), which runs them once.
+
+    The call phase report gets a ``raises_repeat`` attribute, ``{'attempts': N, 'raised':
+    number of attempts that raised as expected, 'durations': [seconds of each attempt]}``,
+    and a ``pytest-raises repeat`` section summarizing it.
+
+    The plugin is only registered once such an item is collected, its hooks then returning
+    early for the items that are not repeated.
+    """
+
+    def __init__(self, get_spec, check, run_coroutine=None):
+        self._get_spec = get_spec
+        self._check = check
+        self._run_coroutine = run_coroutine
+        # ``{nodeid: (attempts, raised, durations)}`` of the items run, until reported.
+        self._results = {}
+
+    def _attempt(self, pyfuncitem, testargs):
+        """Run one attempt of ``pyfuncitem``, returning ``(exception or None, seconds)``."""
+        start = time.perf_counter()
+        try:
+            self._call(pyfuncitem, testargs)
+        except KeyboardInterrupt:
+            raise
+        except BaseException as exc:  # pylint: disable=broad-except
+            return exc, time.perf_counter() - start
+        return None, time.perf_counter() - start
+
+    def _call(self, pyfuncitem, testargs):
+        if self._run_coroutine is not None and inspect.iscoroutinefunction(pyfuncitem.obj):
+            self._run_coroutine(pyfuncitem, testargs)
+        else:
+            pyfuncitem.obj(**testargs)
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_pyfunc_call(self, pyfuncitem):
+        # pylint: disable=unused-variable
+        __tracebackhide__ = True
+        spec = self._get_spec(pyfuncitem)
+        if spec is None or spec.repeat <= 1 or spec.usage_error:
+            return None
+        if self._run_coroutine is None and inspect.iscoroutinefunction(pyfuncitem.obj):
+            return None
+        # pylint: disable=protected-access
+        testargs = {arg: pyfuncitem.funcargs[arg] for arg in pyfuncitem._fixtureinfo.argnames}
+        durations, raised, first_failure, last_exception = [], 0, None, None
+        for attempt in range(1, spec.repeat + 1):
+            exception, duration = self._attempt(pyfuncitem, testargs)
+            durations.append(duration)
+            failure_class, failure_message = self._check(pyfuncitem, spec, exception)
+            if failure_message is None:
+                raised += 1
+                last_exception = exception
+            elif first_failure is None:
+                first_failure = (attempt, failure_class, failure_message)
+        self._results[pyfuncitem.nodeid] = (spec.repeat, raised, durations)
+        if first_failure is not None:
+            attempt, failure_class, failure_message = first_failure
+            raise RepeatFailure(failure_class, 'Attempt {} of {}: {} ({} of {} attempts raised as expected)'.format(
+                attempt, spec.repeat, failure_message, raised, spec.repeat
+            ))
+        raise last_exception
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        if call.when != 'call' or item.nodeid not in self._results:
+            yield
+            return
+        outcome = yield
+        attempts, raised, durations = self._results.pop(item.nodeid)
+        report = outcome.get_result()
+        report.raises_repeat = {'attempts': attempts, 'raised': raised, 'durations': durations}
+        ordered = sorted(durations)
+        report.sections.append(('pytest-raises repeat', '{} of {} attempts raised as expected in {:.6f}s '
+                                '(min {:.6f}s, median {:.6f}s, max {:.6f}s)'.format(
+                                    raised, attempts, sum(durations), ordered[0], ordered[len(ordered) // 2], ordered[-1]
+                                )))
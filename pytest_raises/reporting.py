@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+``--raises-report``: a machine readable record of every validation performed by
+pytest-raises, streamed as JSON lines and attached to the tests as JUnit XML properties.
+"""
+import json
+
+from pytest_raises.messages import _truncate
+
+# The maximum number of characters of the raised message kept in a record.
+MESSAGE_LENGTH = 500
+
+
+def _class_name(cls):
+    return '{}.{}'.format(cls.__module__, cls.__qualname__)
+
+
+def _pattern_text(pattern):
+    pattern = getattr(pattern, 'pattern', pattern)
+    return pattern if pattern is None or isinstance(pattern, str) else repr(pattern)
+
+
+def _failure_payload(failure):
+    """
+    Return the ``raises_failure`` report attribute of a ``(marker_name, failure_class,
+    failure_message)`` failure: a dictionary of strings that survives report
+    serialization, e.g., between ``pytest-xdist`` workers and the controller, with the
+    failure message truncated as the records of :class:`OutcomeReport` are.
+
+    .. warning::
+
+        **This is a "private" function not intended to be called directly by external projects!**
+    """
+    marker_name, ExceptionClass, failure_message = failure  # pylint: disable=invalid-name
+    return {
+        'marker': marker_name,
+        'exception': ExceptionClass.__name__,
+        'message': _truncate(str(failure_message), MESSAGE_LENGTH),
+    }
+
+
+class OutcomeReport:
+    """
+    ``pytest`` plugin writing one JSON object per line to ``path`` for every validation
+    of a ``setup_raises`` / ``raises`` expectation, as soon as it is done:
+
+    - ``nodeid`` and ``phase`` (``'setup'`` or ``'call'``) of the validation.
+    - ``expected``: the expectation, i.e., ``exception`` / ``exclude`` class names,
+      ``message``, ``match``, ``match_any``, ``match_mode``, ``group`` and ``chained``.
+    - ``raised``: the class name of the raised exception, ``null`` if none was raised.
+    - ``message``: the message of the raised exception, truncated in the middle to
+      :data:`MESSAGE_LENGTH` characters, ``null`` if the validation did not need it,
+      e.g., for ``attrs`` / ``args`` only expectations.
+    - ``result``: ``'matched'``, or the name of the failure, e.g., ``'ExpectedMessage'``.
+    - ``failure``: the failure message, truncated as ``message`` is, ``null`` for
+      ``'matched'``.
+    - ``duration``: the time spent validating, in seconds.
+
+    Records are written unbuffered rather than accumulated.  The same fields are added
+    to the ``user_properties`` of the test, which the JUnit XML report writes as
+    ``<property name="raises_...">`` elements.
+
+    Under ``pytest-xdist``, the controller truncates ``path`` and the workers append to it.
+    """
+
+    def __init__(self, path, truncate=True):
+        self.path = path
+        # Line buffered: every record reaches the file as soon as it is written.
+        self._output = open(path, 'w' if truncate else 'a', buffering=1, encoding='utf-8')  # pylint: disable=consider-using-with
+        # ``{id(spec): (spec, expected)}``, specs being shared by many tests.
+        self._expected = {}
+
+    def _describe_expected(self, spec):
+        cached = self._expected.get(id(spec))
+        if cached is None or cached[0] is not spec:
+            if spec.match_any:
+                match_pattern = [_pattern_text(pattern) for pattern in spec.match_pattern]
+            else:
+                match_pattern = _pattern_text(spec.match_pattern)
+            cached = self._expected[id(spec)] = (spec, {
+                'exception': [_class_name(cls) for cls in spec.exception or ()],
+                'exclude': [_class_name(cls) for cls in spec.exclude or ()],
+                'message': spec.message,
+                'match': None if spec.match_any else match_pattern,
+                'match_any': match_pattern if spec.match_any else None,
+                'match_mode': spec.match_mode,
+                'attrs': {name: repr(value) for name, value in spec.attrs},
+                'args': None if spec.args is None else repr(spec.args),
+                'group': spec.group,
+                'chained': spec.chained,
+            })
+        return cached[1]
+
+    def record(self, item, phase, spec, raised_exception, *, message, failure, duration):
+        """
+        Write the record of a validation.  ``failure`` is the ``(marker_name, ExceptionClass,
+        failure_message)`` the test failed with, ``None`` if it passed.
+        """
+        if spec.usage_error:
+            result, failure_message = 'PytestRaisesUsageError', spec.usage_error
+        elif failure is not None:
+            result, failure_message = failure[1].__name__, _truncate(str(failure[2]), MESSAGE_LENGTH)
+        else:
+            result, failure_message = 'matched', None
+        record = {
+            'nodeid': item.nodeid,
+            'phase': phase,
+            'expected': self._describe_expected(spec),
+            'raised': _class_name(type(raised_exception)) if raised_exception is not None else None,
+            'message': message,
+            'result': result,
+            'failure': failure_message,
+            'duration': duration,
+        }
+        self._output.write(json.dumps(record, sort_keys=True) + '\n')
+        properties = item.user_properties
+        properties.append(('raises_phase', phase))
+        properties.append(('raises_expected', json.dumps(record['expected'], sort_keys=True)))
+        properties.append(('raises_raised', record['raised'] or ''))
+        properties.append(('raises_message', message or ''))
+        properties.append(('raises_result', result))
+        properties.append(('raises_failure', failure_message or ''))
+        properties.append(('raises_duration', '{:.6f}'.format(duration)))
+
+    def pytest_unconfigure(self):
+        self._output.close()
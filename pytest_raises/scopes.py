@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+The plugins of ``setup_raises``: skipping the body of the tests whose setup raised, and
+sharing the verdicts of ``scope="class"`` / ``scope="module"`` markers between the items
+of the scope.
+"""
+import pytest
+
+# The values of the ``scope`` argument of ``setup_raises``.
+SCOPES = ('function', 'class', 'module')
+
+_SCOPE_NODE_TYPES = {'class': pytest.Class, 'module': pytest.Module}
+
+
+class SetupRaised:
+    """
+    ``pytest`` plugin skipping the body of the ``setup_raises`` tests whose setup raised:
+    their fixtures, e.g., the one that failed, were never set up.
+    """
+
+    def __init__(self):
+        # The node IDs of the items whose setup raised, until their call phase.
+        self._nodeids = set()
+
+    def record(self, item, raised):
+        """Record whether the setup of ``item`` raised."""
+        if raised:
+            self._nodeids.add(item.nodeid)
+        else:
+            self._nodeids.discard(item.nodeid)
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_pyfunc_call(self, pyfuncitem):
+        if pyfuncitem.nodeid in self._nodeids:
+            self._nodeids.discard(pyfuncitem.nodeid)
+            return True
+        return None
+
+
+class SetupVerdicts:
+    """
+    ``pytest`` plugin caching the verdict of a ``setup_raises`` validation for the class or
+    module of the item, so that the next items of the scope reuse it instead of matching
+    (and formatting) it again.
+
+    A verdict is only reused for the same spec and the very same raised exception (or none
+    at all): a class or module scoped fixture that failed re-raises the exception it
+    cached for every item of its scope, whereas a function scoped one raises anew.  The
+    verdicts of a scope are dropped once its last item is torn down.
+    """
+
+    def __init__(self):
+        # ``{(scope node ID, id(spec)): (spec, raised exception, verdict)}``.
+        self._verdicts = {}
+
+    @staticmethod
+    def _key(item, spec):
+        node = item.getparent(_SCOPE_NODE_TYPES[spec.scope]) or item
+        return (node.nodeid, id(spec))
+
+    def get(self, item, spec, raised_exception):
+        """Return the verdict stored for ``raised_exception`` in the scope of ``item``, ``None`` if none is."""
+        entry = self._verdicts.get(self._key(item, spec))
+        if entry is None or entry[0] is not spec or entry[1] is not raised_exception:
+            return None
+        return entry[2]
+
+    def set(self, item, spec, raised_exception, verdict):
+        self._verdicts[self._key(item, spec)] = (spec, raised_exception, verdict)
+
+    def pytest_runtest_teardown(self, item, nextitem):  # pylint: disable=unused-argument
+        if not self._verdicts:
+            return
+        remaining = {node.nodeid for node in nextitem.listchain()} if nextitem is not None else set()
+        for key in [key for key in self._verdicts if key[0] not in remaining]:
+            del self._verdicts[key]
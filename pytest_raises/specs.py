@@ -0,0 +1,455 @@
+# -*- coding: utf-8 -*-
+"""
+Compilation of the ``setup_raises`` / ``raises`` / ``raises_table`` markers into the
+immutable specs read by the validation of :mod:`pytest_raises.pytest_raises`.
+
+.. warning::
+
+    **The contents of this module are "private", not intended to be used directly by external
+    projects!**  :data:`REGEX_CACHE` is also exposed as ``pytest_raises.pytest_raises.REGEX_CACHE``.
+"""
+import collections
+import collections.abc
+import re
+
+from pytest_raises.groups import BaseExceptionGroup as _BaseExceptionGroup
+from pytest_raises.matching import ENGINES, MODES, AnyPattern, BudgetedPattern, LinearPattern, ModePattern
+from pytest_raises.scopes import SCOPES
+from pytest_raises.tables import RaisesTable
+
+# ``re.Pattern`` is only exposed by name on Python 3.7+.
+_PATTERN_TYPE = type(re.compile(''))
+
+
+class _RegexCache:
+    """
+    A size bounded, least recently used cache of compiled ``match`` regular expressions,
+    keyed by ``(pattern, flags, engine, mode)``.  Unlike the ``re`` module's internal cache, it does not
+    thrash when a large parametrized suite uses many distinct patterns, and its ``hits`` /
+    ``misses`` counters can be inspected through :data:`REGEX_CACHE`.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._cache = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._cache)
+
+    def compile(self, pattern, flags=0, engine='re', mode='match'):
+        """
+        Return the compiled form of ``pattern`` with ``flags`` for ``engine`` (``'re'``, or
+        ``'linear'`` for a :class:`~pytest_raises.matching.LinearPattern`), whose ``match``
+        performs the ``re`` method ``mode``.  Already compiled patterns are returned as is
+        by the ``'re'`` engine in ``'match'`` mode; combining them with ``flags`` raises
+        ``ValueError``, exactly as ``re.compile`` does.
+        """
+        if isinstance(pattern, _PATTERN_TYPE):
+            if flags:
+                raise ValueError('cannot process flags argument with a compiled pattern')
+            if engine == 're' and mode == 'match':
+                return pattern
+            pattern, flags = pattern.pattern, pattern.flags
+
+        # The type is part of the key so that `str` and `bytes` patterns never collide.
+        return self._cached((type(pattern), pattern, flags, engine, mode), lambda: (
+            LinearPattern(pattern, flags, mode) if engine == 'linear' else
+            re.compile(pattern, flags) if mode == 'match' else ModePattern(re.compile(pattern, flags), mode)
+        ))
+
+    def compile_any(self, patterns, flags=0, engine='re', mode='match'):
+        """
+        Return the :class:`~pytest_raises.matching.AnyPattern` of ``patterns``, a list of
+        strings or compiled patterns, for ``engine`` and ``mode``.
+        """
+        patterns = tuple(patterns)
+        return self._cached((AnyPattern, patterns, flags, engine, mode), lambda: AnyPattern(patterns, flags, mode, engine))
+
+    def _cached(self, key, compile_regex):
+        regex = self._cache.get(key)
+        if regex is not None:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return regex
+
+        self.misses += 1
+        regex = compile_regex()
+        self._cache[key] = regex
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+        return regex
+
+    def clear(self):
+        """Empty the cache and reset the ``hits`` / ``misses`` counters."""
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+REGEX_CACHE = _RegexCache(maxsize=512)
+"""The :class:`_RegexCache` used to compile every ``match`` argument of the session."""
+
+
+_RaisesSpec = collections.namedtuple(
+    '_RaisesSpec',
+    ['marker_name', 'exception', 'exclude', 'group', 'chained', 'scope', 'repeat', 'attrs', 'args', 'message', 'match_pattern',
+     'match_flags', 'match_mode', 'match_any', 'match_regex', 'usage_error']
+)
+"""
+The compiled, immutable form of a ``@pytest.mark.raises`` or ``@pytest.mark.setup_raises``
+marker.  Built once per marker object by :func:`_compile_raises_marker` and shared by every
+test item carrying that marker.
+
+``exception`` and ``exclude`` are tuples of exception classes, see
+:func:`_is_expected_type`.  With ``group``, they apply to the leaves of the exception
+group expected to be raised; with ``chained``, to any link of the raised exception's
+chain.
+
+``scope`` is ``'function'``, or for ``setup_raises`` the ``'class'`` / ``'module'`` whose
+items share the verdict, see :class:`~pytest_raises.scopes.SetupVerdicts`.  ``repeat`` is
+the number of times a ``raises`` test is run, see :class:`~pytest_raises.repeat.RepeatRunner`.
+
+``attrs`` is the tuple of ``(name, value)`` attributes, and ``args`` the ``args`` tuple (or
+``None``), the raised exception must have; they are compared before its message is computed.
+
+With ``match_any``, ``match_pattern`` is the tuple of patterns and ``match_regex`` their
+:class:`~pytest_raises.matching.AnyPattern`, which tells which pattern matched.
+
+``usage_error`` is ``None`` for a valid marker, otherwise the string describing how the
+marker was misused.  Such markers are never validated against an outcome, the test is
+failed before its body runs instead.
+"""
+
+# Maps ``id(marker)`` to ``(marker, spec)``, or ``(marker, RaisesTable)`` for the
+# ``raises_table`` markers.  The marker is kept alive alongside its spec so
+# that its ``id`` cannot be recycled by a different marker while the entry exists.
+_SPEC_CACHE = {}
+
+# Maps ``(raised type, spec.exception, spec.exclude)`` to the verdict of
+# :func:`_is_expected_type`, so that the MRO walks are done once per raised type.
+_TYPE_VERDICTS = {}
+
+
+def _compile_raises_marker(marker_name, marker, match_defaults=('re', 0)):
+    """
+    Compile ``marker`` into a :data:`_RaisesSpec`, validating its arguments.
+
+    .. warning::
+
+        **This is a "private" function not intended to be called directly by external projects!**
+
+    Compilation is performed at most once per marker object; parametrized tests sharing a
+    function level marker therefore share a single spec.
+
+    **Parameters**
+
+    ``marker_name``
+        The string marker name, ``'setup_raises'`` or ``'raises'``.
+
+    ``marker``
+        The ``pytest`` marker object, as returned by ``item.get_closest_marker``.
+
+    ``match_defaults``
+        The ``(engine, timeout)`` used for ``match`` when the marker does not specify
+        ``match_engine`` / ``match_timeout``, i.e., the ``raises_match_engine`` and
+        ``raises_match_timeout`` ini options.
+    """
+    cached = _SPEC_CACHE.get(id(marker))
+    if cached is not None and cached[0] is marker:
+        return cached[1]
+    spec = _compile_raises_kwargs(marker_name, marker.kwargs, match_defaults)
+    _SPEC_CACHE[id(marker)] = (marker, spec)
+    return spec
+
+
+def _compile_raises_kwargs(marker_name, kwargs, match_defaults=('re', 0)):
+    """
+    Compile the arguments ``kwargs`` of a marker into a :data:`_RaisesSpec`, see
+    :func:`_compile_raises_marker`.  ``marker_name`` prefixes the usage errors.  Each group
+    of arguments is validated by its own helper, the first usage error found is reported.
+
+    .. warning::
+
+        **This is a "private" function not intended to be called directly by external projects!**
+    """
+    group = bool(kwargs.get('group', False))
+    chained = bool(kwargs.get('chained', False))
+    scope = kwargs.get('scope', 'function')
+    repeat = kwargs.get('repeat', 1)
+
+    exception, usage_error = _exception_classes(marker_name, 'exception', kwargs.get('exception', Exception))
+    exclude = None
+    if usage_error is None:
+        exclude, usage_error = _exception_classes(marker_name, 'exclude', kwargs.get('exclude', ()), allow_empty=True)
+    usage_error = (
+        usage_error
+        or _message_usage_error(marker_name, kwargs)
+        or _nesting_usage_error(marker_name, group, chained)
+        or _phase_usage_error(marker_name, scope, repeat)
+    )
+    attrs, args, usage_error = _compile_attributes(marker_name, kwargs.get('attrs', {}), kwargs.get('args', None), usage_error)
+    match_pattern, match_regex, usage_error = _compile_match(marker_name, kwargs, match_defaults, usage_error)
+
+    return _RaisesSpec(
+        marker_name, exception, exclude, group, chained, scope, repeat, attrs, args, kwargs.get('message', None), match_pattern,
+        kwargs.get('match_flags', 0), kwargs.get('match_mode', 'match'), kwargs.get('match_any', None) is not None, match_regex,
+        usage_error
+    )
+
+
+def _message_usage_error(marker_name, kwargs):
+    """
+    Return the usage error of the ``message`` / ``match`` / ``match_any`` / ``match_mode``
+    arguments ``kwargs`` of a marker, ``None`` if they are valid.
+
+    .. warning::
+
+        **This is a "private" function not intended to be called directly by external projects!**
+    """
+    message = kwargs.get('message', None)
+    match_pattern = kwargs.get('match', None)
+    match_any = kwargs.get('match_any', None)
+    match_mode = kwargs.get('match_mode', 'match')
+    # Only `message` or `match` should be supplied at a time, not both.
+    if message and match_pattern:
+        return '@pytest.mark.{}: only `message="{}"` *OR* `match="{}"` allowed, not both.'.format(
+            marker_name, message, match_pattern
+        )
+    if match_any is not None and (message or match_pattern):
+        return '@pytest.mark.{}: only one of `message`, `match` and `match_any` allowed.'.format(marker_name)
+    not_a_list = isinstance(match_any, (str, bytes, _PATTERN_TYPE)) or not isinstance(match_any, collections.abc.Iterable)
+    if match_any is not None and (not_a_list or not match_any):
+        return '@pytest.mark.{}: supplied `match_any={!r}` must be a non-empty list of patterns.'.format(marker_name, match_any)
+    if match_mode not in MODES:
+        return '@pytest.mark.{}: supplied `match_mode={!r}` must be one of {}.'.format(
+            marker_name, match_mode, ', '.join(repr(mode) for mode in MODES)
+        )
+    return None
+
+
+def _nesting_usage_error(marker_name, group, chained):
+    """
+    Return the usage error of the ``group`` / ``chained`` arguments of a marker, ``None``
+    if they are valid.
+
+    .. warning::
+
+        **This is a "private" function not intended to be called directly by external projects!**
+    """
+    if group and _BaseExceptionGroup is None:
+        return '@pytest.mark.{}: `group=True` requires Python 3.11+ or the `exceptiongroup` package.'.format(marker_name)
+    if group and chained:
+        return '@pytest.mark.{}: only `group=True` *OR* `chained=True` allowed, not both.'.format(marker_name)
+    return None
+
+
+def _phase_usage_error(marker_name, scope, repeat):
+    """
+    Return the usage error of the ``scope`` (``setup_raises`` only) and ``repeat``
+    (``raises`` only) arguments of a marker, ``None`` if they are valid.
+
+    .. warning::
+
+        **This is a "private" function not intended to be called directly by external projects!**
+    """
+    if scope not in SCOPES:
+        return '@pytest.mark.{}: supplied `scope={!r}` must be one of {}.'.format(
+            marker_name, scope, ', '.join(repr(value) for value in SCOPES)
+        )
+    if scope != 'function' and marker_name != 'setup_raises':
+        return '@pytest.mark.{}: `scope` is only supported by `@pytest.mark.setup_raises`.'.format(marker_name)
+    if isinstance(repeat, bool) or not isinstance(repeat, int) or repeat < 1:
+        return '@pytest.mark.{}: supplied `repeat={!r}` must be a positive integer.'.format(marker_name, repeat)
+    if repeat != 1 and marker_name == 'setup_raises':
+        return '@pytest.mark.{}: `repeat` is only supported by `@pytest.mark.raises`.'.format(marker_name)
+    return None
+
+
+def _compile_attributes(marker_name, attrs, args, usage_error):
+    """
+    Validate and normalize the ``attrs`` / ``args`` arguments of a marker unless an earlier
+    ``usage_error`` was found, returning ``(attrs, args, usage_error)``: ``attrs`` as a tuple
+    of ``(name, value)``, ``args`` as a tuple or ``None``.
+
+    .. warning::
+
+        **This is a "private" function not intended to be called directly by external projects!**
+    """
+    if usage_error is None and (not isinstance(attrs, collections.abc.Mapping) or not all(isinstance(name, str) for name in attrs)):
+        usage_error = '@pytest.mark.{}: supplied `attrs={!r}` must be a mapping of attribute names to values.'.format(
+            marker_name, attrs
+        )
+    if usage_error is None and args is not None and not isinstance(args, (tuple, list)):
+        usage_error = '@pytest.mark.{}: supplied `args={!r}` must be a tuple (or list).'.format(marker_name, args)
+    if usage_error is not None:
+        return (), None, usage_error
+    return tuple(attrs.items()), tuple(args) if args is not None else None, None
+
+
+def _compile_match(marker_name, kwargs, match_defaults, usage_error):
+    """
+    Compile the ``match`` or ``match_any`` argument of a marker with its ``match_flags``,
+    ``match_mode``, ``match_engine`` and ``match_timeout`` unless an earlier ``usage_error``
+    was found, returning ``(match_pattern, match_regex, usage_error)``.  With ``match_any``,
+    ``match_pattern`` is the tuple of its patterns.
+
+    .. warning::
+
+        **This is a "private" function not intended to be called directly by external projects!**
+    """
+    match_pattern = kwargs.get('match', None)
+    match_any = kwargs.get('match_any', None)
+    match_flags = kwargs.get('match_flags', 0)  # 0 means no flags for `re.match`
+    match_mode = kwargs.get('match_mode', 'match')
+    match_engine = kwargs.get('match_engine', match_defaults[0])
+    match_timeout = kwargs.get('match_timeout', match_defaults[1])
+
+    if usage_error is None and match_engine not in ENGINES:
+        usage_error = '@pytest.mark.{}: supplied `match_engine={!r}` must be one of {}.'.format(
+            marker_name, match_engine, ', '.join(repr(engine) for engine in ENGINES)
+        )
+    if usage_error is None and not _is_non_negative_number(match_timeout):
+        usage_error = '@pytest.mark.{}: supplied `match_timeout={!r}` must be a non-negative number of seconds.'.format(
+            marker_name, match_timeout
+        )
+    if usage_error is not None:
+        return match_pattern if match_any is None else match_any, None, usage_error
+
+    if match_any is not None:
+        match_pattern = tuple(match_any)
+    try:
+        if match_any is not None:
+            match_regex = REGEX_CACHE.compile_any(match_pattern, match_flags, match_engine, match_mode)
+        elif match_pattern is not None:
+            match_regex = REGEX_CACHE.compile(match_pattern, match_flags, match_engine, match_mode)
+        else:
+            return None, None, None
+    except (re.error, TypeError, ValueError) as exc:
+        supplied = 'match={!r}'.format(match_pattern) if match_any is None else 'match_any={!r}'.format(list(match_pattern))
+        return match_pattern, None, '@pytest.mark.{}: supplied `{}` with `match_flags={!r}` could not be compiled: {}'.format(
+            marker_name, supplied, match_flags, exc
+        )
+    if match_engine == 're' and match_timeout:
+        match_regex = BudgetedPattern(match_regex, match_timeout)
+    return match_pattern, match_regex, None
+
+
+def _closest_markers(item):
+    """
+    Return the ``(setup_raises, raises, raises_table)`` markers applying to ``item``, each
+    ``None`` if absent.  The closest node carrying a ``raises`` or ``raises_table`` marker
+    wins, e.g., the ``raises_table`` of a function over a module level ``raises``; on that
+    node, a ``raises`` (e.g., from ``pytest.param(marks=...)``) takes precedence over the
+    table, so that the table is only returned without a ``raises``.
+
+    .. warning::
+
+        **This is a "private" function not intended to be called directly by external projects!**
+    """
+    if not hasattr(item, 'iter_markers_with_node'):
+        # Pytest < 3.6 only has `get_marker`, which merges the markers of every level.
+        return item.get_marker('setup_raises'), item.get_marker('raises'), item.get_marker('raises_table')
+    setup_marker = raises_marker = table_marker = raises_node = None
+    for node, marker in item.iter_markers_with_node():
+        if marker.name == 'setup_raises':
+            setup_marker = setup_marker or marker
+        elif marker.name in ('raises', 'raises_table') and raises_node in (None, node):
+            raises_node = node
+            if marker.name == 'raises':
+                raises_marker = raises_marker or marker
+            else:
+                table_marker = table_marker or marker
+    return setup_marker, raises_marker, table_marker
+
+
+def _raises_table_spec(item, marker, match_defaults):
+    """
+    Return the spec of ``item`` in the ``raises_table`` ``marker`` of its function, or
+    ``None`` if the table holds no expectation for it.  The table is compiled once per
+    marker object (see :class:`~pytest_raises.tables.RaisesTable`), then looked up by the
+    parameter ID of ``item``.
+
+    .. warning::
+
+        **This is a "private" function not intended to be called directly by external projects!**
+    """
+    callspec = getattr(item, 'callspec', None)
+    if callspec is None:
+        return None
+    cached = _SPEC_CACHE.get(id(marker))
+    if cached is None or cached[0] is not marker:
+        table = RaisesTable(
+            marker,
+            lambda name, kwargs: _compile_raises_kwargs(name, kwargs, match_defaults),
+            lambda usage_error: _RaisesSpec(
+                'raises_table', (), (), False, False, 'function', 1, (), None, None, None, 0, 'match', False, None, usage_error
+            ),
+        )
+        cached = _SPEC_CACHE[id(marker)] = (marker, table)
+    return cached[1].spec(callspec.id)
+
+
+def _exception_classes(marker_name, argument_name, value, allow_empty=False):
+    """
+    Normalize the ``exception`` or ``exclude`` argument ``value`` of a marker, either an
+    exception class or an iterable of exception classes, into a tuple of classes.  Returns
+    ``(classes, usage_error)``, where ``usage_error`` is ``None`` for a valid ``value``.
+
+    .. warning::
+
+        **This is a "private" function not intended to be called directly by external projects!**
+    """
+    not_classes = (
+        '@pytest.mark.{marker}: supplied `{argument}` argument must be a Class or an iterable of Classes, e.g., `{argument}=RuntimeError`.'
+    ).format(marker=marker_name, argument=argument_name)
+    if isinstance(value, type):
+        classes = (value,)
+    elif isinstance(value, (str, bytes)):
+        return None, not_classes
+    else:
+        try:
+            classes = tuple(value)
+        except TypeError:
+            return None, not_classes
+        if not classes and not allow_empty:
+            return None, not_classes
+
+    for cls in classes:
+        if not isinstance(cls, type):
+            return None, not_classes
+        if not issubclass(cls, BaseException):
+            return None, '@pytest.mark.{0}: supplied `{1}={2}` is not a subclass of `BaseException`.'.format(
+                marker_name, argument_name, cls
+            )
+    return classes, None
+
+
+def _describe_exception_classes(classes):
+    """Render the ``exception`` / ``exclude`` classes of a spec as the user supplied them."""
+    return classes[0] if len(classes) == 1 else classes
+
+
+def _is_expected_type(raised_type, spec):
+    """
+    Return whether ``raised_type`` is a subclass of one of the ``spec.exception`` classes
+    and of none of the ``spec.exclude`` classes.  Verdicts are cached per ``(raised_type,
+    spec.exception, spec.exclude)``, shared by every spec expecting the same classes.
+
+    .. warning::
+
+        **This is a "private" function not intended to be called directly by external projects!**
+    """
+    key = (raised_type, spec.exception, spec.exclude)
+    verdict = _TYPE_VERDICTS.get(key)
+    if verdict is None:
+        verdict = issubclass(raised_type, spec.exception) and not (
+            spec.exclude and issubclass(raised_type, spec.exclude)
+        )
+        _TYPE_VERDICTS[key] = verdict
+    return verdict
+
+
+def _is_non_negative_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value >= 0
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Compiled form of the ``@pytest.mark.raises_table`` marker, expressing the expectations of
+every case of a parametrized test with a single function level marker::
+
+    @pytest.mark.parametrize('value', [...])
+    @pytest.mark.raises_table({'case-1': KeyError, 'case-2': dict(exception=ValueError, match=r'bad')})
+    def test_data_driven(value):
+        ...
+"""
+from collections.abc import Mapping
+
+
+class RaisesTable:  # pylint: disable=too-few-public-methods
+    """
+    The expectations of a ``raises_table`` marker, keyed by the parameter ID of the test
+    items (``item.callspec.id``), e.g., ``'case-1'`` or ``'1-a'`` for stacked parametrize.
+
+    The table is the only argument of the marker, positional or ``table=``, either:
+
+    - a mapping ``{param_id: entry}``, every entry of which is compiled once, here; or
+    - a callable ``entry = table(param_id)``, called once per parameter ID.  It must be
+      passed as ``table=`` since ``pytest`` applies a mark to a lone positional callable.
+
+    An ``entry`` is ``None`` (the case is not expected to raise, i.e., no expectation),
+    an exception class or tuple of classes, or a dictionary of the arguments accepted by
+    ``@pytest.mark.raises``.  Parameter IDs missing from a mapping have no expectation.
+
+    ``compile_entry(name, kwargs)`` turns the arguments of an entry into a spec, ``name``
+    being used to prefix usage errors; ``usage_error_spec(message)`` builds the spec of a
+    misused table.
+    """
+
+    def __init__(self, marker, compile_entry, usage_error_spec):
+        self.marker = marker
+        self._compile_entry = compile_entry
+        self._usage_error_spec = usage_error_spec
+        self._function = None
+        self._specs = {}
+        self._usage_error = None
+
+        table = None
+        if len(marker.args) == 1 and not marker.kwargs:
+            table = marker.args[0]
+        elif not marker.args and list(marker.kwargs) == ['table']:
+            table = marker.kwargs['table']
+        if isinstance(table, Mapping):
+            for param_id, entry in table.items():
+                self._specs[param_id] = self._compile(param_id, entry)
+        elif callable(table):
+            self._function = table
+        else:
+            self._usage_error = usage_error_spec(
+                '@pytest.mark.raises_table: expected a single mapping `{{param_id: expectation}}` or callable '
+                '`expectation = table(param_id)` argument, got args={!r} kwargs={!r}.'.format(marker.args, marker.kwargs)
+            )
+
+    def _compile(self, param_id, entry):
+        if entry is None:
+            return None
+        kwargs = entry if isinstance(entry, Mapping) else {'exception': entry}
+        return self._compile_entry('raises_table[{}]'.format(param_id), kwargs)
+
+    def spec(self, param_id):
+        """Return the spec of the case ``param_id``, or ``None`` if it has no expectation."""
+        if self._usage_error is not None:
+            return self._usage_error
+        try:
+            return self._specs[param_id]
+        except KeyError:
+            if self._function is None:
+                return None
+        try:
+            entry = self._function(param_id)
+        except Exception as exc:  # pylint: disable=broad-except
+            spec = self._usage_error_spec('@pytest.mark.raises_table: `{!r}` raised {!r} for the parameter ID {!r}.'.format(
+                self._function, exc, param_id
+            ))
+        else:
+            spec = self._compile(param_id, entry)
+        self._specs[param_id] = spec
+        return spec
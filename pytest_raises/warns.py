@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+"""
+``@pytest.mark.setup_warns`` / ``@pytest.mark.warns``: expect the setup / call phase of a
+test to emit a warning, the marker counterparts of ``pytest.warns``.  Warnings are
+recorded in bounded memory rather than in the ever growing list of
+``warnings.catch_warnings(record=True)``.
+"""
+import collections
+import re
+import warnings
+
+import pytest
+
+from pytest_raises.compat import _NodeSlot, _set_outcome_exception, _traceback_here
+from pytest_raises.matching import MODES
+from pytest_raises.specs import REGEX_CACHE, _describe_exception_classes, _exception_classes
+
+# The markers of this module, and the phase each of them checks.
+WARNS_MARKERS = (('setup_warns', 'setup'), ('warns', 'call'))
+_WARNS_MARKER_NAMES = tuple(name for name, _phase in WARNS_MARKERS)
+
+# The number of non matching warnings kept to describe a failure.
+MAX_RECORDS = 10
+
+_WarnsSpec = collections.namedtuple('_WarnsSpec', ['marker_name', 'category', 'match_pattern', 'match_regex', 'usage_error'])
+_WarnsSpec.__doc__ = """
+The compiled arguments of a ``setup_warns`` / ``warns`` marker: the tuple of warning
+``category`` classes, the ``match_pattern`` supplied and its compiled ``match_regex`` (or
+``None``), and the ``usage_error`` string of a misused marker (``None`` otherwise).
+"""
+
+
+def _compile_warns_kwargs(marker_name, kwargs):
+    """
+    Compile the arguments ``kwargs`` of a ``setup_warns`` / ``warns`` marker into a
+    :data:`_WarnsSpec`.
+
+    .. warning::
+
+        **This is a "private" function not intended to be called directly by external projects!**
+    """
+    category = kwargs.get('category', Warning)
+    match_pattern = kwargs.get('match', None)
+    match_flags = kwargs.get('match_flags', 0)
+    match_mode = kwargs.get('match_mode', 'match')
+
+    category, usage_error = _exception_classes(marker_name, 'category', category)
+    if usage_error is None and not all(issubclass(cls, Warning) for cls in category):
+        usage_error = '@pytest.mark.{}: supplied `category={!r}` must be a subclass (or tuple of subclasses) of `Warning`.'.format(
+            marker_name, _describe_exception_classes(category)
+        )
+    if usage_error is None and match_mode not in MODES:
+        usage_error = '@pytest.mark.{}: supplied `match_mode={!r}` must be one of {}.'.format(
+            marker_name, match_mode, ', '.join(repr(mode) for mode in MODES)
+        )
+
+    match_regex = None
+    if usage_error is None and match_pattern is not None:
+        try:
+            match_regex = REGEX_CACHE.compile(match_pattern, match_flags, 're', match_mode)
+        except (re.error, TypeError, ValueError) as exc:
+            usage_error = '@pytest.mark.{}: supplied `match={!r}` with `match_flags={!r}` could not be compiled: {}'.format(
+                marker_name, match_pattern, match_flags, exc
+            )
+    return _WarnsSpec(marker_name, category, match_pattern, match_regex, usage_error)
+
+
+class WarningRecorder:
+    """
+    Context manager recording the warnings emitted in its block against ``spec``, as
+    ``warnings.catch_warnings(record=True)`` with every warning shown (the ``always``
+    filter) would, but in constant memory:
+
+    - ``first``: the first warning matching ``spec``, a ``warnings.WarningMessage``.
+      Once it is found the next warnings are only counted, their messages are never
+      computed.
+    - ``count``: the number of warnings emitted.
+    - ``others``: the last ``max_records`` warnings emitted before ``first`` that did not
+      match, used to describe a failure.
+
+    The recorded warnings are not passed on to the other warning handlers, e.g., the
+    warnings summary of ``pytest``.
+    """
+
+    def __init__(self, spec, max_records=MAX_RECORDS):
+        self.spec = spec
+        self.first = None
+        self.count = 0
+        self.others = collections.deque(maxlen=max_records)
+        self._catcher = None
+
+    def __enter__(self):
+        self._catcher = warnings.catch_warnings()
+        self._catcher.__enter__()
+        warnings.simplefilter('always')
+        # Restored along with the filters by ``catch_warnings``.
+        warnings.showwarning = self._record
+        return self
+
+    def __exit__(self, *exc_info):
+        self._catcher.__exit__(*exc_info)
+        self._catcher = None
+
+    def _record(self, message, category, filename, lineno, file=None, line=None):  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self.count += 1
+        if self.first is not None:
+            return
+        warning = warnings.WarningMessage(message, category, filename, lineno, file, line)
+        if self.matches(warning):
+            self.first = warning
+        else:
+            self.others.append(warning)
+
+    def matches(self, warning):
+        """Return whether ``warning``, a ``warnings.WarningMessage``, satisfies :attr:`spec`."""
+        if not issubclass(warning.category, self.spec.category):
+            return False
+        return self.spec.match_regex is None or self.spec.match_regex.match(str(warning.message)) is not None
+
+    def failure_message(self):
+        """Return the failure message of the recorded warnings, ``None`` if one of them matched."""
+        if self.first is not None:
+            return None
+        expected = 'Expected warning {}'.format(_describe_exception_classes(self.spec.category))
+        if self.spec.match_pattern is not None:
+            expected += ' matching "{}"'.format(getattr(self.spec.match_pattern, 'pattern', self.spec.match_pattern))
+        if not self.count:
+            return '{}, but no warning was emitted'.format(expected)
+        skipped = self.count - len(self.others)
+        return '{}, but none of the {} warnings emitted matched{}: {}'.format(
+            expected, self.count, ' (last {} shown)'.format(len(self.others)) if skipped else '',
+            ', '.join('{}({!r})'.format(warning.category.__name__, str(warning.message)) for warning in self.others)
+        )
+
+
+class WarnsChecker:
+    """
+    ``pytest`` plugin checking the ``setup_warns`` / ``warns`` markers, failing the tests
+    whose marked phase did not emit a warning of the expected ``category`` matching
+    ``match`` (see :class:`WarningRecorder`) with ``failure_class``.
+
+    A phase that raised is not checked, the exception fails (or, with ``raises``, passes)
+    the test as usual.  As with ``setup_raises``, a failed ``setup_warns`` check and the
+    ``usage_error_class`` of a misused marker fail the test at the beginning of its call
+    phase, so that it is reported as failed rather than as an error.
+
+    The plugin is only registered once an item carrying one of these markers is
+    collected, or marked at run time, and only the items handed to :meth:`expect` are
+    checked: the hook wrappers of the other items do a single set lookup.
+    """
+
+    def __init__(self, failure_class, usage_error_class):
+        self._failure_class = failure_class
+        self._usage_error_class = usage_error_class
+        self._specs = _NodeSlot('_pytest_raises_warns_specs')
+        self._setup_failure = _NodeSlot('_pytest_raises_setup_warns_failure')
+        # The node IDs of the items carrying a marker of this module.
+        self._marked_nodeids = set()
+
+    def expect(self, item):
+        """
+        Compile and store the ``{marker_name: spec_or_None}`` of ``item``, returning
+        whether it carries either marker, i.e., whether it is checked.
+        """
+        if item.nodeid in self._marked_nodeids:
+            return True
+        specs = {}
+        for marker_name in _WARNS_MARKER_NAMES:
+            marker = item.get_closest_marker(marker_name)
+            specs[marker_name] = _compile_warns_kwargs(marker_name, marker.kwargs) if marker is not None else None
+        if not any(specs.values()):
+            return False
+        self._specs.set(item, specs)
+        self._marked_nodeids.add(item.nodeid)
+        return True
+
+    def _get_specs(self, item):
+        """Return the ``{marker_name: spec_or_None}`` of ``item``, ``None`` if it is not checked."""
+        return self._specs.get(item) if item.nodeid in self._marked_nodeids else None
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_setup(self, item):
+        specs = self._get_specs(item)
+        spec = specs['setup_warns'] if specs is not None else None
+        if spec is None or spec.usage_error:
+            yield
+            return
+        with WarningRecorder(spec) as recorder:
+            outcome = yield
+        if outcome.excinfo is None:
+            failure_message = recorder.failure_message()
+            if failure_message is not None:
+                self._setup_failure.set(item, '{}: {}'.format(self._failure_class.__name__, failure_message))
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        # pylint: disable=unused-variable
+        __tracebackhide__ = True
+        specs = self._get_specs(item)
+        if specs is None:
+            yield
+            return
+        for spec in specs.values():
+            if spec is not None and spec.usage_error:
+                pytest.fail('{}: {}'.format(self._usage_error_class.__name__, spec.usage_error), pytrace=False)
+        setup_failure = self._setup_failure.get(item)
+        if setup_failure is not None:
+            self._setup_failure.set(item, None)
+            pytest.fail(setup_failure, pytrace=False)
+        spec = specs['warns']
+        if spec is None:
+            yield
+            return
+        with WarningRecorder(spec) as recorder:
+            outcome = yield
+        if outcome.excinfo is None:
+            failure_message = recorder.failure_message()
+            if failure_message is not None:
+                _set_outcome_exception(outcome, self._failure_class(failure_message).with_traceback(_traceback_here()))
@@ -114,7 +114,8 @@ def main():
         extras_require={
             'develop': [
                 'pylint',
-                'pytest-cov'
+                'pytest-cov',
+                'pytest-xdist'
             ],
         },
         packages=[
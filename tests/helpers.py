@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+"""
+Helpers shared by the test modules of pytest-raises.
+"""
+
+
+def _run_tests_test(testdir, code, expected_output, expcted_return_code, conftest=None):
+    if conftest:
+        testdir.makeconftest(conftest)
+    testdir.makepyfile(code)
+    result = testdir.runpytest('-v')
+    result.stdout.fnmatch_lines(expected_output)
+    assert result.ret == expcted_return_code
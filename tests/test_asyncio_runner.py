@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+from helpers import _run_tests_test
+
+
+####################################################################################################
+# asyncio support                                                                                  #
+####################################################################################################
+def test_pytest_mark_raises_coroutine(testdir):
+    _run_tests_test(testdir, """
+            import asyncio
+            import pytest
+
+            @pytest.fixture
+            def value():
+                return 42
+
+            @pytest.mark.raises(exception=ValueError, match=r'42')
+            async def test_coroutine_raises(value):
+                await asyncio.sleep(0)
+                raise ValueError(value)
+
+            @pytest.mark.raises(exception=ValueError)
+            async def test_coroutine_does_not_raise():
+                await asyncio.sleep(0)
+        """,
+        [
+            '*::test_coroutine_raises PASSED*',
+            '*::test_coroutine_does_not_raise FAILED*',
+            "*ExpectedException: Expected exception <class 'ValueError'>, but it did not raise",
+        ],
+        1
+    )
+
+def test_pytest_mark_raises_coroutine_task_exceptions(testdir):
+    _run_tests_test(testdir, """
+            import asyncio
+            import pytest
+
+            async def fail(delay, exception):
+                await asyncio.sleep(delay)
+                raise exception
+
+            @pytest.mark.raises(exception=KeyError, message='background')
+            async def test_background_task_exception():
+                asyncio.get_running_loop().create_task(fail(0, KeyError('background')))
+                await asyncio.sleep(0.01)
+
+            @pytest.mark.raises(exception=KeyError)
+            async def test_spawned_task_exception():
+                asyncio.create_task(fail(0, KeyError('spawned')))
+
+            @pytest.mark.raises(exception=KeyError)
+            async def test_callback_exception():
+                asyncio.get_running_loop().call_soon(lambda: {}['callback'])
+                await asyncio.sleep(0.01)
+
+            @pytest.mark.raises(exception=RuntimeError)
+            async def test_test_exception_first():
+                asyncio.create_task(fail(0, KeyError('spawned')))
+                await asyncio.sleep(0.01)
+                raise RuntimeError('test')
+
+            @pytest.mark.raises(exception=KeyError)
+            async def test_pending_task_cancelled():
+                asyncio.create_task(fail(10, KeyError('too late')))
+        """,
+        [
+            '*::test_background_task_exception PASSED*',
+            '*::test_spawned_task_exception PASSED*',
+            '*::test_callback_exception PASSED*',
+            '*::test_test_exception_first PASSED*',
+            '*::test_pending_task_cancelled FAILED*',
+            "*ExpectedException: Expected exception <class 'KeyError'>, but it did not raise",
+        ],
+        1
+    )
+
+def test_pytest_mark_raises_coroutine_handled_task_exceptions(testdir):
+    _run_tests_test(testdir, """
+            import asyncio
+            import pytest
+
+            async def fail():
+                raise ValueError('handled')
+
+            @pytest.mark.raises(exception=ValueError)
+            async def test_awaited_task_exception():
+                task = asyncio.ensure_future(fail())
+                try:
+                    await task
+                except ValueError:
+                    pass
+
+            @pytest.mark.raises(exception=ValueError)
+            async def test_gathered_task_exception():
+                results = await asyncio.gather(fail(), return_exceptions=True)
+                assert isinstance(results[0], ValueError)
+        """,
+        [
+            '*::test_awaited_task_exception FAILED*',
+            '*::test_gathered_task_exception FAILED*',
+            "*ExpectedException: Expected exception <class 'ValueError'>, but it did not raise",
+            "*ExpectedException: Expected exception <class 'ValueError'>, but it did not raise",
+        ],
+        1
+    )
+
+def test_asyncio_runner_on_demand(testdir):
+    _run_tests_test(testdir, """
+            import pytest
+
+            @pytest.mark.raises(exception=KeyError)
+            def test_raises():
+                raise KeyError('missing')
+
+            def test_no_runner(request):
+                assert request.config.pluginmanager.get_plugin('raises_asyncio_runner') is None
+        """,
+        [
+            '*::test_raises PASSED*',
+            '*::test_no_runner PASSED*',
+        ],
+        0
+    )
+
+def test_raises_asyncio_loop_scope(testdir):
+    testdir.makeini("""
+        [pytest]
+        raises_asyncio_loop_scope = module
+    """)
+    testdir.makepyfile(test_first="""
+        import asyncio
+        import pytest
+
+        LOOPS = []
+
+        @pytest.mark.parametrize('index', range(3))
+        @pytest.mark.raises(exception=KeyError)
+        async def test_loop(index):
+            LOOPS.append(asyncio.get_running_loop())
+            raise KeyError(index)
+
+        def test_one_loop_per_module():
+            assert len(set(map(id, LOOPS))) == 1
+    """, test_second="""
+        import asyncio
+        import pytest
+        import test_first
+
+        @pytest.mark.raises(exception=KeyError)
+        async def test_other_module_loop():
+            assert test_first.LOOPS[0].is_closed()
+            raise KeyError()
+    """)
+    result = testdir.runpytest('-v')
+    result.stdout.fnmatch_lines(['*5 passed*'])
+    assert result.ret == 0
+
+def test_raises_asyncio_loop_scope_invalid(testdir):
+    testdir.makeini("""
+        [pytest]
+        raises_asyncio_loop_scope = function
+    """)
+    testdir.makepyfile("""
+        def test_nothing():
+            pass
+    """)
+    result = testdir.runpytest()
+    result.stderr.fnmatch_lines(['*raises_asyncio_loop_scope: expected one of session, module, got *function*'])
+    assert result.ret != 0
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+from helpers import _run_tests_test
+
+
+####################################################################################################
+# captured exceptions                                                                              #
+####################################################################################################
+def test_raised_exception_fixture(testdir):
+    _run_tests_test(testdir, """
+            import pytest
+
+            class HttpError(Exception):
+                def __init__(self, status_code):
+                    super(HttpError, self).__init__(status_code)
+                    self.status_code = status_code
+
+            @pytest.fixture
+            def check_status(raised_exception):
+                assert not raised_exception
+                yield
+                assert raised_exception.phase == 'call'
+                assert raised_exception.exception.status_code == 404
+                assert raised_exception.matched is raised_exception.exception
+
+            @pytest.mark.raises(exception=HttpError)
+            def test_not_found(check_status):
+                raise HttpError(404)
+
+            @pytest.fixture
+            def check_cause(raised_exception):
+                yield
+                assert isinstance(raised_exception.exception, RuntimeError)
+                assert isinstance(raised_exception.matched, KeyError)
+
+            @pytest.mark.raises(exception=KeyError, chained=True)
+            def test_chained(check_cause):
+                try:
+                    {}['missing']
+                except KeyError as exc:
+                    raise RuntimeError('lookup failed') from exc
+
+            @pytest.fixture
+            def check_nothing(raised_exception):
+                yield
+                assert raised_exception.exception is None
+
+            @pytest.mark.raises(exception=KeyError)
+            def test_unexpected(check_nothing):
+                raise ValueError('value')
+        """,
+        [
+            '*::test_not_found PASSED*',
+            '*::test_chained PASSED*',
+            '*::test_unexpected FAILED*',
+            '*= 1 failed, 2 passed in *',
+        ],
+        1
+    )
+
+def test_get_raised_exception(testdir):
+    testdir.makeconftest("""
+        import pytest
+        from pytest_raises.pytest_raises import get_raised_exception
+
+        SEEN = []
+
+        @pytest.hookimpl(hookwrapper=True)
+        def pytest_runtest_makereport(item, call):
+            yield
+            captured = get_raised_exception(item)
+            SEEN.append((call.when, captured and captured.phase, captured and repr(captured.exception)))
+
+        def pytest_sessionfinish(session):
+            with open('seen.txt', 'w') as seen:
+                seen.write(repr(SEEN))
+    """)
+    testdir.makepyfile("""
+        import pytest
+
+        @pytest.fixture
+        def broken():
+            raise OSError('broken')
+
+        @pytest.mark.setup_raises(exception=OSError)
+        def test_setup(broken):
+            pass
+    """)
+    result = testdir.runpytest()
+    assert result.ret == 0
+    assert testdir.tmpdir.join('seen.txt').read() == repr([
+        ('setup', 'setup', "OSError('broken')"),
+        ('call', 'setup', "OSError('broken')"),
+        ('teardown', None, None),
+    ])
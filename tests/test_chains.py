@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+from helpers import _run_tests_test
+
+from pytest_raises.chains import ExceptionChain
+
+
+####################################################################################################
+# chained=True                                                                                     #
+####################################################################################################
+def test_pytest_mark_raises_chained(testdir):
+    _run_tests_test(testdir, """
+            import pytest
+
+            class AdapterError(Exception):
+                pass
+
+            def adapter(low_level):
+                try:
+                    raise low_level
+                except OSError as exc:
+                    raise AdapterError('adapter failed') from exc
+
+            def handler():
+                try:
+                    adapter(PermissionError('denied'))
+                except AdapterError:
+                    raise RuntimeError('handler failed')
+
+            @pytest.mark.raises(chained=True, exception=PermissionError, message='denied')
+            def test_chained_cause():
+                handler()
+
+            @pytest.mark.raises(chained=True, exception=RuntimeError)
+            def test_chained_top():
+                handler()
+
+            @pytest.mark.raises(chained=True, exception=KeyError)
+            def test_chained_no_link_of_type():
+                handler()
+
+            @pytest.mark.raises(chained=True, exception=Exception, exclude=RuntimeError, message='other')
+            def test_chained_no_link_matches():
+                handler()
+
+            @pytest.mark.raises(chained=True, exception=PermissionError)
+            def test_chained_suppressed_context():
+                try:
+                    raise PermissionError('denied')
+                except PermissionError:
+                    raise RuntimeError('suppressed') from None
+
+            @pytest.mark.raises(chained=True, exception=KeyError)
+            def test_chained_cycle():
+                first, second = ValueError('first'), ValueError('second')
+                first.__cause__, second.__cause__ = second, first
+                raise first
+
+            @pytest.mark.raises(chained=True, group=True)
+            def test_chained_and_group():
+                pass
+        """,
+        [
+            '*::test_chained_cause PASSED*',
+            '*::test_chained_top PASSED*',
+            '*::test_chained_no_link_of_type FAILED*',
+            '*::test_chained_no_link_matches FAILED*',
+            '*::test_chained_suppressed_context FAILED*',
+            '*::test_chained_cycle FAILED*',
+            '*::test_chained_and_group FAILED*',
+            # pylint: disable=line-too-long
+            "*ExpectedException: Expected exception of type <class 'KeyError'> in the exception chain, but got the chain: RuntimeError <- __context__: AdapterError <- __cause__: PermissionError",
+            '*ExpectedMessage: None of the 2 links of type <class \'Exception\'> excluding <class \'RuntimeError\'> in the exception chain matches, e.g., __context__: "other" not in "adapter failed"',
+            "*ExpectedException: Expected exception of type <class 'PermissionError'> in the exception chain, but got the chain: RuntimeError",
+            "*ExpectedException: Expected exception of type <class 'KeyError'> in the exception chain, but got the chain: ValueError <- __cause__: ValueError",
+            'PytestRaisesUsageError: @pytest.mark.raises: only `group=True` *OR* `chained=True` allowed, not both.',
+        ],
+        1
+    )
+
+def test_pytest_mark_raises_chained_reports_link(testdir):
+    testdir.makepyfile("""
+        import pytest
+
+        @pytest.mark.raises(chained=True, exception=KeyError)
+        def test_chained_link():
+            try:
+                {}['missing']
+            except KeyError as exc:
+                raise ValueError('wrapped') from exc
+    """)
+    result = testdir.runpytest('-rP')
+    result.stdout.fnmatch_lines([
+        '*- pytest-raises -*',
+        "matched exception chain link __cause__: KeyError('missing')",
+        '*1 passed*',
+    ])
+    assert result.ret == 0
+
+def test_exception_chain_is_bounded():
+    exception = ValueError(0)
+    for depth in range(1, 10):
+        cause, exception = exception, ValueError(depth)
+        exception.__cause__ = cause
+    chain = ExceptionChain(exception, max_depth=3)
+    assert [path for path, _ in chain.links] == ['', '__cause__', '__cause__.__cause__', '__cause__.__cause__.__cause__']
+    assert chain.truncated
+    assert chain.type_summary().endswith(' <- ...')
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+from helpers import _run_tests_test
+
+
+####################################################################################################
+# raises_release_frames                                                                            #
+####################################################################################################
+def test_raises_release_frames(testdir):
+    testdir.makeini("""
+        [pytest]
+        raises_release_frames = true
+    """)
+    _run_tests_test(testdir, """
+            import weakref
+            import pytest
+
+            class Fixture(object):
+                pass
+
+            RAISED = []
+            FIXTURES = []
+
+            @pytest.mark.raises(exception=KeyError)
+            def test_passing():
+                fixture = Fixture()
+                FIXTURES.append(weakref.ref(fixture))
+                RAISED.append(KeyError('kept alive'))
+                raise RAISED[-1]
+
+            def test_frames_released():
+                assert RAISED[0].__traceback__ is None
+                assert FIXTURES[0]() is None
+
+            def helper():
+                raise KeyError('other')
+
+            @pytest.mark.raises(exception=KeyError, message='expected')
+            def test_failing():
+                helper()
+        """,
+        [
+            '*::test_passing PASSED*',
+            '*::test_frames_released PASSED*',
+            '*::test_failing FAILED*',
+            'Traceback (most recent call last):',
+            '*in test_failing',
+            '*in helper',
+            '*raise KeyError(?other?)',
+            'ExpectedMessage: "expected" not in "?other?"',
+        ],
+        1
+    )
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+import sys
+
+import pytest
+
+from helpers import _run_tests_test
+
+_REQUIRES_EXCEPTION_GROUP = pytest.mark.skipif(sys.version_info < (3, 11), reason='ExceptionGroup requires Python 3.11+')
+
+
+####################################################################################################
+# group=True                                                                                       #
+####################################################################################################
+
+@_REQUIRES_EXCEPTION_GROUP
+def test_pytest_mark_raises_group(testdir):
+    _run_tests_test(testdir, """
+            import pytest
+
+            def raise_group():
+                raise ExceptionGroup('outer', [
+                    ValueError('first'),
+                    ExceptionGroup('inner', [KeyError('key'), FileNotFoundError('missing'), PermissionError('denied')]),
+                ])
+
+            @pytest.mark.raises(group=True, exception=KeyError)
+            def test_group_type():
+                raise_group()
+
+            @pytest.mark.raises(group=True, exception=OSError, exclude=FileNotFoundError, match=r'den')
+            def test_group_match():
+                raise_group()
+
+            @pytest.mark.raises(group=True, exception=TypeError)
+            def test_group_no_leaf_of_type():
+                raise_group()
+
+            @pytest.mark.raises(group=True, exception=OSError, message='other')
+            def test_group_no_leaf_matches():
+                raise_group()
+
+            @pytest.mark.raises(group=True, exception=KeyError)
+            def test_group_not_a_group():
+                raise KeyError('key')
+        """,
+        [
+            '*::test_group_type PASSED*',
+            '*::test_group_match PASSED*',
+            '*::test_group_no_leaf_of_type FAILED*',
+            '*::test_group_no_leaf_matches FAILED*',
+            '*::test_group_not_a_group FAILED*',
+            # pylint: disable=line-too-long
+            "*ExpectedException: Expected an exception group with a leaf of type <class 'TypeError'>, but none of its 4 leaves is: ValueError x 1, KeyError x 1, FileNotFoundError x 1, PermissionError x 1",
+            '*ExpectedMessage: None of the 2 leaves of type <class \'OSError\'> in the exception group matches, e.g., exceptions?1?.exceptions?1?: "other" not in "missing"',
+            "*ExpectedException: Expected an exception group with a leaf of type <class 'KeyError'>, but got exception of type <class 'KeyError'> with message: 'key'",
+        ],
+        1
+    )
+
+@_REQUIRES_EXCEPTION_GROUP
+def test_pytest_mark_raises_group_reports_leaf(testdir):
+    testdir.makepyfile("""
+        import pytest
+
+        @pytest.mark.raises(group=True, exception=KeyError, match=r"'second'")
+        def test_group_leaf():
+            raise ExceptionGroup('group', [KeyError('first'), ExceptionGroup('inner', [KeyError('second')])])
+    """)
+    result = testdir.runpytest('-rP')
+    result.stdout.fnmatch_lines([
+        '*- pytest-raises -*',
+        "matched exception group leaf exceptions?1?.exceptions?0?: KeyError('second')",
+        '*1 passed*',
+    ])
+    assert result.ret == 0
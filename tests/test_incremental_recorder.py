@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+####################################################################################################
+# --raises-incremental                                                                             #
+####################################################################################################
+def test_raises_incremental(testdir):
+    testdir.makepyfile(validation="""
+        def validate(value):
+            if value < 0:
+                raise ValueError('negative')
+    """)
+    testdir.makepyfile(test_incremental="""
+        import pytest
+        from validation import validate
+
+        @pytest.mark.raises(exception=ValueError, message='negative')
+        def test_validate_raises():
+            validate(-1)
+
+        @pytest.mark.raises(exception=ValueError, message='positive')
+        def test_validate_fails():
+            validate(-1)
+
+        def test_unmarked():
+            validate(1)
+    """)
+    result = testdir.runpytest('-v', '--raises-incremental')
+    result.stdout.fnmatch_lines(['*::test_validate_raises PASSED*', '*1 failed, 2 passed*'])
+
+    # Unchanged: the passing expected-raise test is deselected, the others run.
+    result = testdir.runpytest('-v', '--raises-incremental')
+    result.stdout.fnmatch_lines([
+        '*::test_validate_fails FAILED*',
+        '*::test_unmarked PASSED*',
+        'pytest-raises: 1 unchanged expected-raise tests deselected (--raises-incremental)',
+        '*1 failed, 1 passed, 1 deselected*',
+    ])
+
+    # Changing an imported project module invalidates the tests of the importing module.
+    testdir.makepyfile(validation="""
+        def validate(value):
+            if value < 0:
+                raise ValueError('negative value')
+    """)
+    result = testdir.runpytest('-v', '--raises-incremental')
+    result.stdout.fnmatch_lines(['*::test_validate_raises PASSED*', '*1 failed, 2 passed*'])
+
+    # Without the option, everything runs.
+    result = testdir.runpytest('-v')
+    result.stdout.fnmatch_lines(['*1 failed, 2 passed*'])
+
+def test_raises_incremental_xdist(testdir):
+    pytest.importorskip('xdist')
+    testdir.makepyfile(test_incremental="""
+        import pytest
+
+        @pytest.mark.raises(exception=ValueError)
+        def test_first():
+            raise ValueError('first')
+
+        @pytest.mark.raises(exception=ValueError)
+        def test_second():
+            raise ValueError('second')
+
+        @pytest.mark.raises(exception=ValueError)
+        def test_third():
+            raise ValueError('third')
+    """)
+    result = testdir.runpytest('-n', '2', '--raises-incremental')
+    result.stdout.fnmatch_lines(['*3 passed*'])
+    cached = testdir.runpytest('--cache-show', 'pytest-raises/*')
+    cached.stdout.fnmatch_lines(['*test_incremental.py::test_first*', '*test_incremental.py::test_third*'])
+
+    # The workers deselect the tests the controller recorded.
+    result = testdir.runpytest('-n', '2', '--raises-incremental')
+    result.stdout.no_fnmatch_line('*passed*')
+    result = testdir.runpytest('--raises-incremental')
+    result.stdout.fnmatch_lines(['*3 deselected*'])
@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+import re
+
+from helpers import _run_tests_test
+
+from pytest_raises.matching import AnyPattern, LinearPattern
+from pytest_raises.specs import _RegexCache
+
+
+####################################################################################################
+# match engines, modes and limits                                                                  #
+####################################################################################################
+def test_pytest_mark_raises_match_timeout(testdir):
+    _run_tests_test(testdir, """
+            import pytest
+
+            @pytest.mark.raises(match=r'(a+)+$', match_timeout=0.1)
+            def test_pytest_mark_raises_match_timeout():
+                raise RuntimeError('a' * 64 + 'b')
+        """,
+        [
+            '*::test_pytest_mark_raises_match_timeout FAILED*',
+            # pylint: disable=line-too-long
+            '*PytestRaisesUsageError: @pytest.mark.raises: `match="(a+)+$"` exceeded its time budget of 0.1s against a message of 65 characters*',
+        ],
+        1
+    )
+
+def test_pytest_mark_raises_match_engine_linear(testdir):
+    _run_tests_test(testdir, """
+            import pytest
+
+            @pytest.mark.raises(match=r'(a+)+$', match_engine='linear')
+            def test_linear_no_match():
+                raise RuntimeError('a' * 64 + 'b')
+
+            @pytest.mark.raises(match=r'(?i).*MIDDLE.*road', match_engine='linear')
+            def test_linear_match():
+                raise RuntimeError('In The Middle Of The Road')
+
+            @pytest.mark.raises(match=r'(a)\\1', match_engine='linear')
+            def test_linear_unsupported():
+                raise RuntimeError('aa')
+        """,
+        [
+            '*::test_linear_no_match FAILED*',
+            '*::test_linear_match PASSED*',
+            '*::test_linear_unsupported FAILED*',
+            '*ExpectedMessage: "(a+)+$" does not match raised message "aaaa*ab"',
+            # pylint: disable=line-too-long
+            "PytestRaisesUsageError: @pytest.mark.raises: supplied `match='(a)\\\\1'` with `match_flags=0` could not be compiled: unsupported syntax GROUPREF*",
+        ],
+        1
+    )
+
+def test_raises_match_engine_ini(testdir):
+    testdir.makeini("""
+        [pytest]
+        raises_match_engine = linear
+    """)
+    _run_tests_test(testdir, """
+            import pytest
+
+            @pytest.mark.raises(match=r'(a)\\1')
+            def test_linear_by_default():
+                raise RuntimeError('aa')
+
+            @pytest.mark.raises(match=r'(a)\\1', match_engine='re')
+            def test_re_by_marker():
+                raise RuntimeError('aa')
+        """,
+        [
+            '*::test_linear_by_default FAILED*',
+            '*::test_re_by_marker PASSED*',
+        ],
+        1
+    )
+
+def test_pytest_mark_raises_invalid_match_engine(testdir):
+    _run_tests_test(testdir, """
+            import pytest
+
+            @pytest.mark.raises(match=r'a', match_engine='fast')
+            def test_pytest_mark_raises_invalid_match_engine():
+                raise RuntimeError('a')
+        """,
+        [
+            '*::test_pytest_mark_raises_invalid_match_engine FAILED*',
+            "PytestRaisesUsageError: @pytest.mark.raises: supplied `match_engine='fast'` must be one of 're', 'linear'.",
+        ],
+        1
+    )
+
+def test_pytest_mark_raises_match_mode(testdir):
+    _run_tests_test(testdir, """
+            import pytest
+
+            @pytest.mark.raises(match=r'Middle', match_mode='search')
+            def test_search():
+                raise RuntimeError('In The Middle Of The Road')
+
+            @pytest.mark.raises(match=r'In The', match_mode='fullmatch')
+            def test_fullmatch():
+                raise RuntimeError('In The Middle Of The Road')
+
+            @pytest.mark.raises(match=r'.*Road', match_mode='fullmatch', match_engine='linear')
+            def test_fullmatch_linear():
+                raise RuntimeError('In The Middle Of The Road')
+
+            @pytest.mark.raises(match=r'Middle', match_mode='find')
+            def test_invalid_mode():
+                raise RuntimeError('In The Middle Of The Road')
+        """,
+        [
+            '*::test_search PASSED*',
+            '*::test_fullmatch FAILED*',
+            '*::test_fullmatch_linear PASSED*',
+            '*::test_invalid_mode FAILED*',
+            '*ExpectedMessage: "In The" does not match raised message "In The Middle Of The Road" (match_mode="fullmatch")',
+            "PytestRaisesUsageError: @pytest.mark.raises: supplied `match_mode='find'` must be one of 'match', 'search', 'fullmatch'.",
+        ],
+        1
+    )
+
+def test_pytest_mark_raises_match_any(testdir):
+    _run_tests_test(testdir, """
+            import re
+            import pytest
+
+            @pytest.mark.raises(match_any=[r'refused', re.compile(r'RESET', re.IGNORECASE)], match_mode='search')
+            def test_match_any():
+                raise ConnectionError('connection reset by peer')
+
+            @pytest.mark.raises(match_any=['w{}'.format(index) for index in range(40)], match_mode='search')
+            def test_match_any_substrings():
+                raise ConnectionError('worker w17 died')
+
+            @pytest.mark.raises(match_any=[r'refused', r'timed out'], match_engine='linear')
+            def test_match_any_no_match():
+                raise ConnectionError('connection reset by peer')
+
+            @pytest.mark.raises(match_any=[r'refused'], match=r'reset')
+            def test_match_any_and_match():
+                raise ConnectionError('connection reset by peer')
+
+            @pytest.mark.raises(match_any=r'refused')
+            def test_match_any_string():
+                raise ConnectionError('connection refused')
+        """,
+        [
+            '*::test_match_any PASSED*',
+            '*::test_match_any_substrings PASSED*',
+            '*::test_match_any_no_match FAILED*',
+            '*::test_match_any_and_match FAILED*',
+            '*::test_match_any_string FAILED*',
+            '*ExpectedMessage: None of ?\'refused\', \'timed out\'? matches raised message "connection reset by peer"',
+            'PytestRaisesUsageError: @pytest.mark.raises: only one of `message`, `match` and `match_any` allowed.',
+            "PytestRaisesUsageError: @pytest.mark.raises: supplied `match_any='refused'` must be a non-empty list of patterns.",
+        ],
+        1
+    )
+
+def test_pytest_mark_raises_match_any_reports_pattern(testdir):
+    testdir.makepyfile("""
+        import pytest
+
+        @pytest.mark.raises(match_any=[r'refused', r'.*reset'])
+        def test_match_any():
+            raise ConnectionError('connection reset by peer')
+    """)
+    result = testdir.runpytest('-rP')
+    result.stdout.fnmatch_lines([
+        '*- pytest-raises -*',
+        "matched match_any pattern 1: '.*reset'",
+        '*1 passed*',
+    ])
+    assert result.ret == 0
+
+def _assert_linear_patterns_agree(candidates, mode, string, expected):
+    for index, pattern in enumerate(candidates):
+        compiled = re.compile(pattern)
+        single = LinearPattern(compiled.pattern, compiled.flags, mode)
+        assert (single.match(string) is not None) == (index in expected), (pattern, mode, string)
+
+def test_any_pattern_agrees_with_re():
+    patterns = [
+        r'abc', r'a', r'(a)\1', r'c$', re.compile(r'B', re.IGNORECASE), r'\bbar', r'$', re.compile(r'^foo', re.MULTILINE), r'^b',
+    ]
+    strings = ('abc', 'a', 'aa', 'xb', 'xc', 'zzz', 'foo bar', 'foobar', 'ab', 'x\nfoo', '')
+    for engine, candidates in (('re', patterns), ('linear', patterns[:2] + patterns[3:])):
+        for mode in ('match', 'search', 'fullmatch'):
+            combined = AnyPattern(candidates, mode=mode, engine=engine)
+            for string in strings:
+                expected = [index for index, pattern in enumerate(candidates) if getattr(re.compile(pattern), mode)(string)]
+                index = combined.match_index(string)
+                assert (index is None) == (not expected), (engine, mode, string)
+                assert index is None or index in expected
+                if engine == 'linear':
+                    _assert_linear_patterns_agree(candidates, mode, string, expected)
+
+def test_regex_cache_is_bounded():
+    cache = _RegexCache(maxsize=2)
+    first = cache.compile('a')
+    assert cache.compile('a') is first
+    cache.compile('b')
+    cache.compile('c')
+    assert len(cache) == 2
+    cache.compile('a')  # evicted by 'c', compiled again
+    assert (cache.hits, cache.misses) == (1, 4)
+
+def test_pytest_mark_raises_long_message_divergence(testdir):
+    _run_tests_test(testdir, """
+            import pytest
+
+            MESSAGE = 'GET /users failed: connection reset by peer while reading the response ' + 'x' * 1000
+
+            @pytest.mark.raises(message='connection refused')
+            def test_message():
+                raise RuntimeError(MESSAGE)
+
+            @pytest.mark.raises(match=r'GET /users failed: connection refused')
+            def test_match():
+                raise RuntimeError(MESSAGE)
+        """,
+        [
+            '*::test_message FAILED*',
+            '*::test_match FAILED*',
+            # pylint: disable=line-too-long
+            '*ExpectedMessage: "connection refused" not in "GET /users failed: connection reset by peer while reading the response x..." (raised message of 1071 characters; the longest part found, "connection re", ends at character 32, followed by "set by peer while reading the response x..." instead of "fused")',
+            '*ExpectedMessage: "GET /users failed: connection refused" does not match raised message "GET /users failed: connection reset by peer while reading the response x..." (raised message of 1071 characters; the longest matching part of the pattern matches up to character 32, followed by "set by peer while reading the response x...")',
+        ],
+        1
+    )
+
+def test_pytest_mark_raises_max_message_length(testdir):
+    testdir.makeini("""
+        [pytest]
+        raises_max_message_length = 20
+    """)
+    _run_tests_test(testdir, """
+            import pytest
+
+            @pytest.mark.raises(message='head')
+            def test_message_in_head():
+                raise RuntimeError('head' + 'x' * 100)
+
+            @pytest.mark.raises(message='tail')
+            def test_message_in_tail():
+                raise RuntimeError('head' + 'x' * 100 + 'tail')
+        """,
+        [
+            '*::test_message_in_head PASSED*',
+            '*::test_message_in_tail FAILED*',
+            '*ExpectedMessage: "tail" not in "headxxxxxx...[[]88 characters truncated]...xxxxxxtail"',
+        ],
+        1
+    )
+
+def test_pytest_mark_raises_invalid_max_message_length(testdir):
+    testdir.makeini("""
+        [pytest]
+        raises_max_message_length = lots
+    """)
+    testdir.makepyfile("""
+        def test_nothing():
+            pass
+    """)
+    result = testdir.runpytest()
+    result.stderr.fnmatch_lines([
+        "*raises_max_message_length: expected a non-negative integer, got 'lots'.",
+    ])
+    assert result.ret != 0
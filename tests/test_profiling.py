@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+import json
+
+import pytest
+
+
+####################################################################################################
+# --raises-profile                                                                                 #
+####################################################################################################
+def test_raises_profile(testdir):
+    testdir.makepyfile("""
+        import pytest
+
+        class SlowStrError(Exception):
+            def __str__(self):
+                return 'slow'
+
+        @pytest.mark.raises(exception=SlowStrError, match='slow')
+        def test_profiled():
+            raise SlowStrError()
+
+        def test_unmarked():
+            pass
+    """)
+    result = testdir.runpytest('--raises-profile-json', 'profile.json')
+    result.stdout.fnmatch_lines([
+        '*= pytest-raises: slowest 10 validations =*',
+        '*total*lookup*str*match*failure*phase*test',
+        '*s *s *s *s *s call   test_raises_profile.py::test_profiled',
+        '*= pytest-raises: slowest 10 exception __str__ =*',
+        '*s *s        1  test_raises_profile.SlowStrError',
+        'pytest-raises: profile written to profile.json',
+    ])
+    result.stdout.no_fnmatch_line('*test_unmarked')
+    assert result.ret == 0
+
+    profile = json.loads(testdir.tmpdir.join('profile.json').read())
+    assert [(validation['nodeid'], validation['phase']) for validation in profile['validations']] == [
+        ('test_raises_profile.py::test_profiled', 'call'),
+    ]
+    assert [(stats['type'], stats['calls']) for stats in profile['exception_str']] == [
+        ('test_raises_profile.SlowStrError', 1),
+    ]
+
+def test_raises_profile_attributes_only(testdir):
+    testdir.makepyfile("""
+        import pytest
+
+        class NoStrError(Exception):
+            code = 3
+
+            def __str__(self):
+                raise AssertionError('the message must not be computed')
+
+        @pytest.mark.raises(exception=NoStrError, attrs={'code': 3})
+        def test_attributes():
+            raise NoStrError()
+    """)
+    result = testdir.runpytest('--raises-profile', '--raises-report=report.jsonl')
+    result.stdout.no_fnmatch_line('*test_raises_profile_attributes_only.NoStrError')
+    assert result.ret == 0
+
+    record = json.loads(testdir.tmpdir.join('report.jsonl').read())
+    assert (record['result'], record['message']) == ('matched', None)
+
+def test_raises_profile_xdist(testdir):
+    pytest.importorskip('xdist')
+    testdir.makepyfile("""
+        import pytest
+
+        class SlowStrError(Exception):
+            def __str__(self):
+                return 'slow'
+
+        @pytest.mark.parametrize('index', range(4))
+        @pytest.mark.raises(exception=SlowStrError, match='slow')
+        def test_profiled(index):
+            raise SlowStrError()
+    """)
+    result = testdir.runpytest('-n', '2', '--raises-profile-json', 'profile.json')
+    result.stdout.fnmatch_lines([
+        '*= pytest-raises: slowest 10 validations =*',
+        '*s *s *s *s *s call   test_raises_profile_xdist.py::test_profiled?[0-3]?',
+        '*s *s        4  test_raises_profile_xdist.SlowStrError',
+    ])
+    assert result.ret == 0
+
+    profile = json.loads(testdir.tmpdir.join('profile.json').read())
+    assert sorted(validation['nodeid'] for validation in profile['validations']) == [
+        'test_raises_profile_xdist.py::test_profiled[{}]'.format(index) for index in range(4)
+    ]
+    assert [(stats['type'], stats['calls']) for stats in profile['exception_str']] == [
+        ('test_raises_profile_xdist.SlowStrError', 4),
+    ]
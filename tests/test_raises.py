@@ -1,12 +1,6 @@
 # -*- coding: utf-8 -*-
+from helpers import _run_tests_test
 
-def _run_tests_test(testdir, code, expected_output, expcted_return_code, conftest=None):
-    if conftest:
-        testdir.makeconftest(conftest)
-    testdir.makepyfile(code)
-    result = testdir.runpytest('-v')
-    result.stdout.fnmatch_lines(expected_output)
-    assert result.ret == expcted_return_code
 
 ####################################################################################################
 # @pytest.mark.raises tests                                                                        #
@@ -101,6 +95,21 @@ def test_pytest_mark_raises_unexpected_exception(testdir):
         1
     )
 
+def test_pytest_mark_raises_no_exception_hides_plugin_traceback(testdir):
+    testdir.makepyfile("""
+            import pytest
+
+            @pytest.mark.raises(exception=KeyError)
+            def test_pytest_mark_raises_no_exception_hides_plugin_traceback():
+                pass
+        """)
+    result = testdir.runpytest('-v')
+    result.stdout.fnmatch_lines([
+        "E   *ExpectedException: Expected exception <class 'KeyError'>, but it did not raise",
+    ])
+    result.stdout.no_fnmatch_line('*pytest_raises.py:*')
+    assert result.ret == 1
+
 def test_pytest_mark_raises_not_an_exception(testdir):
     _run_tests_test(testdir, """
             import pytest
@@ -131,10 +140,93 @@ def test_pytest_mark_raises_not_an_exception_class(testdir):
         """,
         [
             '*::test_pytest_mark_raises_not_an_exception_class FAILED*',
-            'PytestRaisesUsageError: @pytest.mark.raises: supplied `exception` argument must be a Class, e.g., `exception=RuntimeError`.'
+            # pylint: disable=line-too-long
+            'PytestRaisesUsageError: @pytest.mark.raises: supplied `exception` argument must be a Class or an iterable of Classes, e.g., `exception=RuntimeError`.'
+        ],
+        1
+    )
+
+def test_pytest_mark_raises_exception_tuple(testdir):
+    _run_tests_test(testdir, """
+            import pytest
+
+            @pytest.mark.raises(exception=(KeyError, ValueError))
+            def test_tuple_first():
+                raise KeyError('key')
+
+            @pytest.mark.raises(exception=[KeyError, ValueError])
+            def test_list_second():
+                raise ValueError('value')
+
+            @pytest.mark.raises(exception=(KeyError, ValueError))
+            def test_tuple_unexpected():
+                raise RuntimeError('runtime')
+        """,
+        [
+            '*::test_tuple_first PASSED*',
+            '*::test_list_second PASSED*',
+            '*::test_tuple_unexpected FAILED*',
+            # pylint: disable=line-too-long
+            "*ExpectedException: Expected exception of type (<class 'KeyError'>, <class 'ValueError'>), but got exception of type <class 'RuntimeError'> with message: runtime",
+        ],
+        1
+    )
+
+def test_pytest_mark_raises_exclude(testdir):
+    _run_tests_test(testdir, """
+            import pytest
+
+            @pytest.mark.raises(exception=OSError, exclude=FileNotFoundError)
+            def test_included():
+                raise PermissionError('denied')
+
+            @pytest.mark.parametrize('repeat', range(3))
+            @pytest.mark.raises(exception=OSError, exclude=[FileNotFoundError, IsADirectoryError])
+            def test_excluded(repeat):
+                raise FileNotFoundError('missing')
+        """,
+        [
+            '*::test_included PASSED*',
+            '*::test_excluded?0? FAILED*',
+            '*::test_excluded?1? FAILED*',
+            '*::test_excluded?2? FAILED*',
+            # pylint: disable=line-too-long
+            "*ExpectedException: Expected exception of type <class 'OSError'> excluding (<class 'FileNotFoundError'>, <class 'IsADirectoryError'>), but got exception of type <class 'FileNotFoundError'> with message: missing",
+        ],
+        1
+    )
+
+def test_pytest_mark_raises_invalid_exclude(testdir):
+    _run_tests_test(testdir, """
+            import pytest
+
+            @pytest.mark.raises(exception=OSError, exclude=(FileNotFoundError, 'IsADirectoryError'))
+            def test_pytest_mark_raises_invalid_exclude():
+                raise OSError()
+        """,
+        [
+            '*::test_pytest_mark_raises_invalid_exclude FAILED*',
+            # pylint: disable=line-too-long
+            'PytestRaisesUsageError: @pytest.mark.raises: supplied `exclude` argument must be a Class or an iterable of Classes, e.g., `exclude=RuntimeError`.'
+        ],
+        1
+    )
+
+def test_pytest_mark_raises_usage_error_skips_test_body(testdir):
+    _run_tests_test(testdir, """
+            import pytest
+
+            @pytest.mark.raises(message='some message', match=r'stuff')
+            def test_pytest_mark_raises_usage_error_skips_test_body():
+                open('body_ran', 'w').close()
+        """,
+        [
+            '*::test_pytest_mark_raises_usage_error_skips_test_body FAILED*',
+            'PytestRaisesUsageError: @pytest.mark.raises: only `message="some message"` *OR* `match="stuff"` allowed, not both.'
         ],
         1
     )
+    assert not testdir.tmpdir.join('body_ran').check()
 
 def test_pytest_mark_raises_expected_message(testdir):
     _run_tests_test(testdir, """
@@ -194,6 +286,53 @@ def test_pytest_mark_raises_expected_match_with_flags(testdir):
         0
     )
 
+def test_pytest_mark_raises_expected_match_compiled(testdir):
+    _run_tests_test(testdir, """
+            import pytest
+            import re
+
+            @pytest.mark.raises(match=re.compile(r'.*middle.*road.*', re.IGNORECASE))
+            def test_pytest_mark_raises_expected_match_compiled():
+                raise RuntimeError('In The Middle Of The Road')
+        """,
+        [
+            '*::test_pytest_mark_raises_expected_match_compiled PASSED*',
+        ],
+        0
+    )
+
+def test_pytest_mark_raises_compiled_match_with_flags_fails(testdir):
+    _run_tests_test(testdir, """
+            import pytest
+            import re
+
+            @pytest.mark.raises(match=re.compile(r'middle'), match_flags=re.IGNORECASE)
+            def test_pytest_mark_raises_compiled_match_with_flags_fails():
+                raise RuntimeError('middle')
+        """,
+        [
+            '*::test_pytest_mark_raises_compiled_match_with_flags_fails FAILED*',
+            # pylint: disable=line-too-long
+            "PytestRaisesUsageError: @pytest.mark.raises: supplied `match=re.compile('middle')` with `match_flags=re.IGNORECASE` could not be compiled: *"
+        ],
+        1
+    )
+
+def test_pytest_mark_raises_invalid_match(testdir):
+    _run_tests_test(testdir, """
+            import pytest
+
+            @pytest.mark.raises(match=r'(unbalanced')
+            def test_pytest_mark_raises_invalid_match():
+                raise RuntimeError('(unbalanced')
+        """,
+        [
+            '*::test_pytest_mark_raises_invalid_match FAILED*',
+            "PytestRaisesUsageError: @pytest.mark.raises: supplied `match='(unbalanced'` with `match_flags=0` could not be compiled: *"
+        ],
+        1
+    )
+
 def test_pytest_mark_raises_unexpected_match(testdir):
     _run_tests_test(testdir, """
             import pytest
@@ -224,6 +363,75 @@ def test_pytest_mark_raises_message_and_match_fails(testdir):
         1
     )
 
+def test_pytest_mark_raises_attrs_and_args(testdir):
+    _run_tests_test(testdir, """
+            import errno
+            import pytest
+
+            class UnprintableError(Exception):
+                def __init__(self, code):
+                    super(UnprintableError, self).__init__(code)
+                    self.code = code
+
+                def __str__(self):
+                    raise AssertionError('str() should not be called')
+
+            @pytest.mark.raises(exception=OSError, attrs={'errno': errno.ENOENT})
+            def test_attrs():
+                raise OSError(errno.ENOENT, 'No such file')
+
+            @pytest.mark.raises(exception=OSError, args=(errno.ENOENT, 'No such file'))
+            def test_args():
+                raise OSError(errno.ENOENT, 'No such file')
+
+            @pytest.mark.raises(exception=UnprintableError, attrs={'code': 3}, args=(3,))
+            def test_no_str():
+                raise UnprintableError(3)
+
+            @pytest.mark.raises(exception=OSError, attrs={'errno': errno.ENOENT})
+            def test_attrs_mismatch():
+                raise OSError(errno.EACCES, 'Permission denied')
+
+            @pytest.mark.raises(exception=ValueError, attrs={'errno': errno.ENOENT})
+            def test_attrs_missing():
+                raise ValueError('no errno')
+
+            @pytest.mark.raises(exception=OSError, args=(errno.ENOENT,))
+            def test_args_mismatch():
+                raise OSError(errno.ENOENT, 'No such file')
+
+            @pytest.mark.raises(exception=OSError, attrs={'errno': errno.ENOENT}, message='Permission')
+            def test_attrs_then_message():
+                raise OSError(errno.ENOENT, 'No such file')
+
+            @pytest.mark.raises(attrs=['errno'])
+            def test_attrs_not_a_mapping():
+                raise OSError(errno.ENOENT, 'No such file')
+
+            @pytest.mark.raises(args=2)
+            def test_args_not_a_tuple():
+                raise OSError(errno.ENOENT, 'No such file')
+        """,
+        [
+            '*::test_attrs PASSED*',
+            '*::test_args PASSED*',
+            '*::test_no_str PASSED*',
+            '*::test_attrs_mismatch FAILED*',
+            '*::test_attrs_missing FAILED*',
+            '*::test_args_mismatch FAILED*',
+            '*::test_attrs_then_message FAILED*',
+            '*::test_attrs_not_a_mapping FAILED*',
+            '*::test_args_not_a_tuple FAILED*',
+            '*ExpectedAttributes: Expected `errno=2`, but got `errno=13`',
+            '*ExpectedAttributes: Expected `errno=2`, but the exception has no `errno` attribute',
+            "*ExpectedAttributes: Expected `args=(2,)`, but got `args=(2, 'No such file')`",
+            '*ExpectedMessage: "Permission" not in "?Errno 2? No such file"',
+            "*PytestRaisesUsageError: @pytest.mark.raises: supplied `attrs=?'errno'?` must be a mapping of attribute names to values.",
+            '*PytestRaisesUsageError: @pytest.mark.raises: supplied `args=2` must be a tuple (or list).',
+        ],
+        1
+    )
+
 def test_pytest_mark_raises_parametrize(testdir):
     _run_tests_test(testdir, """
             import pytest
@@ -317,6 +525,40 @@ def test_pytest_raises_parametrize_demo(testdir):
         0
     )
 
+def test_pytest_mark_raises_added_at_run_time(testdir):
+    _run_tests_test(testdir, """
+            import pytest
+
+            @pytest.fixture
+            def expect_key_error(request):
+                request.node.add_marker(pytest.mark.raises(exception=KeyError, message='missing'))
+
+            @pytest.fixture
+            def expect_broken_setup(request):
+                request.node.add_marker(pytest.mark.setup_raises(exception=OSError))
+
+            @pytest.fixture
+            def broken():
+                raise OSError('broken')
+
+            def test_added_raises(expect_key_error):
+                raise KeyError('missing')
+
+            def test_added_raises_unexpected_message(expect_key_error):
+                raise KeyError('other')
+
+            def test_added_setup_raises(expect_broken_setup, broken):
+                pass
+        """,
+        [
+            '*::test_added_raises PASSED*',
+            '*::test_added_raises_unexpected_message FAILED*',
+            '*::test_added_setup_raises PASSED*',
+            '*ExpectedMessage: "missing" not in "*other*"*',
+        ],
+        1
+    )
+
 ####################################################################################################
 # @pytest.mark.setup_raises tests                                                                  #
 ####################################################################################################
@@ -389,6 +631,30 @@ def test_pytest_mark_setup_raises_no_exception(testdir):
         1
     )
 
+def test_pytest_mark_setup_raises_failure_skips_test_body(testdir):
+    _run_tests_test(testdir, """
+            import pytest
+
+            @pytest.mark.setup_raises(exception=ValueError)
+            def test_pytest_mark_setup_raises_failure_skips_test_body():
+                open('body_ran', 'w').close()
+        """,
+        [
+            '*::test_pytest_mark_setup_raises_failure_skips_test_body FAILED*',
+            "*ExpectedException: Expected exception of type <class 'ValueError'>, but got exception of type <class 'RuntimeError'>*",
+            '*= 1 failed in *',
+        ],
+        1,
+        conftest="""
+            def pytest_runtest_setup(item):
+                raise RuntimeError('the message')
+
+            def pytest_runtest_teardown(item):
+                assert [marker.name for marker in item.iter_markers()] == ['setup_raises']
+        """
+    )
+    assert not testdir.tmpdir.join('body_ran').check()
+
 def test_pytest_mark_setup_raises_unexpected_exception(testdir):
     _run_tests_test(testdir, """
             import pytest
@@ -446,7 +712,8 @@ def test_pytest_mark_setup_raises_not_an_exception_class(testdir):
         [
             '*::test_pytest_mark_setup_raises_not_an_exception_class FAILED*',
             # pylint: disable=line-too-long
-            'PytestRaisesUsageError: @pytest.mark.setup_raises: supplied `exception` argument must be a Class, e.g., `exception=RuntimeError`.'
+            # pylint: disable=line-too-long
+            'PytestRaisesUsageError: @pytest.mark.setup_raises: supplied `exception` argument must be a Class or an iterable of Classes, e.g., `exception=RuntimeError`.'
         ],
         1
     )
@@ -584,6 +851,24 @@ def test_pytest_mark_setup_raises_message_and_match_fails(testdir):
         1
     )
 
+def test_pytest_mark_setup_raises_failing_fixture(testdir):
+    _run_tests_test(testdir, """
+            import pytest
+
+            @pytest.fixture
+            def connection():
+                raise ConnectionRefusedError('refused')
+
+            @pytest.mark.setup_raises(exception=ConnectionRefusedError)
+            def test_failing_fixture(connection):
+                open('body_ran', 'w').close()
+        """,
+        [
+            '*::test_failing_fixture PASSED*',
+        ],
+        0
+    )
+    assert not testdir.tmpdir.join('body_ran').check()
 
 def test_pytest_mark_setup_raises_demo(testdir):
     _run_tests_test(testdir, """
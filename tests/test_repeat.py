@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+####################################################################################################
+# repeat=N                                                                                         #
+####################################################################################################
+def test_pytest_mark_raises_repeat(testdir):
+    testdir.makepyfile("""
+        import asyncio
+        import itertools
+        import pytest
+
+        CALLS = itertools.count()
+        ASYNC_CALLS = itertools.count()
+
+        @pytest.mark.raises(exception=KeyError, match=r"'race'", repeat=5)
+        def test_always_raises():
+            raise KeyError('race')
+
+        @pytest.mark.raises(exception=KeyError, repeat=4)
+        def test_sometimes_raises():
+            if next(CALLS) % 2:
+                raise KeyError('race')
+
+        @pytest.mark.raises(exception=KeyError, repeat=3)
+        async def test_coroutine():
+            await asyncio.sleep(0)
+            next(ASYNC_CALLS)
+            raise KeyError('race')
+
+        def test_coroutine_attempts():
+            assert next(ASYNC_CALLS) == 3
+
+        @pytest.mark.raises(repeat=0)
+        def test_invalid_repeat():
+            raise KeyError('race')
+
+        @pytest.mark.setup_raises(repeat=2)
+        def test_setup_repeat():
+            pass
+    """)
+    result = testdir.runpytest('-v', '-rA')
+    result.stdout.fnmatch_lines([
+        '*::test_always_raises PASSED*',
+        '*::test_sometimes_raises FAILED*',
+        '*::test_coroutine PASSED*',
+        '*::test_coroutine_attempts PASSED*',
+        '*::test_invalid_repeat FAILED*',
+        '*::test_setup_repeat FAILED*',
+        # pylint: disable=line-too-long
+        "*ExpectedException: Attempt 1 of 4: Expected exception <class 'KeyError'>, but it did not raise (2 of 4 attempts raised as expected)",
+        '2 of 4 attempts raised as expected in *s (min *s, median *s, max *s)',
+        "PytestRaisesUsageError: @pytest.mark.raises: supplied `repeat=0` must be a positive integer.",
+        'PytestRaisesUsageError: @pytest.mark.setup_raises: `repeat` is only supported by `@pytest.mark.raises`.',
+        '*- pytest-raises repeat -*',
+        '5 of 5 attempts raised as expected in *s (min *s, median *s, max *s)',
+    ])
+    assert result.ret == 1
+
+
+def test_repeat_runner_on_demand(testdir):
+    testdir.makepyfile("""
+        import pytest
+
+        @pytest.mark.raises(exception=KeyError)
+        def test_once():
+            raise KeyError('race')
+
+        def test_no_runner(request):
+            assert request.config.pluginmanager.get_plugin('raises_repeat') is None
+    """)
+    result = testdir.runpytest('-v')
+    result.stdout.fnmatch_lines([
+        '*::test_once PASSED*',
+        '*::test_no_runner PASSED*',
+    ])
+    assert result.ret == 0
+
+
+def test_repeat_checks_each_attempt_once(testdir):
+    testdir.makepyfile("""
+        import itertools
+        import pytest
+
+        STR_CALLS = itertools.count()
+
+        class CountingError(Exception):
+            def __str__(self):
+                next(STR_CALLS)
+                return 'race'
+
+        @pytest.mark.raises(exception=CountingError, match='race', chained=True, repeat=3)
+        def test_chained():
+            try:
+                raise ValueError('cause')
+            except ValueError as exc:
+                raise CountingError() from exc
+
+        def test_str_calls():
+            assert next(STR_CALLS) == 3
+    """)
+    result = testdir.runpytest('-v', '-rP')
+    result.stdout.fnmatch_lines([
+        '*::test_chained PASSED*',
+        '*::test_str_calls PASSED*',
+        '*- pytest-raises -*',
+        'matched exception chain link (raised exception): CountingError()',
+    ])
+    assert result.ret == 0
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+import json
+
+
+####################################################################################################
+# pytest-xdist support                                                                             #
+####################################################################################################
+_SERIALIZATION_CONFTEST = """
+    import json
+
+    _CONFIG = []
+
+    def pytest_configure(config):
+        _CONFIG.append(config)
+
+    def pytest_runtest_logreport(report):
+        # Round trip the report as `pytest-xdist` does between workers and the controller.
+        config = _CONFIG[0]
+        data = json.loads(json.dumps(config.hook.pytest_report_to_serializable(config=config, report=report)))
+        report = config.hook.pytest_report_from_serializable(config=config, data=data)
+        if report.when == 'call':
+            print('{} {}'.format(report.nodeid, json.dumps(getattr(report, 'raises_failure', {}), sort_keys=True)))
+"""
+
+def test_raises_failure_survives_report_serialization(testdir):
+    testdir.makeconftest(_SERIALIZATION_CONFTEST)
+    testdir.makepyfile("""
+        import pytest
+
+        @pytest.mark.raises(exception=ValueError, message='expected')
+        def test_passing():
+            raise ValueError('expected')
+
+        @pytest.mark.raises(exception=ValueError, message='expected')
+        def test_failing():
+            raise ValueError('other')
+
+        @pytest.fixture
+        def broken():
+            raise KeyError('broken')
+
+        @pytest.mark.setup_raises(exception=ValueError)
+        def test_setup_failing(broken):
+            pass
+    """)
+    result = testdir.runpytest('-s')
+    # pylint: disable=line-too-long
+    result.stdout.fnmatch_lines([
+        '*::test_passing {}',
+        '*::test_failing {"exception": "ExpectedMessage", "marker": "raises", "message": "\\"expected\\" not in \\"other\\""}',
+        '*::test_setup_failing {"exception": "ExpectedException", "marker": "setup_raises", "message": "Expected exception of type <class *ValueError*>, but got exception of type <class *KeyError*> with message: *broken*"}',
+    ])
+    assert result.ret == 1
+
+####################################################################################################
+# --raises-report                                                                                  #
+####################################################################################################
+def test_raises_report(testdir):
+    testdir.makepyfile("""
+        import pytest
+
+        @pytest.mark.raises(exception=ValueError, match=r'bad')
+        def test_matched():
+            raise ValueError('bad value')
+
+        @pytest.mark.raises(exception=(KeyError, ValueError), message='expected')
+        def test_mismatch():
+            raise KeyError('x' * 1000)
+
+        @pytest.mark.raises(exception=ValueError, message='y' * 1000)
+        def test_long_failure():
+            raise ValueError('x')
+
+        @pytest.fixture
+        def broken():
+            raise OSError('broken')
+
+        @pytest.mark.setup_raises(exception=OSError)
+        def test_setup(broken):
+            pass
+
+        def test_unmarked():
+            pass
+    """)
+    result = testdir.runpytest('--raises-report=report.jsonl', '--junitxml=junit.xml')
+    assert result.ret == 1
+
+    with open(str(testdir.tmpdir.join('report.jsonl')), encoding='utf-8') as report:
+        records = {record['nodeid'].split('::')[-1]: record for record in map(json.loads, report)}
+    assert sorted(records) == ['test_long_failure', 'test_matched', 'test_mismatch', 'test_setup']
+
+    matched = records['test_matched']
+    assert matched['phase'] == 'call'
+    assert matched['expected'] == {
+        'exception': ['builtins.ValueError'], 'exclude': [], 'message': None, 'match': 'bad', 'match_any': None, 'match_mode': 'match',
+        'attrs': {}, 'args': None, 'group': False, 'chained': False,
+    }
+    assert (matched['raised'], matched['message'], matched['result'], matched['failure']) == (
+        'builtins.ValueError', 'bad value', 'matched', None
+    )
+    assert matched['duration'] >= 0
+
+    mismatch = records['test_mismatch']
+    assert mismatch['expected']['exception'] == ['builtins.KeyError', 'builtins.ValueError']
+    assert mismatch['result'] == 'ExpectedMessage'
+    assert mismatch['failure'].startswith('"expected" not in "\'xxx')
+    assert '[502 characters truncated]' in mismatch['message']
+
+    long_failure = records['test_long_failure']
+    assert long_failure['result'] == 'ExpectedMessage'
+    assert '[513 characters truncated]' in long_failure['failure']
+
+    setup = records['test_setup']
+    assert (setup['phase'], setup['raised'], setup['result']) == ('setup', 'builtins.OSError', 'matched')
+
+    junit = testdir.tmpdir.join('junit.xml').read()
+    assert '<property name="raises_result" value="ExpectedMessage" />' in junit
+    assert '<property name="raises_raised" value="builtins.ValueError" />' in junit
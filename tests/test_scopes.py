@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+from helpers import _run_tests_test
+
+
+####################################################################################################
+# setup_raises(scope=...)                                                                          #
+####################################################################################################
+def test_pytest_mark_setup_raises_scope(testdir):
+    _run_tests_test(testdir, """
+            import pytest
+
+            class ConnectionFailed(Exception):
+                renders = 0
+
+                def __str__(self):
+                    ConnectionFailed.renders += 1
+                    return 'connection failed'
+
+            @pytest.fixture(scope='module')
+            def connection():
+                raise ConnectionFailed()
+
+            @pytest.mark.parametrize('query', range(3))
+            @pytest.mark.setup_raises(exception=ConnectionFailed, match=r'connection', scope='module')
+            def test_shared(connection, query):
+                pass
+
+            class TestUnexpected(object):
+                @pytest.fixture(scope='class')
+                def session(self):
+                    raise RuntimeError('expired')
+
+                @pytest.mark.parametrize('query', range(2))
+                @pytest.mark.setup_raises(exception=ConnectionFailed, scope='class')
+                def test_shared_failure(self, session, query):
+                    pass
+
+            def test_rendered_once():
+                assert ConnectionFailed.renders == 1
+
+            @pytest.mark.setup_raises(scope='session')
+            def test_invalid_scope():
+                pass
+
+            @pytest.mark.raises(scope='module')
+            def test_raises_scope():
+                pass
+        """,
+        [
+            '*::test_shared?0? PASSED*',
+            '*::test_shared?1? PASSED*',
+            '*::test_shared?2? PASSED*',
+            '*::TestUnexpected::test_shared_failure?0? FAILED*',
+            '*::TestUnexpected::test_shared_failure?1? FAILED*',
+            '*::test_rendered_once PASSED*',
+            '*::test_invalid_scope FAILED*',
+            '*::test_raises_scope FAILED*',
+            # pylint: disable=line-too-long
+            "*ExpectedException: Expected exception of type <class '*ConnectionFailed'>, but got exception of type <class 'RuntimeError'> with message: expired",
+            "PytestRaisesUsageError: @pytest.mark.setup_raises: supplied `scope='session'` must be one of 'function', 'class', 'module'.",
+            'PytestRaisesUsageError: @pytest.mark.raises: `scope` is only supported by `@pytest.mark.setup_raises`.',
+        ],
+        1
+    )
+
+def test_setup_raises_plugins_on_demand(testdir):
+    _run_tests_test(testdir, """
+            import pytest
+
+            @pytest.fixture
+            def broken():
+                raise RuntimeError('broken')
+
+            @pytest.mark.setup_raises(exception=RuntimeError)
+            def test_setup_raises(broken):
+                pass
+
+            def test_plugins(request):
+                plugins = request.config.pluginmanager
+                assert plugins.get_plugin('raises_setup_raised') is not None
+                assert plugins.get_plugin('raises_setup_verdicts') is None
+        """,
+        [
+            '*::test_setup_raises PASSED*',
+            '*::test_plugins PASSED*',
+        ],
+        0
+    )
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+from helpers import _run_tests_test
+
+
+####################################################################################################
+# @pytest.mark.raises_table tests                                                                  #
+####################################################################################################
+def test_pytest_mark_raises_table(testdir):
+    _run_tests_test(testdir, """
+            import pytest
+
+            @pytest.mark.parametrize('value', [
+                pytest.param('key', id='key'),
+                pytest.param('match', id='match'),
+                pytest.param('mismatch', id='mismatch'),
+                pytest.param('none', id='none'),
+                pytest.param('unlisted', id='unlisted'),
+                pytest.param('overridden', id='overridden', marks=pytest.mark.raises(exception=TypeError)),
+            ])
+            @pytest.mark.raises_table({
+                'key': KeyError,
+                'match': dict(exception=ValueError, match=r'bad value'),
+                'mismatch': dict(exception=ValueError, match=r'bad value'),
+                'none': None,
+                'overridden': KeyError,
+            })
+            def test_table(value):
+                if value == 'key':
+                    raise KeyError(value)
+                if value == 'match':
+                    raise ValueError('bad value')
+                if value == 'mismatch':
+                    raise ValueError('other')
+                if value == 'overridden':
+                    raise TypeError(value)
+        """,
+        [
+            '*::test_table?key? PASSED*',
+            '*::test_table?match? PASSED*',
+            '*::test_table?mismatch? FAILED*',
+            '*::test_table?none? PASSED*',
+            '*::test_table?unlisted? PASSED*',
+            '*::test_table?overridden? PASSED*',
+            '*ExpectedMessage: "bad value" does not match raised message "other"',
+        ],
+        1
+    )
+
+def test_pytest_mark_raises_table_callable(testdir):
+    _run_tests_test(testdir, """
+            import pytest
+
+            CALLS = []
+
+            def expectations(param_id):
+                CALLS.append(param_id)
+                return KeyError if param_id.startswith('1') else None
+
+            @pytest.mark.parametrize('repeat', range(2))
+            @pytest.mark.parametrize('value', [0, 1])
+            @pytest.mark.raises_table(table=expectations)
+            def test_table(value, repeat):
+                if value:
+                    raise KeyError(value)
+
+            def test_table_called_once_per_param_id():
+                assert sorted(CALLS) == ['0-0', '0-1', '1-0', '1-1']
+        """,
+        [
+            '*::test_table?0-0? PASSED*',
+            '*::test_table?0-1? PASSED*',
+            '*::test_table?1-0? PASSED*',
+            '*::test_table?1-1? PASSED*',
+            '*::test_table_called_once_per_param_id PASSED*',
+        ],
+        0
+    )
+
+def test_pytest_mark_raises_table_usage_errors(testdir):
+    _run_tests_test(testdir, """
+            import pytest
+
+            @pytest.mark.parametrize('value', [0, 1])
+            @pytest.mark.raises_table({'0': 'KeyError'})
+            def test_bad_entry(value):
+                pass
+
+            @pytest.mark.parametrize('value', [0])
+            @pytest.mark.raises_table([KeyError])
+            def test_bad_table(value):
+                pass
+        """,
+        [
+            '*::test_bad_entry?0? FAILED*',
+            '*::test_bad_entry?1? PASSED*',
+            '*::test_bad_table?0? FAILED*',
+            # pylint: disable=line-too-long
+            'PytestRaisesUsageError: @pytest.mark.raises_table?0?: supplied `exception` argument must be a Class or an iterable of Classes, e.g., `exception=RuntimeError`.',
+            "PytestRaisesUsageError: @pytest.mark.raises_table: expected a single mapping `{param_id: expectation}` or callable *",
+        ],
+        1
+    )
+
+def test_pytest_mark_raises_table_closest_marker(testdir):
+    _run_tests_test(testdir, """
+            import pytest
+
+            pytestmark = pytest.mark.raises(exception=KeyError)
+
+            @pytest.mark.parametrize('value', [0, 1])
+            @pytest.mark.raises_table({'1': ValueError})
+            def test_table(value):
+                if value:
+                    raise ValueError(value)
+
+            def test_module_raises():
+                raise KeyError()
+        """,
+        [
+            '*::test_table?0? PASSED*',
+            '*::test_table?1? PASSED*',
+            '*::test_module_raises PASSED*',
+        ],
+        0
+    )
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+from helpers import _run_tests_test
+
+
+####################################################################################################
+# @pytest.mark.warns tests                                                                         #
+####################################################################################################
+def test_pytest_mark_warns(testdir):
+    _run_tests_test(testdir, """
+            import warnings
+            import pytest
+
+            def emit(count):
+                for index in range(count):
+                    warnings.warn('call {} is deprecated'.format(index), DeprecationWarning)
+
+            @pytest.fixture
+            def deprecated_fixture():
+                warnings.warn('old fixture', DeprecationWarning)
+
+            @pytest.mark.warns(category=DeprecationWarning, match=r'call \\d+ is deprecated')
+            def test_warns():
+                emit(10000)
+
+            @pytest.mark.warns(category=(UserWarning, DeprecationWarning), match='call 3', match_mode='search')
+            def test_warns_search():
+                emit(5)
+
+            @pytest.mark.setup_warns(category=DeprecationWarning, match='old')
+            def test_setup_warns(deprecated_fixture):
+                pass
+
+            @pytest.mark.warns(category=DeprecationWarning)
+            @pytest.mark.raises(exception=ValueError)
+            def test_warns_and_raises():
+                emit(1)
+                raise ValueError('after the warning')
+
+            @pytest.mark.warns(category=DeprecationWarning)
+            def test_no_warning():
+                pass
+
+            @pytest.mark.warns(category=UserWarning, match='call')
+            def test_wrong_category():
+                emit(12)
+
+            @pytest.mark.setup_warns(category=DeprecationWarning, match='new')
+            def test_setup_no_match(deprecated_fixture):
+                pass
+
+            @pytest.mark.warns(category=DeprecationWarning)
+            def test_raises_instead():
+                raise RuntimeError('no warning')
+
+            @pytest.mark.warns(category=ValueError)
+            def test_not_a_warning():
+                pass
+        """,
+        [
+            '*::test_warns PASSED*',
+            '*::test_warns_search PASSED*',
+            '*::test_setup_warns PASSED*',
+            '*::test_warns_and_raises PASSED*',
+            '*::test_no_warning FAILED*',
+            '*::test_wrong_category FAILED*',
+            '*::test_setup_no_match FAILED*',
+            '*::test_raises_instead FAILED*',
+            '*::test_not_a_warning FAILED*',
+            "*ExpectedWarning: Expected warning <class 'DeprecationWarning'>, but no warning was emitted",
+            # pylint: disable=line-too-long
+            "*ExpectedWarning: Expected warning <class 'UserWarning'> matching \"call\", but none of the 12 warnings emitted matched (last 10 shown): DeprecationWarning('call 2 is deprecated'), *, DeprecationWarning('call 11 is deprecated')",
+            "ExpectedWarning: Expected warning <class 'DeprecationWarning'> matching \"new\", but none of the 1 warnings emitted matched: DeprecationWarning('old fixture')",
+            "E       RuntimeError: no warning",
+            "*PytestRaisesUsageError: @pytest.mark.warns: supplied `category=<class 'ValueError'>` must be a subclass (or tuple of subclasses) of `Warning`.",
+        ],
+        1
+    )
+
+def test_pytest_mark_warns_added_at_run_time(testdir):
+    _run_tests_test(testdir, """
+            import warnings
+            import pytest
+
+            @pytest.fixture
+            def expect_deprecation(request):
+                request.node.add_marker(pytest.mark.warns(category=DeprecationWarning))
+
+            def test_added_warns(expect_deprecation):
+                warnings.warn('deprecated', DeprecationWarning)
+
+            def test_added_warns_no_warning(expect_deprecation):
+                pass
+
+            def test_unmarked():
+                warnings.warn('deprecated', DeprecationWarning)
+        """,
+        [
+            '*::test_added_warns PASSED*',
+            '*::test_added_warns_no_warning FAILED*',
+            '*::test_unmarked PASSED*',
+            "*ExpectedWarning: Expected warning <class 'DeprecationWarning'>, but no warning was emitted",
+        ],
+        1
+    )
+
+def test_pytest_mark_warns_checker_on_demand(testdir):
+    _run_tests_test(testdir, """
+            import warnings
+            import pytest
+
+            @pytest.mark.raises(exception=KeyError)
+            def test_raises():
+                raise KeyError('missing')
+
+            def test_no_checker(request):
+                warnings.warn('deprecated', DeprecationWarning)
+                assert request.config.pluginmanager.get_plugin('raises_warns') is None
+        """,
+        [
+            '*::test_raises PASSED*',
+            '*::test_no_checker PASSED*',
+        ],
+        0
+    )